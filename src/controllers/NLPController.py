@@ -1,24 +1,47 @@
 from .BaseController import BaseController
 from models.db_schemes import Project, DataChunk
 from stores.llm.LLMEnums import DocumentTypeEnum
-from typing import List
+from stores.llm.ContextPacker import ContextPacker
+from stores.vectordb.VectorDBEnums import RetrievalModeEnums, VectorMetadataEnums
+from models import ResponseSignal
+from models.enums.AnswerCacheEnum import AnswerCacheEnum
+from utils.metrics import (RAG_TIME_TO_FIRST_TOKEN, RAG_TOKENS_PER_SECOND, ANSWER_CACHE_REQUESTS,
+                           ANSWER_CACHE_ENTRIES, ANSWER_CACHE_BYTES, SEMANTIC_CACHE_REQUESTS,
+                           SEMANTIC_CACHE_SIMILARITY, RAG_PROMPT_TOKENS)
+from typing import List, AsyncIterator, Callable
+import asyncio
+import hashlib
+import logging
 import json
+import time
 
 class NLPController(BaseController):
 
     def __init__(self, vectordb_client, generation_client, 
-                 embedding_client, template_parser):
+                 embedding_client, template_parser, answer_cache=None,
+                 semantic_cache=None, cache_invalidator=None):
         super().__init__()
 
         self.vectordb_client = vectordb_client
         self.generation_client = generation_client
         self.embedding_client = embedding_client
         self.template_parser = template_parser
+        self.answer_cache = answer_cache
+        self.semantic_cache = semantic_cache
+        self.cache_invalidator = cache_invalidator
+
+        self.context_packer = ContextPacker(
+            max_tokens=self.app_settings.GENERATION_CONTEXT_MAX_TOKENS,
+            overlap_threshold=self.app_settings.GENERATION_CONTEXT_OVERLAP_THRESHOLD,
+        )
+
+        self.logger = logging.getLogger('uvicorn')
 
     def create_collection_name(self, project_id: str):
         return f"collection_{self.vectordb_client.default_vector_size}_{project_id}".strip()
     
     async def reset_vector_db_collection(self, project: Project):
+        await self.invalidate_answer_cache(project=project)
         collection_name = self.create_collection_name(project_id=project.project_id)
         return await self.vectordb_client.delete_collection(collection_name=collection_name)
     
@@ -30,18 +53,48 @@ class NLPController(BaseController):
             json.dumps(collection_info, default=lambda x: x.__dict__)
         )
     
+    def get_vector_metadata(self, chunk: DataChunk):
+        # the asset id is copied into the vector metadata so searches can filter on it
+        return {
+            **(chunk.chunk_metadata or {}),
+            VectorMetadataEnums.ASSET_ID.value: chunk.chunk_asset_id,
+        }
+
+    async def rebuild_vector_db_index(self, project: Project, index_type: str = None):
+        collection_name = self.create_collection_name(project_id=project.project_id)
+        return await self.vectordb_client.rebuild_index(collection_name=collection_name, index_type=index_type)
+
+    async def migrate_vector_db_collection_to_lean(self, project: Project):
+        # only pgvector collections keep a copy of the chunk text
+        if not hasattr(self.vectordb_client, "drop_text_column"):
+            return False
+
+        collection_name = self.create_collection_name(project_id=project.project_id)
+        return await self.vectordb_client.drop_text_column(collection_name=collection_name)
+
+    async def get_vector_db_index_progress(self, project: Project):
+        collection_name = self.create_collection_name(project_id=project.project_id)
+        return await self.vectordb_client.get_index_build_progress(collection_name=collection_name)
+
     async def index_into_vector_db(self, project: Project, chunks: List[DataChunk],
                                    chunks_ids: List[int], 
-                                   do_reset: bool = False):
+                                   do_reset: bool = False,
+                                   embedding_batch_size: int = 50):
         
         # step1: get collection name
         collection_name = self.create_collection_name(project_id=project.project_id)
 
         # step2: manage items
         texts = [ c.chunk_text for c in chunks ]
-        metadata = [ c.chunk_metadata for c in  chunks]
-        vectors = self.embedding_client.embed_text(text=texts, 
-                                                  document_type=DocumentTypeEnum.DOCUMENT.value)
+        metadata = [ self.get_vector_metadata(c) for c in  chunks]
+        vectors = []
+        for i in range(0, len(texts), embedding_batch_size):
+            batch_vectors = await self.embedding_client.aembed_text(text=texts[i:i+embedding_batch_size], 
+                                                                   document_type=DocumentTypeEnum.DOCUMENT.value)
+            if not batch_vectors:
+                return False
+
+            vectors.extend(batch_vectors)
 
         # step3: create collection if not exists
         _ = await self.vectordb_client.create_collection(
@@ -61,66 +114,404 @@ class NLPController(BaseController):
 
         return True
 
-    async def search_vector_db_collection(self, project: Project, text: str, limit: int = 10):
+    async def index_into_vector_db_pipeline(self, project: Project, chunks_pages: AsyncIterator,
+                                            embedding_workers: int = 4,
+                                            embedding_batch_size: int = 50,
+                                            insert_batch_size: int = 500,
+                                            queue_size: int = 8,
+                                            on_progress: Callable[[int], None] = None):
+        """
+        Index the chunks of `chunks_pages` through a staged pipeline:
+        chunk reader -> `embedding_workers` concurrent embedding calls -> batched vector writer.
+        Stages are linked by bounded queues, so a slow stage applies backpressure upstream.
+        The collection must already exist. Returns the number of inserted items,
+        a failing stage cancels the others and its error is raised.
+        """
+
+        collection_name = self.create_collection_name(project_id=project.project_id)
+
+        embed_queue = asyncio.Queue(maxsize=queue_size)
+        write_queue = asyncio.Queue(maxsize=queue_size)
+        inserted_items_count = 0
+
+        async def read_chunks():
+            async for page_chunks in chunks_pages:
+                for i in range(0, len(page_chunks), embedding_batch_size):
+                    await embed_queue.put(page_chunks[i:i+embedding_batch_size])
+
+            for _ in range(embedding_workers):
+                await embed_queue.put(None)
+
+        async def embed_chunks():
+            while True:
+                batch = await embed_queue.get()
+                if batch is None:
+                    await write_queue.put(None)
+                    return
+
+                vectors = await self.embedding_client.aembed_text(
+                    text=[ c.chunk_text for c in batch ],
+                    document_type=DocumentTypeEnum.DOCUMENT.value
+                )
+
+                if not vectors or len(vectors) != len(batch):
+                    raise RuntimeError(f"Embedding failed for a batch of {len(batch)} chunks")
+
+                await write_queue.put((batch, vectors))
+
+        async def write_vectors():
+            nonlocal inserted_items_count
+
+            pending_chunks, pending_vectors = [], []
+            finished_workers = 0
+
+            while finished_workers < embedding_workers:
+                item = await write_queue.get()
+                if item is None:
+                    finished_workers += 1
+                else:
+                    pending_chunks.extend(item[0])
+                    pending_vectors.extend(item[1])
+
+                if not pending_chunks:
+                    continue
+
+                if len(pending_chunks) < insert_batch_size and finished_workers < embedding_workers:
+                    continue
+
+                is_inserted = await self.vectordb_client.insert_many(
+                    collection_name=collection_name,
+                    texts=[ c.chunk_text for c in pending_chunks ],
+                    metadata=[ self.get_vector_metadata(c) for c in pending_chunks ],
+                    vectors=pending_vectors,
+                    record_ids=[ c.chunk_id for c in pending_chunks ],
+                    batch_size=insert_batch_size,
+                )
+
+                if not is_inserted:
+                    raise RuntimeError(f"Insert failed for a batch of {len(pending_chunks)} vectors")
+
+                inserted_items_count += len(pending_chunks)
+                if on_progress:
+                    on_progress(len(pending_chunks))
+
+                pending_chunks, pending_vectors = [], []
+
+        tasks = [
+            asyncio.ensure_future(read_chunks()),
+            *[ asyncio.ensure_future(embed_chunks()) for _ in range(embedding_workers) ],
+            asyncio.ensure_future(write_vectors()),
+        ]
+
+        try:
+            await asyncio.gather(*tasks)
+        except Exception as e:
+            self.logger.error(f"Error while indexing collection {collection_name}: {e}")
+            raise
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        return inserted_items_count
+
+    async def search_vector_db_collection(self, project: Project, text: str, limit: int = 10,
+                                          retrieval_mode: str = RetrievalModeEnums.DENSE.value,
+                                          candidates_limit: int = 50, rrf_k: int = 60,
+                                          filters: dict = None, search_preset: str = None,
+                                          query_vector: list = None):
 
         # step1: get collection name
-        query_vector = None
         collection_name = self.create_collection_name(project_id=project.project_id)
 
-        # step2: get text embedding vector
-        vectors = self.embedding_client.embed_text(text=text, 
-                                                 document_type=DocumentTypeEnum.QUERY.value)
+        # step2: get text embedding vector, unless the caller already has it
+        if query_vector is None:
+            query_vector = await self.embed_query(text=text)
 
-        if not vectors or len(vectors) == 0:
+        if query_vector is None or len(query_vector) == 0:
+            return False    
+
+        # step3: do semantic (or hybrid semantic + lexical) search
+        if retrieval_mode == RetrievalModeEnums.HYBRID.value:
+            results = await self.vectordb_client.search_hybrid(
+                collection_name=collection_name,
+                vector=query_vector,
+                text=text,
+                limit=limit,
+                candidates_limit=candidates_limit,
+                rrf_k=rrf_k,
+                filters=filters,
+                search_preset=search_preset,
+            )
+        else:
+            results = await self.vectordb_client.search_by_vector(
+                collection_name=collection_name,
+                vector=query_vector,
+                limit=limit,
+                filters=filters,
+                search_preset=search_preset,
+            )
+
+        if not results:
             return False
-        
-        if isinstance(vectors, list) and len(vectors) > 0:
-            query_vector = vectors[0]
 
-        if not query_vector:
-            return False    
+        return results
+    
+    async def embed_query(self, text: str):
+        vectors = await self.embedding_client.aembed_text(text=text, 
+                                                         document_type=DocumentTypeEnum.QUERY.value)
+
+        if not vectors or len(vectors) == 0:
+            return None
+
+        return vectors[0]
+    
+    async def search_vector_db_collection_batch(self, project: Project, texts: List[str], limit: int = 10,
+                                                embedding_batch_size: int = 96,
+                                                search_preset: str = None):
+        """
+        Search many queries at once: one embedding call (split only past the
+        provider batch limit) and one vector db round trip.
+        Returns one list of documents per query, in the order of `texts`.
+        """
+
+        collection_name = self.create_collection_name(project_id=project.project_id)
+
+        query_vectors = []
+        for i in range(0, len(texts), embedding_batch_size):
+            vectors = await self.embedding_client.aembed_text(text=texts[i:i+embedding_batch_size],
+                                                             document_type=DocumentTypeEnum.QUERY.value)
+            if not vectors:
+                return False
+
+            query_vectors.extend(vectors)
+
+        if len(query_vectors) != len(texts):
+            return False
 
-        # step3: do semantic search
-        results = await self.vectordb_client.search_by_vector(
+        results = await self.vectordb_client.search_by_vectors(
             collection_name=collection_name,
-            vector=query_vector,
-            limit=limit
+            vectors=query_vectors,
+            limit=limit,
+            search_preset=search_preset,
         )
 
-        if not results:
+        if results is None or results is False:
             return False
 
         return results
-    
-    async def answer_rag_question(self, project: Project, query: str, limit: int = 10):
+
+    async def answer_rag_question(self, project: Project, query: str, limit: int = 10,
+                                  retrieval_mode: str = RetrievalModeEnums.DENSE.value,
+                                  candidates_limit: int = 50, rrf_k: int = 60,
+                                  filters: dict = None, search_preset: str = None,
+                                  bypass_cache: bool = False):
         
         answer, full_prompt, chat_history = None, None, None
+        cache_status = self.get_cache_status(bypass_cache=bypass_cache)
+
+        # step1: a previously answered paraphrase of the question
+        semantic_scope = self.get_semantic_cache_scope(limit=limit, retrieval_mode=retrieval_mode,
+                                                       filters=filters, search_preset=search_preset)
+        query_vector, semantic_answer = await self.lookup_semantic_cache(project=project, query=query,
+                                                                         scope=semantic_scope,
+                                                                         bypass_cache=bypass_cache)
+        if semantic_answer is not None:
+            answer, full_prompt, chat_history, _ = semantic_answer
+            return answer, full_prompt, chat_history, AnswerCacheEnum.SEMANTIC_HIT.value
 
-        # step1: retrieve related documents
+        # step2: retrieve related documents
         retrieved_documents = await self.search_vector_db_collection(
             project=project,
             text=query,
             limit=limit,
+            retrieval_mode=retrieval_mode,
+            candidates_limit=candidates_limit,
+            rrf_k=rrf_k,
+            filters=filters,
+            search_preset=search_preset,
+            query_vector=query_vector,
         )
 
         if not retrieved_documents or len(retrieved_documents) == 0:
-            return answer, full_prompt, chat_history
+            return answer, full_prompt, chat_history, cache_status
+
+        # step3: same question over the same chunks
+        cache_key = self.get_answer_cache_key(project=project, query=query, retrieved_documents=retrieved_documents)
+        cached_answer = self.get_cached_answer(cache_key, bypass_cache=bypass_cache)
+        if cached_answer is not None:
+            answer, full_prompt, chat_history = cached_answer
+            return answer, full_prompt, chat_history, AnswerCacheEnum.HIT.value
         
-        # step2: Construct LLM prompt
+        # step4: Construct LLM prompt
+        full_prompt, chat_history = await self.construct_rag_prompt(query=query, retrieved_documents=retrieved_documents)
+
+        # step5: Retrieve the Answer
+        answer = await self.generation_client.agenerate_text(
+            prompt=full_prompt,
+            chat_history=chat_history
+        )
+
+        if answer:
+            self.put_cached_answer(project=project, cache_key=cache_key,
+                                   answer=answer, full_prompt=full_prompt, chat_history=chat_history)
+            self.put_semantic_cached_answer(project=project, scope=semantic_scope, query_vector=query_vector,
+                                            answer=answer, full_prompt=full_prompt, chat_history=chat_history,
+                                            retrieved_documents=retrieved_documents)
+
+        return answer, full_prompt, chat_history, cache_status
+
+    def get_cache_status(self, bypass_cache: bool = False):
+        if self.answer_cache is None and self.semantic_cache is None:
+            return AnswerCacheEnum.DISABLED.value
+
+        if bypass_cache:
+            return AnswerCacheEnum.BYPASS.value
+
+        return AnswerCacheEnum.MISS.value
+
+    def get_semantic_cache_scope(self, limit: int, retrieval_mode: str,
+                                       filters: dict = None, search_preset: str = None):
+        # paraphrases only share answers generated with the same retrieval and prompt
+        return json.dumps([
+            int(limit),
+            retrieval_mode,
+            filters,
+            search_preset,
+            self.generation_client.generation_model_id,
+            self.template_parser.get_version("rag"),
+        ], sort_keys=True, ensure_ascii=False)
+
+    async def lookup_semantic_cache(self, project: Project, query: str, scope: str,
+                                          bypass_cache: bool = False):
+        """
+        Embed the query once, for the semantic cache and for the retrieval.
+        Returns the query vector and the cached answer, if any.
+        """
+
+        if self.semantic_cache is None:
+            return None, None
+
+        query_vector = await self.embed_query(text=query)
+        if query_vector is None:
+            return None, None
+
+        if bypass_cache:
+            SEMANTIC_CACHE_REQUESTS.labels(status=AnswerCacheEnum.BYPASS.value).inc()
+            return query_vector, None
+
+        cached_answer, similarity = self.semantic_cache.lookup(project_id=project.project_id,
+                                                               scope=scope, vector=query_vector)
+        if similarity is not None:
+            SEMANTIC_CACHE_SIMILARITY.observe(similarity)
+
+        SEMANTIC_CACHE_REQUESTS.labels(
+            status=AnswerCacheEnum.HIT.value if cached_answer is not None else AnswerCacheEnum.MISS.value
+        ).inc()
+
+        return query_vector, cached_answer
+
+    def put_semantic_cached_answer(self, project: Project, scope: str, query_vector,
+                                         answer: str, full_prompt: str, chat_history: list,
+                                         retrieved_documents: list):
+        if self.semantic_cache is None or query_vector is None:
+            return
+
+        self.semantic_cache.put(project_id=project.project_id, scope=scope, vector=query_vector,
+                                value=(answer, full_prompt, chat_history,
+                                       [ doc.dict() for doc in retrieved_documents ]))
+
+    def get_answer_cache_key(self, project: Project, query: str, retrieved_documents: list):
+        if self.answer_cache is None:
+            return None
+
+        # providers without chunk ids fall back to the retrieved text
+        chunk_ids = [
+            doc.chunk_id if doc.chunk_id is not None else hashlib.sha256(doc.text.encode("utf-8")).hexdigest()
+            for doc in retrieved_documents
+        ]
+
+        return self.answer_cache.get_key(
+            project_id=project.project_id,
+            query=query,
+            chunk_ids=chunk_ids,
+            model_id=self.generation_client.generation_model_id,
+            template_version=self.template_parser.get_version("rag"),
+        )
+
+    def get_cached_answer(self, cache_key: str, bypass_cache: bool = False):
+        if self.answer_cache is None:
+            return None
+
+        if bypass_cache:
+            ANSWER_CACHE_REQUESTS.labels(status=AnswerCacheEnum.BYPASS.value).inc()
+            return None
+
+        cached_answer = self.answer_cache.get(cache_key)
+        ANSWER_CACHE_REQUESTS.labels(
+            status=AnswerCacheEnum.HIT.value if cached_answer is not None else AnswerCacheEnum.MISS.value
+        ).inc()
+
+        return cached_answer
+
+    def put_cached_answer(self, project: Project, cache_key: str, answer: str,
+                                full_prompt: str, chat_history: list):
+        if self.answer_cache is None:
+            return
+
+        size = sum([
+            len(answer.encode("utf-8")),
+            len(full_prompt.encode("utf-8")),
+            len(json.dumps(chat_history, ensure_ascii=False).encode("utf-8")),
+        ])
+        self.answer_cache.put(project_id=project.project_id, key=cache_key,
+                              value=(answer, full_prompt, chat_history), size=size)
+        self.update_answer_cache_metrics()
+
+    async def invalidate_answer_cache(self, project: Project):
+        if self.cache_invalidator is not None:
+            # every worker holds its own caches
+            await self.cache_invalidator.invalidate(project.project_id)
+        else:
+            if self.semantic_cache is not None:
+                self.semantic_cache.invalidate_project(project.project_id)
+            if self.answer_cache is not None:
+                self.answer_cache.invalidate_project(project.project_id)
+
+        if self.answer_cache is not None:
+            self.update_answer_cache_metrics()
+
+    def update_answer_cache_metrics(self):
+        ANSWER_CACHE_ENTRIES.set(len(self.answer_cache))
+        ANSWER_CACHE_BYTES.set(self.answer_cache.total_bytes)
+
+    async def construct_rag_prompt(self, query: str, retrieved_documents: list):
         system_prompt = self.template_parser.get("rag", "system_prompt")
 
+        footer_prompt = self.template_parser.get("rag", "footer_prompt", {
+            "query": query
+        })
+
+        # fill the context token budget by score, the system and footer prompts are never cut
+        packed_documents, prompt_tokens = await self.context_packer.pack(
+            generation_client=self.generation_client,
+            documents=retrieved_documents,
+            fixed_prompts=[ system_prompt, footer_prompt ],
+            document_template_prompt=self.template_parser.get("rag", "document_prompt", {
+                "doc_num": len(retrieved_documents),
+                "chunk_text": "",
+            }),
+        )
+        RAG_PROMPT_TOKENS.observe(prompt_tokens)
+
         documents_prompts = "\n".join([
             self.template_parser.get("rag", "document_prompt", {
                     "doc_num": idx + 1,
-                    "chunk_text": self.generation_client.process_text(doc.text),
+                    "chunk_text": doc.text,
             })
-            for idx, doc in enumerate(retrieved_documents)
+            for idx, doc in enumerate(packed_documents)
         ])
 
-        footer_prompt = self.template_parser.get("rag", "footer_prompt", {
-            "query": query
-        })
-
         # step3: Construct Generation Client Prompts
         chat_history = [
             self.generation_client.construct_prompt(
@@ -131,10 +522,113 @@ class NLPController(BaseController):
 
         full_prompt = "\n\n".join([ documents_prompts,  footer_prompt])
 
-        # step4: Retrieve the Answer
-        answer = self.generation_client.generate_text(
-            prompt=full_prompt,
-            chat_history=chat_history
-        )
+        return full_prompt, chat_history
+
+    async def stream_rag_answer(self, project: Project, query: str, limit: int = 10,
+                                retrieval_mode: str = RetrievalModeEnums.DENSE.value,
+                                candidates_limit: int = 50, rrf_k: int = 60,
+                                filters: dict = None, search_preset: str = None,
+                                bypass_cache: bool = False):
+        """
+        Yield (event, data) pairs: the retrieved sources, every streamed token,
+        then the generation metrics, or an error signal.
+        """
+
+        start_time = time.perf_counter()
+        cache_status = self.get_cache_status(bypass_cache=bypass_cache)
+
+        semantic_scope = self.get_semantic_cache_scope(limit=limit, retrieval_mode=retrieval_mode,
+                                                       filters=filters, search_preset=search_preset)
+
+        # the response headers are already sent, failures are reported as an error event
+        try:
+            query_vector, semantic_answer = await self.lookup_semantic_cache(project=project, query=query,
+                                                                             scope=semantic_scope,
+                                                                             bypass_cache=bypass_cache)
+
+            retrieved_documents = None
+            if semantic_answer is None:
+                retrieved_documents = await self.search_vector_db_collection(
+                    project=project,
+                    text=query,
+                    limit=limit,
+                    retrieval_mode=retrieval_mode,
+                    candidates_limit=candidates_limit,
+                    rrf_k=rrf_k,
+                    filters=filters,
+                    search_preset=search_preset,
+                    query_vector=query_vector,
+                )
+        except Exception as e:
+            self.logger.error(f"Error while retrieving the documents of the answer: {e}")
+            yield "error", { "signal": ResponseSignal.RAG_ANSWER_ERROR.value }
+            return
+
+        if semantic_answer is not None:
+            yield "sources", semantic_answer[3]
+            yield "token", semantic_answer[0]
+            yield "done", {
+                "signal": ResponseSignal.RAG_ANSWER_SUCCESS.value,
+                "cache_status": AnswerCacheEnum.SEMANTIC_HIT.value,
+                "duration_seconds": round(time.perf_counter() - start_time, 3),
+            }
+            return
+
+        if not retrieved_documents or len(retrieved_documents) == 0:
+            yield "error", { "signal": ResponseSignal.RAG_ANSWER_ERROR.value }
+            return
+
+        yield "sources", [ doc.dict() for doc in retrieved_documents ]
+
+        cache_key = self.get_answer_cache_key(project=project, query=query, retrieved_documents=retrieved_documents)
+        cached_answer = self.get_cached_answer(cache_key, bypass_cache=bypass_cache)
+        if cached_answer is not None:
+            yield "token", cached_answer[0]
+            yield "done", {
+                "signal": ResponseSignal.RAG_ANSWER_SUCCESS.value,
+                "cache_status": AnswerCacheEnum.HIT.value,
+                "duration_seconds": round(time.perf_counter() - start_time, 3),
+            }
+            return
+
+        # every streamed delta counts as one token
+        tokens, first_token_time = [], None
+        try:
+            full_prompt, chat_history = await self.construct_rag_prompt(query=query,
+                                                                        retrieved_documents=retrieved_documents)
+
+            async for token in self.generation_client.astream_text(prompt=full_prompt, chat_history=chat_history):
+                if first_token_time is None:
+                    first_token_time = time.perf_counter()
+                tokens.append(token)
+                yield "token", token
+        except Exception as e:
+            self.logger.error(f"Error while streaming the answer: {e}")
+            first_token_time = None
+
+        if first_token_time is None:
+            yield "error", { "signal": ResponseSignal.RAG_ANSWER_ERROR.value }
+            return
+
+        end_time = time.perf_counter()
+        tokens_count = len(tokens)
+        time_to_first_token = first_token_time - start_time
+        tokens_per_second = tokens_count / (end_time - first_token_time) if end_time > first_token_time else 0.0
+
+        RAG_TIME_TO_FIRST_TOKEN.observe(time_to_first_token)
+        RAG_TOKENS_PER_SECOND.observe(tokens_per_second)
+
+        self.put_cached_answer(project=project, cache_key=cache_key,
+                               answer="".join(tokens), full_prompt=full_prompt, chat_history=chat_history)
+        self.put_semantic_cached_answer(project=project, scope=semantic_scope, query_vector=query_vector,
+                                        answer="".join(tokens), full_prompt=full_prompt, chat_history=chat_history,
+                                        retrieved_documents=retrieved_documents)
 
-        return answer, full_prompt, chat_history
+        yield "done", {
+            "signal": ResponseSignal.RAG_ANSWER_SUCCESS.value,
+            "cache_status": cache_status,
+            "tokens_count": tokens_count,
+            "time_to_first_token_seconds": round(time_to_first_token, 3),
+            "tokens_per_second": round(tokens_per_second, 2),
+            "duration_seconds": round(end_time - start_time, 3),
+        }
@@ -4,8 +4,10 @@ import os
 from langchain_community.document_loaders import TextLoader
 from langchain_community.document_loaders import PyMuPDFLoader
 from models import ProcessingEnum
-from typing import List
+from typing import Iterable, Optional, Tuple
+from collections import deque
 from dataclasses import dataclass
+from itertools import islice
 
 @dataclass
 class Document:
@@ -46,22 +48,18 @@ class ProcessController(BaseController):
 
         loader = self.get_file_loader(file_id=file_id)
         if loader:
-            return loader.load()
+            # pages are yielded one by one instead of loading the whole file
+            return loader.lazy_load()
 
         return None
 
-    def process_file_content(self, file_content: list, file_id: str,
+    def process_file_content(self, file_content: Iterable, file_id: str,
                             chunk_size: int=100, overlap_size: int=20):
 
-        file_content_texts = [
-            rec.page_content
+        file_content_pages = (
+            (rec.page_content, rec.metadata.get("page"))
             for rec in file_content
-        ]
-
-        file_content_metadata = [
-            rec.metadata
-            for rec in file_content
-        ]
+        )
 
         # chunks = text_splitter.create_documents(
         #     file_content_texts,
@@ -69,40 +67,127 @@ class ProcessController(BaseController):
         # )
 
         chunks = self.process_simpler_splitter(
-            texts=file_content_texts,
-            metadatas=file_content_metadata,
+            pages=file_content_pages,
             chunk_size=chunk_size,
+            overlap_size=overlap_size,
         )
 
         return chunks
 
-    def process_simpler_splitter(self, texts: List[str], metadatas: List[dict], chunk_size: int, splitter_tag: str="\n"):
-        
-        full_text = " ".join(texts)
-
-        # split by splitter_tag
-        lines = [ doc.strip() for doc in full_text.split(splitter_tag) if len(doc.strip()) > 1 ]
-
-        chunks = []
-        current_chunk = ""
-
-        for line in lines:
-            current_chunk += line + splitter_tag
-            if len(current_chunk) >= chunk_size:
-                chunks.append(Document(
-                    page_content=current_chunk.strip(),
-                    metadata={}
-                ))
-
-                current_chunk = ""
-
-        if len(current_chunk) >= 0:
-            chunks.append(Document(
-                page_content=current_chunk.strip(),
-                metadata={}
-            ))
-
-        return chunks
-
-
-    
+    def iter_lines(self, pages: Iterable[Tuple[str, Optional[int]]], splitter_tag: str="\n",
+                   max_line_size: int=None):
+        """
+        Yield the (line, page) pairs of the (text, page) items in `pages` one by one.
+        Pages are joined with a space (a line may continue on the next page, it keeps
+        the page it starts on), only the trailing partial line of the current page is kept in memory.
+        A partial line growing past `max_line_size` is flushed in `max_line_size` slices.
+        """
+
+        remainder, remainder_page = None, None
+        for text, page in pages:
+            start = 0
+            text_end = text.find(splitter_tag) if remainder else -1
+            if remainder and text_end == -1:
+                remainder = remainder + " " + text
+            else:
+                if remainder:
+                    yield remainder + " " + text[:text_end], remainder_page
+                    start = text_end + len(splitter_tag)
+
+                end = text.find(splitter_tag, start)
+                while end != -1:
+                    yield text[start:end], page
+                    start = end + len(splitter_tag)
+                    end = text.find(splitter_tag, start)
+
+                remainder, remainder_page = text[start:], page
+
+            # a text without line breaks is not held whole
+            while max_line_size and len(remainder) > max_line_size:
+                yield remainder[:max_line_size], remainder_page
+                remainder, remainder_page = remainder[max_line_size:], page
+
+        if remainder is not None:
+            yield remainder, remainder_page
+
+    def get_chunk_metadata(self, window: Iterable[Tuple[str, Optional[int]]]):
+        pages = [ page for _, page in window if page is not None ]
+        if not pages:
+            return {}
+
+        return {
+            "page_start": min(pages),
+            "page_end": max(pages),
+        }
+
+    def process_simpler_splitter(self, pages: Iterable[Tuple[str, Optional[int]]], chunk_size: int,
+                                 overlap_size: int=0, splitter_tag: str="\n"):
+        """
+        Stream chunks of at least `chunk_size` characters built from whole lines.
+        Consecutive chunks share up to `overlap_size` characters of trailing lines.
+        Memory is bounded by the chunk size, not by the document size.
+        Chunks record the range of pages they span (page_start, page_end) when known.
+        """
+
+        # the overlap must leave room for at least one new line per chunk
+        overlap_size = max(0, min(overlap_size or 0, chunk_size - 1))
+
+        window = deque()
+        window_size = 0
+        has_new_lines = False
+
+        for line, page in self.iter_lines(pages=pages, splitter_tag=splitter_tag,
+                                          max_line_size=chunk_size):
+            line = line.strip()
+            if len(line) <= 1:
+                continue
+
+            line = line + splitter_tag
+            window.append((line, page))
+            window_size += len(line)
+            has_new_lines = True
+
+            if window_size < chunk_size:
+                continue
+
+            yield Document(
+                page_content="".join([ line for line, _ in window ]).strip(),
+                metadata=self.get_chunk_metadata(window)
+            )
+
+            # slide the window, keep the trailing lines that fit in the overlap
+            while window and window_size > overlap_size:
+                window_size -= len(window.popleft()[0])
+
+            has_new_lines = False
+
+        if has_new_lines:
+            yield Document(
+                page_content="".join([ line for line, _ in window ]).strip(),
+                metadata=self.get_chunk_metadata(window)
+            )
+
+def process_file_job(project_id: str, file_id: str,
+                     chunk_size: int=100, overlap_size: int=20,
+                     batch_size: int=1000):
+    """
+    Load and chunk a single project file, yielding lists of at most `batch_size` chunks.
+    Runs inside a worker process (ProcessPoolEngine.stream), so it must stay a module level function.
+    """
+
+    process_controller = ProcessController(project_id=project_id)
+
+    file_content = process_controller.get_file_content(file_id=file_id)
+    if file_content is None:
+        raise ValueError(f"Can not load file: {file_id}")
+
+    chunks = process_controller.process_file_content(
+        file_content=file_content,
+        file_id=file_id,
+        chunk_size=chunk_size,
+        overlap_size=overlap_size
+    )
+
+    # only one batch of the file is held here at a time
+    while batch := list(islice(chunks, batch_size)):
+        yield batch
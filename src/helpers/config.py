@@ -11,12 +11,19 @@ class Settings(BaseSettings):
     FILE_MAX_SIZE: int
     FILE_DEFAULT_CHUNK_SIZE: int
 
+    PROCESS_POOL_MAX_WORKERS: int = None
+    PROCESS_POOL_MAX_FILES_IN_FLIGHT: int = None
+    PROCESS_POOL_START_METHOD: str = "spawn"
+    PROCESS_CHUNKS_BATCH_SIZE: int = 1000
+
     POSTGRES_USERNAME: str
     POSTGRES_PASSWORD: str
     POSTGRES_HOST: str
     POSTGRES_PORT: int
     POSTGRES_MAIN_DATABASE: str
 
+    CHUNKS_STREAM_PAGE_SIZE: int = 1000
+
     GENERATION_BACKEND: str
     EMBEDDING_BACKEND: str
 
@@ -31,12 +38,55 @@ class Settings(BaseSettings):
     INPUT_DAFAULT_MAX_CHARACTERS: int = None
     GENERATION_DAFAULT_MAX_TOKENS: int = None
     GENERATION_DAFAULT_TEMPERATURE: float = None
+    GENERATION_CONTEXT_MAX_TOKENS: int = 3000
+    GENERATION_CONTEXT_OVERLAP_THRESHOLD: float = 0.8
+
+    LLM_HTTP_MAX_CONNECTIONS: int = 100
+    LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    LLM_HTTP_KEEPALIVE_EXPIRY: float = 30.0
+    LLM_HTTP_TIMEOUT: float = 60.0
+    LLM_HTTP_CONNECT_TIMEOUT: float = 5.0
+
+    EMBEDDING_CACHE_ENABLED: bool = True
+    EMBEDDING_CACHE_LRU_SIZE: int = 10000
+
+    ANSWER_CACHE_ENABLED: bool = True
+    ANSWER_CACHE_MAX_ENTRIES: int = 1000
+    ANSWER_CACHE_MAX_MB: int = 64
+    ANSWER_CACHE_TTL_SECONDS: int = 3600
+
+    SEMANTIC_CACHE_ENABLED: bool = False
+    SEMANTIC_CACHE_THRESHOLD: float = 0.95
+    SEMANTIC_CACHE_MAX_ENTRIES: int = 1000
+    SEMANTIC_CACHE_TTL_SECONDS: int = 3600
 
     VECTOR_DB_BACKEND_LITERAL: List[str] = None
     VECTOR_DB_BACKEND : str
     VECTOR_DB_PATH : str
     VECTOR_DB_DISTANCE_METHOD: str = None
     VECTOR_DB_PGVEC_INDEX_THRESHOLD: int = 100
+    VECTOR_DB_PGVEC_MAINTENANCE_WORK_MEM: str = "512MB"
+    VECTOR_DB_PGVEC_MAX_PARALLEL_MAINTENANCE_WORKERS: int = 2
+    VECTOR_DB_PGVEC_INDEX_SLO: str = "balanced"
+    VECTOR_DB_PGVEC_HNSW_THRESHOLD: int = 100000
+    VECTOR_DB_PGVEC_INDEX_REBUILD_GROWTH: float = 4
+    VECTOR_DB_PGVEC_BULK_LOAD_REBUILD_RATIO: float = 0.5
+    VECTOR_DB_PGVEC_TABLE_LAYOUT: str = "table_per_collection"
+    VECTOR_DB_PGVEC_STORE_TEXT: bool = False
+    VECTOR_DB_HNSW_M: int = 16
+    VECTOR_DB_HNSW_EF_CONSTRUCTION: int = 64
+    VECTOR_DB_SEARCH_DEFAULT_PRESET: str = "balanced"
+    VECTOR_DB_QUANTIZATION: str = "none"
+    VECTOR_DB_RESCORE_FACTOR: int = 4
+
+    INDEXING_EMBEDDING_WORKERS: int = 4
+    INDEXING_EMBEDDING_BATCH_SIZE: int = 50
+    INDEXING_INSERT_BATCH_SIZE: int = 500
+    INDEXING_QUEUE_SIZE: int = 8
+
+    RETRIEVAL_DEFAULT_MODE: str = "dense"
+    RETRIEVAL_HYBRID_CANDIDATES: int = 50
+    RETRIEVAL_RRF_K: int = 60
 
     PRIMARY_LANG: str = "en"
     DEFAULT_LANG: str = "en"
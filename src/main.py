@@ -6,6 +6,12 @@ from stores.vectordb.VectorDBProviderFactory import VectorDBProviderFactory
 from stores.llm.templates.template_parser import TemplateParser
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
+from utils.process_pool import ProcessPoolEngine
+from stores.llm.CachedEmbeddingClient import CachedEmbeddingClient
+from models.EmbeddingCacheModel import EmbeddingCacheModel
+from utils.answer_cache import AnswerCache
+from utils.semantic_cache import SemanticAnswerCache
+from utils.cache_invalidation import AnswerCacheInvalidator
 
 # Import metrics setup
 from utils.metrics import setup_metrics
@@ -26,7 +32,8 @@ async def startup_span():
     )
 
     llm_provider_factory = LLMProviderFactory(settings)
-    vectordb_provider_factory = VectorDBProviderFactory(config=settings,db_client=app.db_client)
+    vectordb_provider_factory = VectorDBProviderFactory(config=settings, db_client=app.db_client,
+                                                        db_engine=app.db_engine)
 
     # generation client
     app.generation_client = llm_provider_factory.create(provider=settings.GENERATION_BACKEND)
@@ -36,6 +43,43 @@ async def startup_span():
     app.embedding_client = llm_provider_factory.create(provider=settings.EMBEDDING_BACKEND)
     app.embedding_client.set_embedding_model(model_id=settings.EMBEDDING_MODEL_ID,
                                              embedding_size=settings.EMBEDDING_MODEL_SIZE)
+
+    if settings.EMBEDDING_CACHE_ENABLED:
+        app.embedding_client = CachedEmbeddingClient(
+            client=app.embedding_client,
+            cache_model=await EmbeddingCacheModel.create_instance(db_client=app.db_client),
+            lru_size=settings.EMBEDDING_CACHE_LRU_SIZE,
+        )
+
+    # generated answers, keyed by query, retrieved chunks, model and prompt templates
+    app.answer_cache = None
+    if settings.ANSWER_CACHE_ENABLED:
+        app.answer_cache = AnswerCache(
+            max_entries=settings.ANSWER_CACHE_MAX_ENTRIES,
+            max_bytes=settings.ANSWER_CACHE_MAX_MB * 1024 * 1024,
+            ttl_seconds=settings.ANSWER_CACHE_TTL_SECONDS,
+        )
+
+    # answers of paraphrased questions, looked up by query embedding per project
+    app.semantic_cache = None
+    if settings.SEMANTIC_CACHE_ENABLED:
+        app.semantic_cache = SemanticAnswerCache(
+            threshold=settings.SEMANTIC_CACHE_THRESHOLD,
+            max_entries=settings.SEMANTIC_CACHE_MAX_ENTRIES,
+            ttl_seconds=settings.SEMANTIC_CACHE_TTL_SECONDS,
+        )
+
+    # re-indexing a project drops its cached answers in every worker
+    app.cache_invalidator = AnswerCacheInvalidator(
+        db_client=app.db_client,
+        db_engine=app.db_engine,
+        answer_cache=app.answer_cache,
+        semantic_cache=app.semantic_cache,
+    )
+    await app.cache_invalidator.connect()
+
+    # keep-alive connection pool shared by the async llm clients
+    app.llm_http_client = llm_provider_factory.get_http_client()
     
     # vector db client
     app.vectordb_client = vectordb_provider_factory.create(
@@ -48,10 +92,21 @@ async def startup_span():
         default_language=settings.DEFAULT_LANG,
     )
 
+    # process pool for file parsing and chunking
+    app.process_pool = ProcessPoolEngine(
+        max_workers=settings.PROCESS_POOL_MAX_WORKERS,
+        max_in_flight=settings.PROCESS_POOL_MAX_FILES_IN_FLIGHT,
+        start_method=settings.PROCESS_POOL_START_METHOD,
+    )
+    app.process_pool.start()
+
 
 async def shutdown_span():
     app.db_engine.dispose()
     await app.vectordb_client.disconnect()
+    await app.cache_invalidator.disconnect()
+    app.process_pool.shutdown()
+    await app.llm_http_client.aclose()
 
 app.on_event("startup")(startup_span)
 app.on_event("shutdown")(shutdown_span)
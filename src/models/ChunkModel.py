@@ -5,6 +5,9 @@ from bson.objectid import ObjectId
 from pymongo import InsertOne
 from sqlalchemy.future import select
 from sqlalchemy import func, delete
+from sqlalchemy.sql import text as sql_text
+from typing import List
+import json
 
 class ChunkModel(BaseDataModel):
 
@@ -43,12 +46,75 @@ class ChunkModel(BaseDataModel):
             await session.commit()
         return len(chunks)
 
+    async def bulk_insert_chunks(self, chunks: List[dict], batch_size: int=5000) -> List[int]:
+        """
+        Insert plain chunk dicts (chunk_text, chunk_metadata, chunk_order,
+        chunk_project_id, chunk_asset_id) using COPY, without building ORM objects.
+        Returns the new chunk ids in the same order as `chunks`.
+        """
+
+        columns = [
+            "chunk_id", "chunk_text", "chunk_metadata",
+            "chunk_order", "chunk_project_id", "chunk_asset_id",
+        ]
+
+        chunk_ids = []
+        async with self.db_client() as session:
+            async with session.begin():
+                connection = await session.connection()
+                raw_connection = await connection.get_raw_connection()
+                copy_connection = raw_connection.driver_connection
+
+                # COPY can not return the generated ids, so reserve them first
+                reserve_ids_sql = sql_text(
+                    f"SELECT nextval(pg_get_serial_sequence('{DataChunk.__tablename__}', 'chunk_id')) "
+                    "FROM generate_series(1, :count)"
+                )
+
+                for i in range(0, len(chunks), batch_size):
+                    batch = chunks[i:i+batch_size]
+
+                    result = await session.execute(reserve_ids_sql, {"count": len(batch)})
+                    batch_ids = sorted(result.scalars().all())
+
+                    records = [
+                        (
+                            chunk_id,
+                            chunk["chunk_text"],
+                            json.dumps(chunk.get("chunk_metadata") or {}, ensure_ascii=False),
+                            chunk["chunk_order"],
+                            chunk["chunk_project_id"],
+                            chunk["chunk_asset_id"],
+                        )
+                        for chunk_id, chunk in zip(batch_ids, batch)
+                    ]
+
+                    await copy_connection.copy_records_to_table(
+                        DataChunk.__tablename__,
+                        records=records,
+                        columns=columns,
+                    )
+
+                    chunk_ids.extend(batch_ids)
+
+        return chunk_ids
+
     async def delete_chunks_by_project_id(self, project_id: ObjectId):
         async with self.db_client() as session:
             stmt = delete(DataChunk).where(DataChunk.chunk_project_id == project_id)
             result = await session.execute(stmt)
             await session.commit()
         return result.rowcount
+
+    async def delete_chunks_by_asset_id(self, asset_id: int, from_chunk_id: int=None):
+        # from_chunk_id: only the chunks inserted from that id on
+        async with self.db_client() as session:
+            stmt = delete(DataChunk).where(DataChunk.chunk_asset_id == asset_id)
+            if from_chunk_id is not None:
+                stmt = stmt.where(DataChunk.chunk_id >= from_chunk_id)
+            result = await session.execute(stmt)
+            await session.commit()
+        return result.rowcount
     
     async def get_poject_chunks(self, project_id: ObjectId, page_no: int=1, page_size: int=50):
         async with self.db_client() as session:
@@ -57,6 +123,36 @@ class ChunkModel(BaseDataModel):
             records = result.scalars().all()
         return records
 
+    async def iter_project_chunks(self, project_id: int, page_size: int=None):
+        """
+        Stream the project chunks page by page, ordered by chunk_id.
+        Pages are fetched with keyset pagination (chunk_id > last seen id) and
+        only carry the columns needed for indexing: chunk_id, chunk_text, chunk_metadata, chunk_asset_id.
+        """
+
+        page_size = page_size if page_size else self.app_settings.CHUNKS_STREAM_PAGE_SIZE
+        last_chunk_id = 0
+
+        while True:
+            async with self.db_client() as session:
+                stmt = select(
+                    DataChunk.chunk_id, DataChunk.chunk_text, DataChunk.chunk_metadata,
+                    DataChunk.chunk_asset_id
+                ).where(
+                    DataChunk.chunk_project_id == project_id,
+                    DataChunk.chunk_id > last_chunk_id
+                ).order_by(DataChunk.chunk_id).limit(page_size)
+
+                result = await session.execute(stmt)
+                records = result.all()
+
+            if not records:
+                break
+
+            yield records
+
+            last_chunk_id = records[-1].chunk_id
+
     async def get_total_chunks_count(self, project_id: ObjectId):
         total_count = 0
         async with self.db_client() as session:
@@ -0,0 +1,69 @@
+from .BaseDataModel import BaseDataModel
+from .db_schemes import EmbeddingCache
+from sqlalchemy.future import select
+from sqlalchemy.dialects.postgresql import insert
+from typing import List, Dict
+import numpy as np
+
+class EmbeddingCacheModel(BaseDataModel):
+
+    def __init__(self, db_client: object):
+        super().__init__(db_client=db_client)
+        self.db_client = db_client
+
+    @classmethod
+    async def create_instance(cls, db_client: object):
+        instance = cls(db_client)
+        return instance
+
+    def encode_embedding(self, embedding) -> bytes:
+        return np.asarray(embedding, dtype=np.float32).tobytes()
+
+    def decode_embedding(self, data: bytes) -> np.ndarray:
+        return np.frombuffer(data, dtype=np.float32)
+
+    async def get_embeddings(self, model_id: str, document_type: str,
+                                   content_hashes: List[str]) -> Dict[str, list]:
+
+        if not content_hashes:
+            return {}
+
+        async with self.db_client() as session:
+            stmt = select(
+                EmbeddingCache.cache_content_hash, EmbeddingCache.cache_embedding
+            ).where(
+                EmbeddingCache.cache_model_id == model_id,
+                EmbeddingCache.cache_document_type == document_type,
+                EmbeddingCache.cache_content_hash.in_(content_hashes)
+            )
+            result = await session.execute(stmt)
+            records = result.all()
+
+        return {
+            record.cache_content_hash: self.decode_embedding(record.cache_embedding)
+            for record in records
+        }
+
+    async def insert_embeddings(self, model_id: str, document_type: str,
+                                      embeddings: Dict[str, list]):
+
+        if not embeddings:
+            return 0
+
+        values = [
+            {
+                "cache_model_id": model_id,
+                "cache_document_type": document_type,
+                "cache_content_hash": content_hash,
+                "cache_embedding": self.encode_embedding(embedding),
+                "cache_embedding_size": len(embedding),
+            }
+            for content_hash, embedding in embeddings.items()
+        ]
+
+        async with self.db_client() as session:
+            async with session.begin():
+                stmt = insert(EmbeddingCache).on_conflict_do_nothing()
+                await session.execute(stmt, values)
+
+        return len(values)
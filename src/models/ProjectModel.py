@@ -2,7 +2,7 @@ from .BaseDataModel import BaseDataModel
 from .db_schemes import Project
 from .enums.DataBaseEnum import DataBaseEnum
 from sqlalchemy.future import select
-from sqlalchemy import func
+from sqlalchemy import func, update
 
 class ProjectModel(BaseDataModel):
 
@@ -40,6 +40,17 @@ class ProjectModel(BaseDataModel):
                 else:
                     return project
 
+    async def update_project_search_preset(self, project_id: int, search_preset: str):
+        async with self.db_client() as session:
+            async with session.begin():
+                stmt = update(Project).where(
+                    Project.project_id == project_id
+                ).values(project_search_preset=search_preset)
+                await session.execute(stmt)
+            await session.commit()
+
+        return True
+
     async def get_all_projects(self, page: int=1, page_size: int=10):
 
         async with self.db_client() as session:
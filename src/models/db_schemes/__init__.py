@@ -1 +1 @@
-from models.db_schemes.minirag.schemes import Project, DataChunk, Asset, RetrievedDocument
\ No newline at end of file
+from models.db_schemes.minirag.schemes import Project, DataChunk, Asset, RetrievedDocument, EmbeddingCache
\ No newline at end of file
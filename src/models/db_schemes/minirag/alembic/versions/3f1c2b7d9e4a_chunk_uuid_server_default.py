@@ -0,0 +1,32 @@
+"""chunk uuid server default
+
+Revision ID: 3f1c2b7d9e4a
+Revises: 9ad8a86aa19f
+Create Date: 2026-10-18 10:12:31.402117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1c2b7d9e4a'
+down_revision: Union[str, None] = '9ad8a86aa19f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.alter_column('chunks', 'chunk_uuid',
+               existing_type=sa.UUID(),
+               server_default=sa.text('gen_random_uuid()'),
+               existing_nullable=False)
+
+
+def downgrade() -> None:
+    op.alter_column('chunks', 'chunk_uuid',
+               existing_type=sa.UUID(),
+               server_default=None,
+               existing_nullable=False)
@@ -0,0 +1,26 @@
+"""chunk project keyset index
+
+Revision ID: 8b4e6a1f0c23
+Revises: 3f1c2b7d9e4a
+Create Date: 2026-10-18 11:03:47.218530
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b4e6a1f0c23'
+down_revision: Union[str, None] = '3f1c2b7d9e4a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_chunk_project_id_chunk_id', 'chunks', ['chunk_project_id', 'chunk_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_chunk_project_id_chunk_id', table_name='chunks')
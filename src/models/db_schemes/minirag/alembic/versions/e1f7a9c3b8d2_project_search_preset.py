@@ -0,0 +1,26 @@
+"""project search preset
+
+Revision ID: e1f7a9c3b8d2
+Revises: c5d2e8f71a46
+Create Date: 2026-10-18 14:26:09.541872
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1f7a9c3b8d2'
+down_revision: Union[str, None] = 'c5d2e8f71a46'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('projects', sa.Column('project_search_preset', sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('projects', 'project_search_preset')
@@ -4,14 +4,14 @@ from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy import Index
 from pydantic import BaseModel
-import uuid
+from typing import Optional
 
 class DataChunk(SQLAlchemyBase):
 
     __tablename__ = "chunks"
 
     chunk_id = Column(Integer, primary_key=True, autoincrement=True)
-    chunk_uuid = Column(UUID(as_uuid=True), default=uuid.uuid4, unique=True, nullable=False)
+    chunk_uuid = Column(UUID(as_uuid=True), server_default=func.gen_random_uuid(), unique=True, nullable=False)
 
     chunk_text = Column(String, nullable=False)
     chunk_metadata = Column(JSONB, nullable=True)
@@ -29,8 +29,10 @@ class DataChunk(SQLAlchemyBase):
     __table_args__ = (
         Index('ix_chunk_project_id', chunk_project_id),
         Index('ix_chunk_asset_id', chunk_asset_id),
+        Index('ix_chunk_project_id_chunk_id', chunk_project_id, chunk_id),
     )
 
 class RetrievedDocument(BaseModel):
     text: str
-    score: float
\ No newline at end of file
+    score: float
+    chunk_id: Optional[int] = None
\ No newline at end of file
@@ -0,0 +1,21 @@
+from .minirag_base import SQLAlchemyBase
+from sqlalchemy import Column, Integer, DateTime, func, String, LargeBinary
+from sqlalchemy import PrimaryKeyConstraint
+
+class EmbeddingCache(SQLAlchemyBase):
+
+    __tablename__ = "embedding_cache"
+
+    cache_model_id = Column(String, nullable=False)
+    cache_document_type = Column(String, nullable=False)
+    cache_content_hash = Column(String(64), nullable=False)
+
+    # float32 little-endian bytes
+    cache_embedding = Column(LargeBinary, nullable=False)
+    cache_embedding_size = Column(Integer, nullable=False)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        PrimaryKeyConstraint(cache_model_id, cache_document_type, cache_content_hash),
+    )
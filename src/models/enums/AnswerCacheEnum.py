@@ -0,0 +1,9 @@
+from enum import Enum
+
+class AnswerCacheEnum(Enum):
+
+    HIT = "hit"
+    MISS = "miss"
+    SEMANTIC_HIT = "semantic_hit"
+    BYPASS = "bypass"
+    DISABLED = "disabled"
@@ -19,4 +19,11 @@ class ResponseSignal(Enum):
     VECTORDB_SEARCH_SUCCESS = "vectordb_search_success"
     RAG_ANSWER_ERROR = "rag_answer_error"
     RAG_ANSWER_SUCCESS = "rag_answer_success"
+    SEARCH_PRESET_NOT_SUPPORTED = "search_preset_not_supported"
+    SEARCH_PRESET_UPDATED = "search_preset_updated"
+    VECTORDB_INDEX_REBUILD_STARTED = "vectordb_index_rebuild_started"
+    VECTORDB_INDEX_REBUILD_ERROR = "vectordb_index_rebuild_error"
+    VECTORDB_INDEX_PROGRESS_RETRIEVED = "vectordb_index_progress_retrieved"
+    VECTORDB_LEAN_MIGRATION_SUCCESS = "vectordb_lean_migration_success"
+    VECTORDB_LEAN_MIGRATION_ERROR = "vectordb_lean_migration_error"
     
\ No newline at end of file
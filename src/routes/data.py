@@ -1,8 +1,10 @@
 from fastapi import FastAPI, APIRouter, Depends, UploadFile, status, Request
 from fastapi.responses import JSONResponse
 import os
+import asyncio
 from helpers.config import get_settings, Settings
-from controllers import DataController, ProjectController, ProcessController
+from controllers import DataController, ProjectController
+from controllers.ProcessController import process_file_job
 import aiofiles
 from models import ResponseSignal
 import logging
@@ -10,7 +12,7 @@ from .schemes.data import ProcessRequest
 from models.ProjectModel import ProjectModel
 from models.ChunkModel import ChunkModel
 from models.AssetModel import AssetModel
-from models.db_schemes import DataChunk, Asset
+from models.db_schemes import Asset
 from models.enums.AssetTypeEnum import AssetTypeEnum
 from controllers import NLPController
 
@@ -109,6 +111,9 @@ async def process_endpoint(request: Request, project_id: int, process_request: P
         generation_client=request.app.generation_client,
         embedding_client=request.app.embedding_client,
         template_parser=request.app.template_parser,
+        answer_cache=request.app.answer_cache,
+        semantic_cache=request.app.semantic_cache,
+        cache_invalidator=request.app.cache_invalidator,
     )
 
     asset_model = await AssetModel.create_instance(
@@ -155,8 +160,6 @@ async def process_endpoint(request: Request, project_id: int, process_request: P
             }
         )
     
-    process_controller = ProcessController(project_id=project_id)
-
     no_records = 0
     no_files = 0
 
@@ -165,6 +168,9 @@ async def process_endpoint(request: Request, project_id: int, process_request: P
                     )
 
     if do_reset == 1:
+        # answers cached over the old chunks
+        await nlp_controller.invalidate_answer_cache(project=project)
+
         # delete associated vectors collection
         collection_name = nlp_controller.create_collection_name(project_id=project.project_id)
         _ = await request.app.vectordb_client.delete_collection(collection_name=collection_name)
@@ -174,22 +180,71 @@ async def process_endpoint(request: Request, project_id: int, process_request: P
             project_id=project.project_id
         )
 
-    for asset_id, file_id in project_files_ids.items():
+    app_settings = get_settings()
+
+    async def insert_file_chunks(asset_id: int, file_id: str) -> int:
+        # the chunks of the file arrive in batches, each is inserted before the next is read
+        file_chunks_count = 0
+        first_chunk_id = None
+        try:
+            async for file_chunks in request.app.process_pool.stream(
+                process_file_job,
+                project_id=project_id,
+                file_id=file_id,
+                chunk_size=chunk_size,
+                overlap_size=overlap_size,
+                batch_size=app_settings.PROCESS_CHUNKS_BATCH_SIZE,
+            ):
+                file_chunks_records = [
+                    {
+                        "chunk_text": chunk.page_content,
+                        "chunk_metadata": chunk.metadata,
+                        "chunk_order": file_chunks_count + i + 1,
+                        "chunk_project_id": project.project_id,
+                        "chunk_asset_id": asset_id,
+                    }
+                    for i, chunk in enumerate(file_chunks)
+                ]
+
+                chunks_ids = await chunk_model.bulk_insert_chunks(chunks=file_chunks_records)
+                if chunks_ids and first_chunk_id is None:
+                    first_chunk_id = min(chunks_ids)
+                file_chunks_count += len(chunks_ids)
+
+        except BaseException:
+            # failed or cancelled mid-file: drop the batches already inserted,
+            # a later push must not index half of the file
+            if first_chunk_id is not None:
+                await chunk_model.delete_chunks_by_asset_id(asset_id=asset_id, from_chunk_id=first_chunk_id)
+            raise
+
+        return file_chunks_count
+
+    # parse and chunk the files concurrently in the process pool,
+    # the pool bounds how many files are in flight at once
+    file_jobs = {
+        asset_id: asyncio.ensure_future(insert_file_chunks(asset_id=asset_id, file_id=file_id))
+        for asset_id, file_id in project_files_ids.items()
+    }
 
-        file_content = process_controller.get_file_content(file_id=file_id)
+    for asset_id, file_id in project_files_ids.items():
 
-        if file_content is None:
-            logger.error(f"Error while processing file: {file_id}")
+        try:
+            file_chunks_count = await file_jobs[asset_id]
+        except Exception as e:
+            logger.error(f"Error while processing file: {file_id}: {e}")
             continue
 
-        file_chunks = process_controller.process_file_content(
-            file_content=file_content,
-            file_id=file_id,
-            chunk_size=chunk_size,
-            overlap_size=overlap_size
-        )
+        if file_chunks_count == 0:
+            for job in file_jobs.values():
+                job.cancel()
+
+            # wait for the cancelled files to drop their partial chunks
+            await asyncio.gather(*file_jobs.values(), return_exceptions=True)
+
+            if do_reset == 1:
+                await nlp_controller.invalidate_answer_cache(project=project)
 
-        if file_chunks is None or len(file_chunks) == 0:
             return JSONResponse(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 content={
@@ -197,20 +252,13 @@ async def process_endpoint(request: Request, project_id: int, process_request: P
                 }
             )
 
-        file_chunks_records = [
-            DataChunk(
-                chunk_text=chunk.page_content,
-                chunk_metadata=chunk.metadata,
-                chunk_order=i+1,
-                chunk_project_id=project.project_id,
-                chunk_asset_id=asset_id
-            )
-            for i, chunk in enumerate(file_chunks)
-        ]
-
-        no_records += await chunk_model.insert_many_chunks(chunks=file_chunks_records)
+        no_records += file_chunks_count
         no_files += 1
 
+    if do_reset == 1:
+        # answers cached while the project was being re-processed
+        await nlp_controller.invalidate_answer_cache(project=project)
+
     return JSONResponse(
         content={
             "signal": ResponseSignal.PROCESSING_SUCCESS.value,
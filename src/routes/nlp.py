@@ -1,13 +1,18 @@
 from fastapi import FastAPI, APIRouter, status, Request
-from fastapi.responses import JSONResponse
-from routes.schemes.nlp import PushRequest, SearchRequest
+from fastapi.responses import JSONResponse, StreamingResponse
+from routes.schemes.nlp import (PushRequest, SearchRequest, SearchBatchRequest, SearchPresetRequest,
+                                RebuildIndexRequest)
 from models.ProjectModel import ProjectModel
 from models.ChunkModel import ChunkModel
 from controllers import NLPController
 from models import ResponseSignal
+from helpers.config import get_settings
+from stores.vectordb.SearchPresets import get_search_preset
+from stores.vectordb.VectorDBEnums import PgVectorIndexTypeEnums
 from tqdm.auto import tqdm
 
 import logging
+import json
 
 logger = logging.getLogger('uvicorn.error')
 
@@ -16,6 +21,13 @@ nlp_router = APIRouter(
     tags=["api_v1", "nlp"],
 )
 
+def get_search_preset_name(requested_preset: str, project, app_settings):
+    # request preset, then the project preset, then the app default
+    return requested_preset or project.project_search_preset or app_settings.VECTOR_DB_SEARCH_DEFAULT_PRESET
+
+def format_sse_event(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
 @nlp_router.post("/index/push/{project_id}")
 async def index_project(request: Request, project_id: int, push_request: PushRequest):
 
@@ -44,12 +56,13 @@ async def index_project(request: Request, project_id: int, push_request: PushReq
         generation_client=request.app.generation_client,
         embedding_client=request.app.embedding_client,
         template_parser=request.app.template_parser,
+        answer_cache=request.app.answer_cache,
+        semantic_cache=request.app.semantic_cache,
+        cache_invalidator=request.app.cache_invalidator,
     )
 
-    has_records = True
-    page_no = 1
-    inserted_items_count = 0
-    idx = 0
+    # answers cached over the previous index
+    await nlp_controller.invalidate_answer_cache(project=project)
 
     # create collection if not exists
     collection_name = nlp_controller.create_collection_name(project_id=project.project_id)
@@ -64,39 +77,42 @@ async def index_project(request: Request, project_id: int, push_request: PushReq
     total_chunks_count = await chunk_model.get_total_chunks_count(project_id=project.project_id)
     pbar = tqdm(total=total_chunks_count, desc="Vector Indexing", position=0)
 
-    while has_records:
-        page_chunks = await chunk_model.get_poject_chunks(project_id=project.project_id, page_no=page_no)
-        if len(page_chunks):
-            page_no += 1
-        
-        if not page_chunks or len(page_chunks) == 0:
-            has_records = False
-            break
-
-        chunks_ids =  [ c.chunk_id for c in page_chunks ]
-        idx += len(page_chunks)
-        
-        is_inserted = await nlp_controller.index_into_vector_db(
-            project=project,
-            chunks=page_chunks,
-            chunks_ids=chunks_ids
-        )
+    app_settings = get_settings()
 
-        if not is_inserted:
-            return JSONResponse(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                content={
-                    "signal": ResponseSignal.INSERT_INTO_VECTORDB_ERROR.value
-                }
+    # load every vector first, then build the vector index once,
+    # a failed load leaves through bulk_load's error path
+    try:
+        async with request.app.vectordb_client.bulk_load(collection_name=collection_name,
+                                                         expected_rows=total_chunks_count) as bulk_load_session:
+            inserted_items_count = await nlp_controller.index_into_vector_db_pipeline(
+                project=project,
+                chunks_pages=chunk_model.iter_project_chunks(project_id=project.project_id),
+                embedding_workers=app_settings.INDEXING_EMBEDDING_WORKERS,
+                embedding_batch_size=app_settings.INDEXING_EMBEDDING_BATCH_SIZE,
+                insert_batch_size=app_settings.INDEXING_INSERT_BATCH_SIZE,
+                queue_size=app_settings.INDEXING_QUEUE_SIZE,
+                on_progress=pbar.update,
             )
+    except Exception as e:
+        logger.error(f"Error while pushing project {project.project_id} into the vector db: {e}")
+        inserted_items_count = None
+    finally:
+        # answers cached while the collection was partly loaded
+        await nlp_controller.invalidate_answer_cache(project=project)
+
+    if inserted_items_count is None:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "signal": ResponseSignal.INSERT_INTO_VECTORDB_ERROR.value
+            }
+        )
 
-        pbar.update(len(page_chunks))
-        inserted_items_count += len(page_chunks)
-        
     return JSONResponse(
         content={
             "signal": ResponseSignal.INSERT_INTO_VECTORDB_SUCCESS.value,
-            "inserted_items_count": inserted_items_count
+            "inserted_items_count": inserted_items_count,
+            "index_build_seconds": bulk_load_session["index_build_seconds"],
         }
     )
 
@@ -116,6 +132,9 @@ async def get_project_index_info(request: Request, project_id: int):
         generation_client=request.app.generation_client,
         embedding_client=request.app.embedding_client,
         template_parser=request.app.template_parser,
+        answer_cache=request.app.answer_cache,
+        semantic_cache=request.app.semantic_cache,
+        cache_invalidator=request.app.cache_invalidator,
     )
 
     collection_info = await nlp_controller.get_vector_db_collection_info(project=project)
@@ -127,6 +146,121 @@ async def get_project_index_info(request: Request, project_id: int):
         }
     )
 
+@nlp_router.post("/index/rebuild/{project_id}")
+async def rebuild_project_index(request: Request, project_id: int, rebuild_request: RebuildIndexRequest):
+
+    if rebuild_request.index_type and rebuild_request.index_type not in [ e.value for e in PgVectorIndexTypeEnums ]:
+        return JSONResponse(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                content={
+                    "signal": ResponseSignal.VECTORDB_INDEX_REBUILD_ERROR.value
+                }
+            )
+
+    project_model = await ProjectModel.create_instance(
+        db_client=request.app.db_client
+    )
+
+    project = await project_model.get_project_or_create_one(
+        project_id=project_id
+    )
+
+    nlp_controller = NLPController(
+        vectordb_client=request.app.vectordb_client,
+        generation_client=request.app.generation_client,
+        embedding_client=request.app.embedding_client,
+        template_parser=request.app.template_parser,
+        answer_cache=request.app.answer_cache,
+        semantic_cache=request.app.semantic_cache,
+        cache_invalidator=request.app.cache_invalidator,
+    )
+
+    # the rebuild runs in the background, its progress is served by GET /index/rebuild
+    is_started = await nlp_controller.rebuild_vector_db_index(project=project,
+                                                              index_type=rebuild_request.index_type)
+
+    if not is_started:
+        return JSONResponse(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                content={
+                    "signal": ResponseSignal.VECTORDB_INDEX_REBUILD_ERROR.value
+                }
+            )
+
+    return JSONResponse(
+        content={
+            "signal": ResponseSignal.VECTORDB_INDEX_REBUILD_STARTED.value
+        }
+    )
+
+@nlp_router.get("/index/rebuild/{project_id}")
+async def get_project_index_progress(request: Request, project_id: int):
+
+    project_model = await ProjectModel.create_instance(
+        db_client=request.app.db_client
+    )
+
+    project = await project_model.get_project_or_create_one(
+        project_id=project_id
+    )
+
+    nlp_controller = NLPController(
+        vectordb_client=request.app.vectordb_client,
+        generation_client=request.app.generation_client,
+        embedding_client=request.app.embedding_client,
+        template_parser=request.app.template_parser,
+        answer_cache=request.app.answer_cache,
+        semantic_cache=request.app.semantic_cache,
+        cache_invalidator=request.app.cache_invalidator,
+    )
+
+    index_progress = await nlp_controller.get_vector_db_index_progress(project=project)
+
+    return JSONResponse(
+        content={
+            "signal": ResponseSignal.VECTORDB_INDEX_PROGRESS_RETRIEVED.value,
+            "index_progress": index_progress
+        }
+    )
+
+@nlp_router.post("/index/migrate/lean/{project_id}")
+async def migrate_project_index_to_lean(request: Request, project_id: int):
+
+    project_model = await ProjectModel.create_instance(
+        db_client=request.app.db_client
+    )
+
+    project = await project_model.get_project_or_create_one(
+        project_id=project_id
+    )
+
+    nlp_controller = NLPController(
+        vectordb_client=request.app.vectordb_client,
+        generation_client=request.app.generation_client,
+        embedding_client=request.app.embedding_client,
+        template_parser=request.app.template_parser,
+        answer_cache=request.app.answer_cache,
+        semantic_cache=request.app.semantic_cache,
+        cache_invalidator=request.app.cache_invalidator,
+    )
+
+    # drops the text column of the collection, searches then read chunks.chunk_text
+    is_migrated = await nlp_controller.migrate_vector_db_collection_to_lean(project=project)
+
+    if not is_migrated:
+        return JSONResponse(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                content={
+                    "signal": ResponseSignal.VECTORDB_LEAN_MIGRATION_ERROR.value
+                }
+            )
+
+    return JSONResponse(
+        content={
+            "signal": ResponseSignal.VECTORDB_LEAN_MIGRATION_SUCCESS.value
+        }
+    )
+
 @nlp_router.post("/index/search/{project_id}")
 async def search_index(request: Request, project_id: int, search_request: SearchRequest):
     
@@ -143,10 +277,30 @@ async def search_index(request: Request, project_id: int, search_request: Search
         generation_client=request.app.generation_client,
         embedding_client=request.app.embedding_client,
         template_parser=request.app.template_parser,
+        answer_cache=request.app.answer_cache,
+        semantic_cache=request.app.semantic_cache,
+        cache_invalidator=request.app.cache_invalidator,
     )
 
+    app_settings = get_settings()
+
+    search_preset = get_search_preset_name(search_request.search_preset, project, app_settings)
+
+    if get_search_preset(search_preset) is None:
+        return JSONResponse(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                content={
+                    "signal": ResponseSignal.SEARCH_PRESET_NOT_SUPPORTED.value
+                }
+            )
+
     results = await nlp_controller.search_vector_db_collection(
-        project=project, text=search_request.text, limit=search_request.limit
+        project=project, text=search_request.text, limit=search_request.limit,
+        retrieval_mode=search_request.retrieval_mode or app_settings.RETRIEVAL_DEFAULT_MODE,
+        candidates_limit=app_settings.RETRIEVAL_HYBRID_CANDIDATES,
+        rrf_k=app_settings.RETRIEVAL_RRF_K,
+        filters=search_request.filters.dict(exclude_none=True) if search_request.filters else None,
+        search_preset=search_preset,
     )
 
     if not results:
@@ -164,6 +318,60 @@ async def search_index(request: Request, project_id: int, search_request: Search
         }
     )
 
+@nlp_router.post("/index/search/batch/{project_id}")
+async def search_index_batch(request: Request, project_id: int, search_request: SearchBatchRequest):
+
+    project_model = await ProjectModel.create_instance(
+        db_client=request.app.db_client
+    )
+
+    project = await project_model.get_project_or_create_one(
+        project_id=project_id
+    )
+
+    nlp_controller = NLPController(
+        vectordb_client=request.app.vectordb_client,
+        generation_client=request.app.generation_client,
+        embedding_client=request.app.embedding_client,
+        template_parser=request.app.template_parser,
+        answer_cache=request.app.answer_cache,
+        semantic_cache=request.app.semantic_cache,
+        cache_invalidator=request.app.cache_invalidator,
+    )
+
+    search_preset = get_search_preset_name(search_request.search_preset, project, get_settings())
+
+    if get_search_preset(search_preset) is None:
+        return JSONResponse(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                content={
+                    "signal": ResponseSignal.SEARCH_PRESET_NOT_SUPPORTED.value
+                }
+            )
+
+    results = await nlp_controller.search_vector_db_collection_batch(
+        project=project, texts=search_request.texts, limit=search_request.limit,
+        search_preset=search_preset,
+    )
+
+    if results is False:
+        return JSONResponse(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                content={
+                    "signal": ResponseSignal.VECTORDB_SEARCH_ERROR.value
+                }
+            )
+
+    return JSONResponse(
+        content={
+            "signal": ResponseSignal.VECTORDB_SEARCH_SUCCESS.value,
+            "results": [
+                [ result.dict() for result in query_results ]
+                for query_results in results
+            ]
+        }
+    )
+
 @nlp_router.post("/index/answer/{project_id}")
 async def answer_rag(request: Request, project_id: int, search_request: SearchRequest):
     
@@ -180,12 +388,33 @@ async def answer_rag(request: Request, project_id: int, search_request: SearchRe
         generation_client=request.app.generation_client,
         embedding_client=request.app.embedding_client,
         template_parser=request.app.template_parser,
+        answer_cache=request.app.answer_cache,
+        semantic_cache=request.app.semantic_cache,
+        cache_invalidator=request.app.cache_invalidator,
     )
 
-    answer, full_prompt, chat_history = await nlp_controller.answer_rag_question(
+    app_settings = get_settings()
+
+    search_preset = get_search_preset_name(search_request.search_preset, project, app_settings)
+
+    if get_search_preset(search_preset) is None:
+        return JSONResponse(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                content={
+                    "signal": ResponseSignal.SEARCH_PRESET_NOT_SUPPORTED.value
+                }
+            )
+
+    answer, full_prompt, chat_history, cache_status = await nlp_controller.answer_rag_question(
         project=project,
         query=search_request.text,
         limit=search_request.limit,
+        retrieval_mode=search_request.retrieval_mode or app_settings.RETRIEVAL_DEFAULT_MODE,
+        candidates_limit=app_settings.RETRIEVAL_HYBRID_CANDIDATES,
+        rrf_k=app_settings.RETRIEVAL_RRF_K,
+        filters=search_request.filters.dict(exclude_none=True) if search_request.filters else None,
+        search_preset=search_preset,
+        bypass_cache=search_request.bypass_cache,
     )
 
     if not answer:
@@ -201,6 +430,98 @@ async def answer_rag(request: Request, project_id: int, search_request: SearchRe
             "signal": ResponseSignal.RAG_ANSWER_SUCCESS.value,
             "answer": answer,
             "full_prompt": full_prompt,
-            "chat_history": chat_history
+            "chat_history": chat_history,
+            "cache_status": cache_status,
+        }
+    )
+
+@nlp_router.post("/index/answer/stream/{project_id}")
+async def stream_rag_answer(request: Request, project_id: int, search_request: SearchRequest):
+
+    project_model = await ProjectModel.create_instance(
+        db_client=request.app.db_client
+    )
+
+    project = await project_model.get_project_or_create_one(
+        project_id=project_id
+    )
+
+    nlp_controller = NLPController(
+        vectordb_client=request.app.vectordb_client,
+        generation_client=request.app.generation_client,
+        embedding_client=request.app.embedding_client,
+        template_parser=request.app.template_parser,
+        answer_cache=request.app.answer_cache,
+        semantic_cache=request.app.semantic_cache,
+        cache_invalidator=request.app.cache_invalidator,
+    )
+
+    app_settings = get_settings()
+
+    search_preset = get_search_preset_name(search_request.search_preset, project, app_settings)
+
+    if get_search_preset(search_preset) is None:
+        return JSONResponse(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                content={
+                    "signal": ResponseSignal.SEARCH_PRESET_NOT_SUPPORTED.value
+                }
+            )
+
+    answer_events = nlp_controller.stream_rag_answer(
+        project=project,
+        query=search_request.text,
+        limit=search_request.limit,
+        retrieval_mode=search_request.retrieval_mode or app_settings.RETRIEVAL_DEFAULT_MODE,
+        candidates_limit=app_settings.RETRIEVAL_HYBRID_CANDIDATES,
+        rrf_k=app_settings.RETRIEVAL_RRF_K,
+        filters=search_request.filters.dict(exclude_none=True) if search_request.filters else None,
+        search_preset=search_preset,
+        bypass_cache=search_request.bypass_cache,
+    )
+
+    async def event_stream():
+        async for event, data in answer_events:
+            yield format_sse_event(event, data)
+
+    # no proxy buffering, every token is flushed as it arrives
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+        }
+    )
+
+@nlp_router.post("/index/preset/{project_id}")
+async def set_project_search_preset(request: Request, project_id: int, preset_request: SearchPresetRequest):
+
+    if preset_request.search_preset and get_search_preset(preset_request.search_preset) is None:
+        return JSONResponse(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                content={
+                    "signal": ResponseSignal.SEARCH_PRESET_NOT_SUPPORTED.value
+                }
+            )
+
+    project_model = await ProjectModel.create_instance(
+        db_client=request.app.db_client
+    )
+
+    project = await project_model.get_project_or_create_one(
+        project_id=project_id
+    )
+
+    # an empty preset resets the project to the app default
+    _ = await project_model.update_project_search_preset(
+        project_id=project.project_id,
+        search_preset=preset_request.search_preset or None,
+    )
+
+    return JSONResponse(
+        content={
+            "signal": ResponseSignal.SEARCH_PRESET_UPDATED.value,
+            "search_preset": preset_request.search_preset or None,
         }
     )
\ No newline at end of file
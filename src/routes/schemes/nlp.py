@@ -1,9 +1,30 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import Optional, List, Dict, Any
 
 class PushRequest(BaseModel):
     do_reset: Optional[int] = 0
 
+class SearchFilters(BaseModel):
+    asset_id: Optional[int] = None
+    page_from: Optional[int] = None
+    page_to: Optional[int] = None
+    metadata: Optional[Dict[str, Any]] = None
+
 class SearchRequest(BaseModel):
     text: str
     limit: Optional[int] = 5
+    retrieval_mode: Optional[str] = None
+    filters: Optional[SearchFilters] = None
+    search_preset: Optional[str] = None
+    bypass_cache: Optional[bool] = False
+
+class SearchBatchRequest(BaseModel):
+    texts: List[str]
+    limit: Optional[int] = 5
+    search_preset: Optional[str] = None
+
+class SearchPresetRequest(BaseModel):
+    search_preset: Optional[str] = None
+
+class RebuildIndexRequest(BaseModel):
+    index_type: Optional[str] = None
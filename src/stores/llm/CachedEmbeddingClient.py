@@ -0,0 +1,107 @@
+from models.EmbeddingCacheModel import EmbeddingCacheModel
+from utils.lru_cache import LRUCache
+from utils.metrics import EMBEDDING_CACHE_HITS, EMBEDDING_CACHE_MISSES
+from .LLMEnums import DocumentTypeEnum
+from typing import List, Union
+import hashlib
+import logging
+
+class CachedEmbeddingClient:
+    """
+    Wraps an LLM provider and caches the output of `aembed_text`.
+    Entries are keyed by embedding model id, document type and content hash,
+    looked up in an optional in-process LRU tier first and then in Postgres.
+    Misses are embedded in a single provider call.
+    Every other attribute is delegated to the wrapped provider.
+    """
+
+    def __init__(self, client, cache_model: EmbeddingCacheModel, lru_size: int = 0):
+        self.client = client
+        self.cache_model = cache_model
+        self.lru_cache = LRUCache(max_size=lru_size) if lru_size and lru_size > 0 else None
+
+        self.logger = logging.getLogger('uvicorn')
+
+    def __getattr__(self, name):
+        return getattr(self.client, name)
+
+    def get_content_hash(self, text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    async def aembed_text(self, text: Union[str, List[str]], document_type: str = None):
+
+        if isinstance(text, str):
+            text = [text]
+
+        model_id = self.client.embedding_model_id
+        cache_document_type = document_type if document_type else DocumentTypeEnum.DOCUMENT.value
+
+        content_hashes = [ self.get_content_hash(t) for t in text ]
+        embeddings = {}
+
+        # tier 1: in-process lru
+        if self.lru_cache is not None:
+            for content_hash in content_hashes:
+                embedding = self.lru_cache.get((model_id, cache_document_type, content_hash))
+                if embedding is not None:
+                    embeddings[content_hash] = embedding
+
+            if embeddings:
+                EMBEDDING_CACHE_HITS.labels(tier="memory").inc(len(embeddings))
+
+        # tier 2: postgres
+        lookup_hashes = list({ h for h in content_hashes if h not in embeddings })
+        if lookup_hashes:
+            try:
+                db_embeddings = await self.cache_model.get_embeddings(
+                    model_id=model_id,
+                    document_type=cache_document_type,
+                    content_hashes=lookup_hashes,
+                )
+            except Exception as e:
+                self.logger.error(f"Error while reading the embedding cache: {e}")
+                db_embeddings = {}
+
+            if db_embeddings:
+                EMBEDDING_CACHE_HITS.labels(tier="database").inc(len(db_embeddings))
+                embeddings.update(db_embeddings)
+                self.put_memory(model_id, cache_document_type, db_embeddings)
+
+        # misses: one batched provider call for the unique missing texts
+        missing_texts = {}
+        for content_hash, t in zip(content_hashes, text):
+            if content_hash not in embeddings:
+                missing_texts[content_hash] = t
+
+        if missing_texts:
+            EMBEDDING_CACHE_MISSES.inc(len(missing_texts))
+
+            vectors = await self.client.aembed_text(
+                text=list(missing_texts.values()),
+                document_type=document_type,
+            )
+
+            if not vectors or len(vectors) != len(missing_texts):
+                return None
+
+            new_embeddings = dict(zip(missing_texts.keys(), vectors))
+            embeddings.update(new_embeddings)
+            self.put_memory(model_id, cache_document_type, new_embeddings)
+
+            try:
+                await self.cache_model.insert_embeddings(
+                    model_id=model_id,
+                    document_type=cache_document_type,
+                    embeddings=new_embeddings,
+                )
+            except Exception as e:
+                self.logger.error(f"Error while writing the embedding cache: {e}")
+
+        return [ embeddings[h] for h in content_hashes ]
+
+    def put_memory(self, model_id: str, document_type: str, embeddings: dict):
+        if self.lru_cache is None:
+            return
+
+        for content_hash, embedding in embeddings.items():
+            self.lru_cache.put((model_id, document_type, content_hash), embedding)
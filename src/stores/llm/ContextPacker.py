@@ -0,0 +1,101 @@
+from typing import List
+import logging
+import math
+import re
+
+class ContextPacker:
+    """
+    Packs retrieved documents into a prompt token budget.
+    Near duplicate documents (word shingle containment above `overlap_threshold`)
+    keep only their best scored copy, then documents are added greedily by score
+    while they fit in what the fixed prompts (system, footer and query) leave of `max_tokens`.
+    The fixed prompts are never cut.
+    """
+
+    def __init__(self, max_tokens: int = 3000, overlap_threshold: float = 0.8,
+                       shingle_size: int = 5):
+        self.max_tokens = max_tokens
+        self.overlap_threshold = overlap_threshold
+        self.shingle_size = shingle_size
+
+        self.logger = logging.getLogger('uvicorn')
+
+    def estimate_tokens(self, text: str) -> int:
+        # ~4 characters per token, used when the provider can not count
+        return math.ceil(len(text) / 4)
+
+    async def count_tokens(self, generation_client, texts: List[str]) -> List[int]:
+        if not texts:
+            return []
+
+        counts = None
+        try:
+            counts = await generation_client.acount_tokens(texts=texts)
+        except Exception as e:
+            self.logger.error(f"Error while counting prompt tokens: {e}")
+
+        if not counts or len(counts) != len(texts):
+            return [ self.estimate_tokens(text) for text in texts ]
+
+        return counts
+
+    def get_shingles(self, text: str) -> set:
+        words = re.findall(r"\w+", text.lower())
+        if len(words) <= self.shingle_size:
+            return { tuple(words) } if words else set()
+
+        return {
+            tuple(words[i:i + self.shingle_size])
+            for i in range(len(words) - self.shingle_size + 1)
+        }
+
+    def deduplicate(self, documents: list) -> list:
+        kept, kept_shingles = [], []
+        for document in sorted(documents, key=lambda doc: doc.score, reverse=True):
+            shingles = self.get_shingles(document.text)
+
+            is_duplicate = any([
+                len(shingles & other) / max(min(len(shingles), len(other)), 1) >= self.overlap_threshold
+                for other in kept_shingles
+            ]) if shingles else True
+
+            if not is_duplicate:
+                kept.append(document)
+                kept_shingles.append(shingles)
+
+        return kept
+
+    async def pack(self, generation_client, documents: list, fixed_prompts: List[str],
+                         document_template_prompt: str = ""):
+        """
+        `document_template_prompt` is the document prompt rendered with an empty text,
+        its tokens are charged once per packed document.
+        Returns the packed documents, best first, and the prompt tokens count.
+        """
+
+        documents = self.deduplicate(documents)
+
+        counts = await self.count_tokens(
+            generation_client,
+            fixed_prompts + [ document_template_prompt ] + [ doc.text for doc in documents ],
+        )
+        fixed_tokens = sum(counts[:len(fixed_prompts)])
+        document_overhead = counts[len(fixed_prompts)]
+        document_tokens = counts[len(fixed_prompts) + 1:]
+
+        available_tokens = self.max_tokens - fixed_tokens
+        packed, packed_tokens = [], 0
+        for document, tokens in zip(documents, document_tokens):
+            if packed_tokens + tokens + document_overhead <= available_tokens:
+                packed.append(document)
+                packed_tokens += tokens + document_overhead
+
+        # nothing fits whole: keep the head of the best document rather than no context at all
+        remaining_tokens = available_tokens - document_overhead
+        if not packed and documents and remaining_tokens > 0:
+            best, best_tokens = documents[0], max(document_tokens[0], 1)
+            cut = int(len(best.text) * remaining_tokens / best_tokens)
+            packed = [ best.copy(update={ "text": best.text[:cut].strip() }) ]
+            packed_tokens = min(best_tokens, remaining_tokens) + document_overhead
+
+        return packed, fixed_tokens + packed_tokens
@@ -9,6 +9,8 @@ class OpenAIEnums(Enum):
     USER = "user"
     ASSISTANT = "assistant"
 
+    DEFAULT_TOKENIZER_ENCODING = "cl100k_base"
+
 class CoHereEnums(Enum):
     SYSTEM = "SYSTEM"
     USER = "USER"
@@ -17,6 +19,8 @@ class CoHereEnums(Enum):
     DOCUMENT = "search_document"
     QUERY = "search_query"
 
+    TEXT_GENERATION_EVENT = "text-generation"
+
 class HuggingFaceEnums(Enum):
     SYSTEM = "system"
     USER = "user"
@@ -1,10 +1,31 @@
 
 from .LLMEnums import LLMEnums
 from .providers import OpenAIProvider, CoHereProvider
+import httpx
 
 class LLMProviderFactory:
     def __init__(self, config: dict):
         self.config = config
+        self.http_client = None
+
+    def get_http_client(self):
+        """
+        One keep-alive connection pool shared by every async provider client of this factory.
+        """
+        if self.http_client is None:
+            self.http_client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=self.config.LLM_HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=self.config.LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=self.config.LLM_HTTP_KEEPALIVE_EXPIRY,
+                ),
+                timeout=httpx.Timeout(
+                    self.config.LLM_HTTP_TIMEOUT,
+                    connect=self.config.LLM_HTTP_CONNECT_TIMEOUT,
+                ),
+            )
+
+        return self.http_client
 
     def create(self, provider: str):
         if provider == LLMEnums.OPENAI.value:
@@ -13,7 +34,8 @@ class LLMProviderFactory:
                 api_url = self.config.OPENAI_API_URL,
                 default_input_max_characters=self.config.INPUT_DAFAULT_MAX_CHARACTERS,
                 default_generation_max_output_tokens=self.config.GENERATION_DAFAULT_MAX_TOKENS,
-                default_generation_temperature=self.config.GENERATION_DAFAULT_TEMPERATURE
+                default_generation_temperature=self.config.GENERATION_DAFAULT_TEMPERATURE,
+                http_client=self.get_http_client()
             )
 
         if provider == LLMEnums.COHERE.value:
@@ -21,7 +43,8 @@ class LLMProviderFactory:
                 api_key = self.config.COHERE_API_KEY,
                 default_input_max_characters=self.config.INPUT_DAFAULT_MAX_CHARACTERS,
                 default_generation_max_output_tokens=self.config.GENERATION_DAFAULT_MAX_TOKENS,
-                default_generation_temperature=self.config.GENERATION_DAFAULT_TEMPERATURE
+                default_generation_temperature=self.config.GENERATION_DAFAULT_TEMPERATURE,
+                http_client=self.get_http_client()
             )
 
   
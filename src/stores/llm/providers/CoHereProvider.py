@@ -1,6 +1,10 @@
 from ..LLMInterface import LLMInterface
 from ..LLMEnums import CoHereEnums, DocumentTypeEnum
 import cohere
+from tokenizers import Tokenizer
+import asyncio
+import httpx
+import numpy as np
 import logging
 from typing import List, Union
 
@@ -9,7 +13,8 @@ class CoHereProvider(LLMInterface):
     def __init__(self, api_key: str,
                        default_input_max_characters: int=1000,
                        default_generation_max_output_tokens: int=1000,
-                       default_generation_temperature: float=0.1):
+                       default_generation_temperature: float=0.1,
+                       http_client: httpx.AsyncClient=None):
         
         self.api_key = api_key
 
@@ -18,17 +23,25 @@ class CoHereProvider(LLMInterface):
         self.default_generation_temperature = default_generation_temperature
 
         self.generation_model_id = None
+        self.tokenizer = None
+        self.tokenizer_error = None
+        self.tokenizer_lock = asyncio.Lock()
 
         self.embedding_model_id = None
         self.embedding_size = None
 
         self.client = cohere.Client(api_key=self.api_key)
 
+        # async client shares the pooled keep-alive connections of `http_client`
+        self.async_client = cohere.AsyncClient(api_key=self.api_key, httpx_client=http_client)
+
         self.enums = CoHereEnums
         self.logger = logging.getLogger(__name__)
 
     def set_generation_model(self, model_id: str):
         self.generation_model_id = model_id
+        self.tokenizer = None
+        self.tokenizer_error = None
 
     def set_embedding_model(self, model_id: str, embedding_size: int):
         self.embedding_model_id = model_id
@@ -54,7 +67,7 @@ class CoHereProvider(LLMInterface):
         response = self.client.chat(
             model = self.generation_model_id,
             chat_history = chat_history,
-            message = self.process_text(prompt),
+            message = prompt,
             temperature = temperature,
             max_tokens = max_output_tokens
         )
@@ -77,9 +90,7 @@ class CoHereProvider(LLMInterface):
             self.logger.error("Embedding model for CoHere was not set")
             return None
         
-        input_type = CoHereEnums.DOCUMENT
-        if document_type == DocumentTypeEnum.QUERY:
-            input_type = CoHereEnums.QUERY
+        input_type = self.get_input_type(document_type=document_type)
 
         response = self.client.embed(
             model = self.embedding_model_id,
@@ -92,8 +103,134 @@ class CoHereProvider(LLMInterface):
             self.logger.error("Error while embedding text with CoHere")
             return None
         
-        return [ f for f in response.embeddings.float ]
-    
+        return [ np.asarray(f, dtype=np.float32) for f in response.embeddings.float ]
+
+    def get_input_type(self, document_type: str = None):
+        if document_type == DocumentTypeEnum.QUERY.value:
+            return CoHereEnums.QUERY.value
+
+        return CoHereEnums.DOCUMENT.value
+
+    async def agenerate_text(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
+                                   temperature: float = None):
+
+        if not self.async_client:
+            self.logger.error("CoHere async client was not set")
+            return None
+
+        if not self.generation_model_id:
+            self.logger.error("Generation model for CoHere was not set")
+            return None
+
+        max_output_tokens = max_output_tokens if max_output_tokens else self.default_generation_max_output_tokens
+        temperature = temperature if temperature else self.default_generation_temperature
+
+        response = await self.async_client.chat(
+            model = self.generation_model_id,
+            chat_history = chat_history,
+            message = prompt,
+            temperature = temperature,
+            max_tokens = max_output_tokens
+        )
+
+        if not response or not response.text:
+            self.logger.error("Error while generating text with CoHere")
+            return None
+
+        return response.text
+
+    async def astream_text(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
+                                 temperature: float = None):
+        """
+        Yield the completion as the text-generation events of the chat stream.
+        """
+
+        if not self.async_client:
+            self.logger.error("CoHere async client was not set")
+            return
+
+        if not self.generation_model_id:
+            self.logger.error("Generation model for CoHere was not set")
+            return
+
+        max_output_tokens = max_output_tokens if max_output_tokens else self.default_generation_max_output_tokens
+        temperature = temperature if temperature else self.default_generation_temperature
+
+        stream = self.async_client.chat_stream(
+            model = self.generation_model_id,
+            chat_history = chat_history,
+            message = prompt,
+            temperature = temperature,
+            max_tokens = max_output_tokens
+        )
+
+        async for event in stream:
+            if event.event_type == CoHereEnums.TEXT_GENERATION_EVENT.value and event.text:
+                yield event.text
+
+    def load_tokenizer(self, model_id: str):
+        tokenizer_url = self.client.models.get(model_id).tokenizer_url
+        if not tokenizer_url:
+            raise ValueError(f"No tokenizer url for model {model_id}")
+
+        response = httpx.get(tokenizer_url, timeout=30, follow_redirects=True)
+        response.raise_for_status()
+
+        return Tokenizer.from_str(response.text)
+
+    async def get_tokenizer(self):
+        # downloaded once per model off the event loop, a failed load is not retried per request
+        async with self.tokenizer_lock:
+            if self.tokenizer is None and self.tokenizer_error is None:
+                try:
+                    self.tokenizer = await asyncio.to_thread(self.load_tokenizer, self.generation_model_id)
+                except Exception as e:
+                    self.tokenizer_error = e
+                    self.logger.error(f"Error while loading the tokenizer of {self.generation_model_id}: {e}")
+
+        return self.tokenizer
+
+    async def acount_tokens(self, texts: List[str]):
+        """
+        Count the tokens of every text with the generation model tokenizer, locally.
+        """
+
+        if not self.generation_model_id:
+            self.logger.error("Generation model for CoHere was not set")
+            return None
+
+        tokenizer = await self.get_tokenizer()
+        if tokenizer is None:
+            return None
+
+        encodings = tokenizer.encode_batch(texts, add_special_tokens=False)
+        return [ len(encoding.ids) for encoding in encodings ]
+
+    async def aembed_text(self, text: Union[str, List[str]], document_type: str = None):
+        if not self.async_client:
+            self.logger.error("CoHere async client was not set")
+            return None
+
+        if isinstance(text, str):
+            text = [text]
+
+        if not self.embedding_model_id:
+            self.logger.error("Embedding model for CoHere was not set")
+            return None
+
+        response = await self.async_client.embed(
+            model = self.embedding_model_id,
+            texts = [self.process_text(t) for t in text ],
+            input_type = self.get_input_type(document_type=document_type),
+            embedding_types=['float'],
+        )
+
+        if not response or not response.embeddings or not response.embeddings.float:
+            self.logger.error("Error while embedding text with CoHere")
+            return None
+
+        return [ np.asarray(f, dtype=np.float32) for f in response.embeddings.float ]
+
     def construct_prompt(self, prompt: str, role: str):
         return {
             "role": role,
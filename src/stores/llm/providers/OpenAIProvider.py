@@ -1,6 +1,9 @@
 from ..LLMInterface import LLMInterface
 from ..LLMEnums import OpenAIEnums
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI
+import httpx
+import tiktoken
+import numpy as np
 import logging
 from typing import List, Union
 
@@ -9,7 +12,8 @@ class OpenAIProvider(LLMInterface):
     def __init__(self, api_key: str, api_url: str=None,
                        default_input_max_characters: int=1000,
                        default_generation_max_output_tokens: int=1000,
-                       default_generation_temperature: float=0.1):
+                       default_generation_temperature: float=0.1,
+                       http_client: httpx.AsyncClient=None):
         
         self.api_key = api_key
         self.api_url = api_url
@@ -19,6 +23,8 @@ class OpenAIProvider(LLMInterface):
         self.default_generation_temperature = default_generation_temperature
 
         self.generation_model_id = None
+        self.tokenizer = None
+        self.tokenizer_error = None
 
         self.embedding_model_id = None
         self.embedding_size = None
@@ -28,11 +34,20 @@ class OpenAIProvider(LLMInterface):
             base_url = self.api_url if self.api_url and len(self.api_url) else None
         )
 
+        # async client shares the pooled keep-alive connections of `http_client`
+        self.async_client = AsyncOpenAI(
+            api_key = self.api_key,
+            base_url = self.api_url if self.api_url and len(self.api_url) else None,
+            http_client = http_client
+        )
+
         self.enums = OpenAIEnums
         self.logger = logging.getLogger(__name__)
 
     def set_generation_model(self, model_id: str):
         self.generation_model_id = model_id
+        self.tokenizer = None
+        self.tokenizer_error = None
 
     def set_embedding_model(self, model_id: str, embedding_size: int):
         self.embedding_model_id = model_id
@@ -95,7 +110,128 @@ class OpenAIProvider(LLMInterface):
             self.logger.error("Error while embedding text with OpenAI")
             return None
 
-        return [ rec.embedding for rec in response.data ]
+        return [ np.asarray(rec.embedding, dtype=np.float32) for rec in response.data ]
+
+    async def agenerate_text(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
+                                   temperature: float = None):
+
+        if not self.async_client:
+            self.logger.error("OpenAI async client was not set")
+            return None
+
+        if not self.generation_model_id:
+            self.logger.error("Generation model for OpenAI was not set")
+            return None
+
+        max_output_tokens = max_output_tokens if max_output_tokens else self.default_generation_max_output_tokens
+        temperature = temperature if temperature else self.default_generation_temperature
+
+        chat_history.append(
+            self.construct_prompt(prompt=prompt, role=OpenAIEnums.USER.value)
+        )
+
+        response = await self.async_client.chat.completions.create(
+            model = self.generation_model_id,
+            messages = chat_history,
+            max_tokens = max_output_tokens,
+            temperature = temperature
+        )
+
+        if not response or not response.choices or len(response.choices) == 0 or not response.choices[0].message:
+            self.logger.error("Error while generating text with OpenAI")
+            return None
+
+        return response.choices[0].message.content
+
+    async def astream_text(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
+                                 temperature: float = None):
+        """
+        Yield the completion as the text deltas streamed by the API.
+        """
+
+        if not self.async_client:
+            self.logger.error("OpenAI async client was not set")
+            return
+
+        if not self.generation_model_id:
+            self.logger.error("Generation model for OpenAI was not set")
+            return
+
+        max_output_tokens = max_output_tokens if max_output_tokens else self.default_generation_max_output_tokens
+        temperature = temperature if temperature else self.default_generation_temperature
+
+        chat_history.append(
+            self.construct_prompt(prompt=prompt, role=OpenAIEnums.USER.value)
+        )
+
+        stream = await self.async_client.chat.completions.create(
+            model = self.generation_model_id,
+            messages = chat_history,
+            max_tokens = max_output_tokens,
+            temperature = temperature,
+            stream = True
+        )
+
+        async for chunk in stream:
+            if not chunk.choices or not chunk.choices[0].delta:
+                continue
+
+            if chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+    def get_tokenizer(self):
+        # a failed load (e.g. encodings can not be downloaded) is not retried per request
+        if self.tokenizer is None and self.tokenizer_error is None:
+            try:
+                try:
+                    self.tokenizer = tiktoken.encoding_for_model(self.generation_model_id)
+                except KeyError:
+                    # models unknown to tiktoken (OpenAI compatible servers) use the chat encoding
+                    self.tokenizer = tiktoken.get_encoding(OpenAIEnums.DEFAULT_TOKENIZER_ENCODING.value)
+            except Exception as e:
+                self.tokenizer_error = e
+                self.logger.error(f"Error while loading the tokenizer of {self.generation_model_id}: {e}")
+
+        return self.tokenizer
+
+    async def acount_tokens(self, texts: List[str]):
+        """
+        Count the tokens of every text with the generation model tokenizer.
+        """
+
+        if not self.generation_model_id:
+            self.logger.error("Generation model for OpenAI was not set")
+            return None
+
+        tokenizer = self.get_tokenizer()
+        if tokenizer is None:
+            return None
+
+        return [ len(tokens) for tokens in tokenizer.encode_batch(texts, disallowed_special=()) ]
+
+    async def aembed_text(self, text: Union[str, List[str]], document_type: str = None):
+
+        if not self.async_client:
+            self.logger.error("OpenAI async client was not set")
+            return None
+
+        if isinstance(text, str):
+            text = [text]
+
+        if not self.embedding_model_id:
+            self.logger.error("Embedding model for OpenAI was not set")
+            return None
+
+        response = await self.async_client.embeddings.create(
+            model = self.embedding_model_id,
+            input = text,
+        )
+
+        if not response or not response.data or len(response.data) == 0 or not response.data[0].embedding:
+            self.logger.error("Error while embedding text with OpenAI")
+            return None
+
+        return [ np.asarray(rec.embedding, dtype=np.float32) for rec in response.data ]
 
     def construct_prompt(self, prompt: str, role: str):
         return {
@@ -1,18 +1,30 @@
+import hashlib
+import importlib
 import os
+from string import Template
+from types import MappingProxyType
 
 class TemplateParser:
+    """
+    Templates are resolved and compiled once per (language, group) into a read-only
+    registry, rendering a prompt is then a dictionary lookup and a substitution.
+    `reload` re-imports the template modules and rebuilds the registry.
+    """
 
     def __init__(self, language: str=None, default_language='en'):
         self.current_path = os.path.dirname(os.path.abspath(__file__))
         self.default_language = default_language
         self.language = None
 
+        # (language, group) -> read-only { "templates": {key: Template}, "version": str }, None for missing groups
+        self.registry = MappingProxyType({})
+
         self.set_language(language)
 
-    
+
     def set_language(self, language: str):
         if not language:
-            self.language = self.default_language
+            language = self.default_language
 
         language_path = os.path.join(self.current_path, "locales", language)
         if os.path.exists(language_path):
@@ -20,10 +32,99 @@ class TemplateParser:
         else:
             self.language = self.default_language
 
+        self.compile_language()
+
     def get(self, group: str, key: str, vars: dict={}):
         if not group or not key:
             return None
-        
+
+        compiled_group = self.get_compiled_group(group)
+
+        if not compiled_group or key not in compiled_group["templates"]:
+            return None
+
+        return compiled_group["templates"][key].substitute(vars)
+
+    def get_version(self, group: str):
+        """
+        Short hash of the templates of `group`, changes with any template edit.
+        """
+
+        compiled_group = self.get_compiled_group(group)
+        if not compiled_group:
+            return None
+
+        return compiled_group["version"]
+
+    def get_compiled_group(self, group: str):
+        registry_key = (self.language, group)
+        if registry_key not in self.registry:
+            # first use of a group that was not compiled at startup
+            self.register({ registry_key: self.compile_group(group) })
+
+        return self.registry[registry_key]
+
+    def compile_language(self):
+        groups = set()
+        for language in { self.language, self.default_language }:
+            language_path = os.path.join(self.current_path, "locales", language)
+            if not os.path.isdir(language_path):
+                continue
+
+            groups.update([
+                file_name[:-3]
+                for file_name in os.listdir(language_path)
+                if file_name.endswith(".py") and not file_name.startswith("__")
+            ])
+
+        self.register({
+            (self.language, group): self.compile_group(group)
+            for group in groups
+        })
+
+    def compile_group(self, group: str):
+        module = self.get_group_module(group)
+        if not module:
+            return None
+
+        templates = {
+            name: value
+            for name, value in vars(module).items()
+            if isinstance(value, Template)
+        }
+
+        version = hashlib.sha256(
+            repr(sorted([ (name, value.template) for name, value in templates.items() ])).encode("utf-8")
+        ).hexdigest()[:12]
+
+        return MappingProxyType({
+            "templates": MappingProxyType(templates),
+            "version": version,
+        })
+
+    def register(self, compiled_groups: dict):
+        # swap in a new registry, readers never see a partially updated one
+        self.registry = MappingProxyType({ **self.registry, **compiled_groups })
+
+    def reload(self):
+        """
+        Re-import the template modules then rebuild the registry of the current language.
+        """
+
+        for group in { group for _, group in self.registry.keys() }:
+            for language in { self.language, self.default_language }:
+                module = self.get_group_module(group, language=language)
+                if module:
+                    importlib.reload(module)
+
+        self.registry = MappingProxyType({})
+        self.compile_language()
+
+    def get_group_module(self, group: str, language: str = None):
+        if language:
+            group_path = os.path.join(self.current_path, "locales", language, f"{group}.py")
+            return self.import_group_module(language, group) if os.path.exists(group_path) else None
+
         group_path = os.path.join(self.current_path, "locales", self.language, f"{group}.py" )
         targeted_language = self.language
         if not os.path.exists(group_path):
@@ -32,12 +133,9 @@ class TemplateParser:
 
         if not os.path.exists(group_path):
             return None
-        
-        # import group module
-        module = __import__(f"stores.llm.templates.locales.{targeted_language}.{group}", fromlist=[group])
 
-        if not module:
-            return None
-        
-        key_attribute = getattr(module, key)
-        return key_attribute.substitute(vars)
+        return self.import_group_module(targeted_language, group)
+
+    def import_group_module(self, language: str, group: str):
+        # import group module
+        return __import__(f"stores.llm.templates.locales.{language}.{group}", fromlist=[group])
@@ -0,0 +1,37 @@
+from typing import Dict
+
+class CollectionRegistry:
+    """
+    In-process metadata of the known vector collections
+    (existence, embedding size, distance method, index state),
+    so the hot paths do not have to query the database catalog.
+    """
+
+    def __init__(self):
+        self.collections: Dict[str, dict] = {}
+        self.is_loaded = False
+
+    def load(self, collections: Dict[str, dict]):
+        self.collections = { name: dict(info) for name, info in collections.items() }
+        self.is_loaded = True
+
+    def has(self, collection_name: str) -> bool:
+        return collection_name in self.collections
+
+    def get(self, collection_name: str) -> dict:
+        info = self.collections.get(collection_name)
+        return dict(info) if info is not None else None
+
+    def set(self, collection_name: str, info: dict):
+        self.collections[collection_name] = dict(info)
+
+    def update(self, collection_name: str, **fields):
+        if collection_name in self.collections:
+            self.collections[collection_name].update(fields)
+
+    def remove(self, collection_name: str):
+        self.collections.pop(collection_name, None)
+
+    def clear(self):
+        self.collections = {}
+        self.is_loaded = False
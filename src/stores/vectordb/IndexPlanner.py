@@ -0,0 +1,62 @@
+from .VectorDBEnums import PgVectorIndexTypeEnums, PgVectorIndexSLOEnums
+import math
+
+class IndexPlanner:
+    """
+    Pick the vector index of a collection from its size and the configured SLO:
+    no index (exact scan) below `index_threshold` rows, then IVFFlat with
+    lists ~ sqrt(N), then HNSW from `hnsw_threshold` rows.
+    The latency SLO goes straight to HNSW, the build time SLO stays on IVFFlat.
+    """
+
+    def __init__(self, index_threshold: int = 100, hnsw_threshold: int = 100000,
+                       index_slo: str = PgVectorIndexSLOEnums.BALANCED.value,
+                       rebuild_growth_factor: float = 4):
+        self.index_threshold = index_threshold
+        self.hnsw_threshold = hnsw_threshold
+        self.index_slo = index_slo
+        self.rebuild_growth_factor = rebuild_growth_factor
+
+    def get_ivfflat_lists(self, rows_count: int) -> int:
+        return max(1, int(math.sqrt(max(rows_count, 0))))
+
+    def plan(self, rows_count: int) -> dict:
+        if rows_count < self.index_threshold:
+            return { "index_type": None, "lists": None }
+
+        if self.index_slo == PgVectorIndexSLOEnums.LATENCY.value:
+            index_type = PgVectorIndexTypeEnums.HNSW.value
+        elif self.index_slo == PgVectorIndexSLOEnums.BUILD_TIME.value:
+            index_type = PgVectorIndexTypeEnums.IVFFLAT.value
+        elif rows_count >= self.hnsw_threshold:
+            index_type = PgVectorIndexTypeEnums.HNSW.value
+        else:
+            index_type = PgVectorIndexTypeEnums.IVFFLAT.value
+
+        return {
+            "index_type": index_type,
+            "lists": self.get_ivfflat_lists(rows_count) if index_type == PgVectorIndexTypeEnums.IVFFLAT.value else None,
+        }
+
+    def needs_rebuild(self, collection_info: dict, rows_count: int) -> bool:
+        """
+        An existing index is rebuilt when the collection outgrew it:
+        an IVFFlat index past the HNSW size, or with `rebuild_growth_factor`
+        times the rows its lists were sized for. HNSW indexes grow in place.
+        """
+
+        if not collection_info or not collection_info.get("has_index"):
+            return False
+
+        if collection_info.get("index_type") != PgVectorIndexTypeEnums.IVFFLAT.value:
+            return False
+
+        planned_index = self.plan(rows_count)
+        if planned_index["index_type"] == PgVectorIndexTypeEnums.HNSW.value:
+            return True
+
+        index_lists = collection_info.get("index_lists")
+        if not index_lists:
+            return False
+
+        return rows_count >= self.rebuild_growth_factor * index_lists * index_lists
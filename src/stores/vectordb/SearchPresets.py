@@ -0,0 +1,34 @@
+from .VectorDBEnums import SearchPresetEnums
+
+# per query ANN parameters, trading recall for latency
+# hnsw_ef_search: hnsw.ef_search (pgvector) / hnsw_ef (qdrant), raised to the query limit if lower
+# ivfflat_probes: ivfflat.probes (pgvector)
+# exact: skip the ANN index and scan the collection
+SEARCH_PRESETS = {
+    SearchPresetEnums.FAST.value: {
+        "hnsw_ef_search": 20,
+        "ivfflat_probes": 1,
+        "exact": False,
+    },
+    SearchPresetEnums.BALANCED.value: {
+        "hnsw_ef_search": 64,
+        "ivfflat_probes": 10,
+        "exact": False,
+    },
+    SearchPresetEnums.ACCURATE.value: {
+        "hnsw_ef_search": 256,
+        "ivfflat_probes": 40,
+        "exact": False,
+    },
+    SearchPresetEnums.EXACT.value: {
+        "hnsw_ef_search": None,
+        "ivfflat_probes": None,
+        "exact": True,
+    },
+}
+
+def get_search_preset(search_preset: str) -> dict:
+    if not search_preset:
+        return None
+
+    return SEARCH_PRESETS.get(search_preset)
@@ -0,0 +1,28 @@
+from typing import List, Tuple
+import re
+import zlib
+
+class SparseTextEncoder:
+    """
+    Encode a text into a sparse term-frequency vector for lexical retrieval.
+    Tokens are hashed with crc32, so indices are stable across processes;
+    the term frequency is BM25 saturated, IDF is left to the vector store.
+    """
+
+    def __init__(self, k1: float = 1.2):
+        self.k1 = k1
+        self.token_pattern = re.compile(r"\w+", re.UNICODE)
+
+    def tokenize(self, text: str) -> List[str]:
+        return self.token_pattern.findall(text.lower()) if text else []
+
+    def encode(self, text: str) -> Tuple[List[int], List[float]]:
+        counts = {}
+        for token in self.tokenize(text):
+            index = zlib.crc32(token.encode("utf-8"))
+            counts[index] = counts.get(index, 0) + 1
+
+        indices = list(counts.keys())
+        values = [ tf * (self.k1 + 1) / (tf + self.k1) for tf in counts.values() ]
+
+        return indices, values
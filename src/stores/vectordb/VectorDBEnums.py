@@ -3,6 +3,7 @@ from enum import Enum
 class VectorDBEnums(Enum):
     QDRANT = "QDRANT"
     PGVECTOR = "PGVECTOR"
+    NUMPY = "NUMPY"
 
 class DistanceMethodEnums(Enum):
     COSINE = "cosine"
@@ -14,6 +15,8 @@ class PgVectorTableSchemeEnums(Enum):
     VECTOR = 'vector'
     CHUNK_ID = 'chunk_id'
     METADATA = 'metadata'
+    TEXT_SEARCH = 'text_search'
+    PROJECT_ID = 'project_id'
     _PREFIX = 'pgvector'
 
 class PgVectorDistanceMethodEnums(Enum):
@@ -22,4 +25,43 @@ class PgVectorDistanceMethodEnums(Enum):
 
 class PgVectorIndexTypeEnums(Enum):
     HNSW = "hnsw"
-    IVFFLAT = "ivfflat"
\ No newline at end of file
+    IVFFLAT = "ivfflat"
+
+class PgVectorTextSearchConfigEnums(Enum):
+    EN = "english"
+    AR = "arabic"
+    DEFAULT = "simple"
+
+class RetrievalModeEnums(Enum):
+    DENSE = "dense"
+    HYBRID = "hybrid"
+class SearchFilterEnums(Enum):
+    ASSET_ID = "asset_id"
+    PAGE_FROM = "page_from"
+    PAGE_TO = "page_to"
+    METADATA = "metadata"
+
+class VectorMetadataEnums(Enum):
+    ASSET_ID = "asset_id"
+    PAGE_START = "page_start"
+    PAGE_END = "page_end"
+
+class SearchPresetEnums(Enum):
+    FAST = "fast"
+    BALANCED = "balanced"
+    ACCURATE = "accurate"
+    EXACT = "exact"
+
+class PgVectorIndexSLOEnums(Enum):
+    LATENCY = "latency"
+    BALANCED = "balanced"
+    BUILD_TIME = "build_time"
+
+class PgVectorTableLayoutEnums(Enum):
+    TABLE_PER_COLLECTION = "table_per_collection"
+    PARTITIONED = "partitioned"
+
+class VectorQuantizationEnums(Enum):
+    NONE = "none"
+    HALFVEC = "halfvec"
+    BIT = "bit"
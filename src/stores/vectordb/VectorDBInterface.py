@@ -47,6 +47,30 @@ class VectorDBInterface(ABC):
         pass
 
     @abstractmethod
-    def search_by_vector(self, collection_name: str, vector: list, limit: int) -> List[RetrievedDocument]:
+    def bulk_load(self, collection_name: str, index_type: str = None, expected_rows: int = None):
+        pass
+
+    @abstractmethod
+    def rebuild_index(self, collection_name: str, index_type: str = None) -> bool:
+        pass
+
+    @abstractmethod
+    def get_index_build_progress(self, collection_name: str) -> dict:
+        pass
+
+    @abstractmethod
+    def search_by_vector(self, collection_name: str, vector: list, limit: int,
+                               filters: dict = None, search_preset: str = None) -> List[RetrievedDocument]:
+        pass
+
+    @abstractmethod
+    def search_hybrid(self, collection_name: str, vector: list, text: str, limit: int,
+                            candidates_limit: int = 50, rrf_k: int = 60,
+                            filters: dict = None, search_preset: str = None) -> List[RetrievedDocument]:
+        pass
+
+    @abstractmethod
+    def search_by_vectors(self, collection_name: str, vectors: list, limit: int,
+                                search_preset: str = None) -> List[List[RetrievedDocument]]:
         pass
     
\ No newline at end of file
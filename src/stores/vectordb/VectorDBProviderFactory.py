@@ -1,13 +1,15 @@
-from .providers import QdrantDBProvider, PGVectorProvider
+from .providers import QdrantDBProvider, PGVectorProvider, NumpyDBProvider
 from .VectorDBEnums import VectorDBEnums
 from controllers.BaseController import BaseController
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import AsyncEngine
 
 class VectorDBProviderFactory:
-    def __init__(self, config, db_client: sessionmaker=None):
+    def __init__(self, config, db_client: sessionmaker=None, db_engine: AsyncEngine=None):
         self.config = config
         self.base_controller = BaseController()
         self.db_client = db_client
+        self.db_engine = db_engine
 
     def create(self, provider: str):
         if provider == VectorDBEnums.QDRANT.value:
@@ -18,14 +20,41 @@ class VectorDBProviderFactory:
                 distance_method=self.config.VECTOR_DB_DISTANCE_METHOD,
                 default_vector_size=self.config.EMBEDDING_MODEL_SIZE,
                 index_threshold=self.config.VECTOR_DB_PGVEC_INDEX_THRESHOLD,
+                hnsw_m=self.config.VECTOR_DB_HNSW_M,
+                hnsw_ef_construction=self.config.VECTOR_DB_HNSW_EF_CONSTRUCTION,
+                quantization=self.config.VECTOR_DB_QUANTIZATION,
+                rescore_factor=self.config.VECTOR_DB_RESCORE_FACTOR,
             )
         
         if provider == VectorDBEnums.PGVECTOR.value:
             return PGVectorProvider(
                 db_client=self.db_client,
+                db_engine=self.db_engine,
                 distance_method=self.config.VECTOR_DB_DISTANCE_METHOD,
                 default_vector_size=self.config.EMBEDDING_MODEL_SIZE,
                 index_threshold=self.config.VECTOR_DB_PGVEC_INDEX_THRESHOLD,
+                maintenance_work_mem=self.config.VECTOR_DB_PGVEC_MAINTENANCE_WORK_MEM,
+                max_parallel_maintenance_workers=self.config.VECTOR_DB_PGVEC_MAX_PARALLEL_MAINTENANCE_WORKERS,
+                text_search_language=self.config.PRIMARY_LANG,
+                hnsw_m=self.config.VECTOR_DB_HNSW_M,
+                hnsw_ef_construction=self.config.VECTOR_DB_HNSW_EF_CONSTRUCTION,
+                index_slo=self.config.VECTOR_DB_PGVEC_INDEX_SLO,
+                index_hnsw_threshold=self.config.VECTOR_DB_PGVEC_HNSW_THRESHOLD,
+                index_rebuild_growth_factor=self.config.VECTOR_DB_PGVEC_INDEX_REBUILD_GROWTH,
+                bulk_load_rebuild_ratio=self.config.VECTOR_DB_PGVEC_BULK_LOAD_REBUILD_RATIO,
+                table_layout=self.config.VECTOR_DB_PGVEC_TABLE_LAYOUT,
+                store_text=self.config.VECTOR_DB_PGVEC_STORE_TEXT,
+                quantization=self.config.VECTOR_DB_QUANTIZATION,
+                rescore_factor=self.config.VECTOR_DB_RESCORE_FACTOR,
             )
         
+        if provider == VectorDBEnums.NUMPY.value:
+            numpy_db_client = self.base_controller.get_database_path(db_name=self.config.VECTOR_DB_PATH)
+
+            return NumpyDBProvider(
+                db_client=numpy_db_client,
+                distance_method=self.config.VECTOR_DB_DISTANCE_METHOD,
+                default_vector_size=self.config.EMBEDDING_MODEL_SIZE,
+            )
+
         return None
\ No newline at end of file
@@ -0,0 +1,498 @@
+from ..VectorDBInterface import VectorDBInterface
+from ..VectorDBEnums import DistanceMethodEnums, SearchFilterEnums, VectorMetadataEnums
+import logging
+from typing import List
+from contextlib import asynccontextmanager, contextmanager
+from models.db_schemes import RetrievedDocument
+import numpy as np
+import asyncio
+import fcntl
+import shutil
+import json
+import os
+
+class NumpyDBProvider(VectorDBInterface):
+    """
+    In-process exact search over memory-mapped float32 matrices, no external service.
+    Each collection is a directory with append-only files:
+        collection.json      embedding size and distance method
+        vectors.f32          row-major float32 matrix (normalized for cosine)
+        ids.i64              record id of every row
+        payloads.jsonl       text and metadata of every row
+        payload_offsets.i64  byte offset of every row in payloads.jsonl
+        tombstones.i64       deleted rows
+    The vectors file is written last, so its size is the number of visible rows;
+    writers first cut the other files back to it, dropping what a failed write left behind.
+    Writers and compaction hold an exclusive flock on `.{collection}.lock` next to the collection.
+    """
+
+    def __init__(self, db_client: str, default_vector_size: int = 786,
+                                     distance_method: str = None, index_threshold: int=100):
+
+        self.db_client = db_client
+        self.default_vector_size = default_vector_size
+        self.distance_method = distance_method or DistanceMethodEnums.COSINE.value
+
+        # memory maps of the opened collections, reopened when the files grow
+        self.collections = {}
+
+        self.logger = logging.getLogger('uvicorn')
+
+    async def connect(self):
+        os.makedirs(self.db_client, exist_ok=True)
+        self.recover_compactions()
+
+    def recover_compactions(self):
+        """
+        Finish the directory swap of a compaction interrupted by a crash:
+        a collection moved aside is restored unless its replacement is in place.
+        """
+
+        collection_names = {
+            dir_name.rsplit(".", 1)[0]
+            for dir_name in os.listdir(self.db_client)
+            if dir_name.endswith((".compacting", ".old"))
+        }
+
+        for collection_name in collection_names:
+            # a running compaction of another worker holds the lock until its swap is done
+            with self.lock_collection(collection_name):
+                collection_path = self.get_collection_path(collection_name)
+                if os.path.exists(f"{collection_path}.old"):
+                    if os.path.exists(os.path.join(collection_path, "collection.json")):
+                        shutil.rmtree(f"{collection_path}.old", ignore_errors=True)
+                    else:
+                        shutil.rmtree(collection_path, ignore_errors=True)
+                        os.rename(f"{collection_path}.old", collection_path)
+                        self.logger.warning(f"Restored collection {collection_name} after an interrupted compaction")
+
+                shutil.rmtree(f"{collection_path}.compacting", ignore_errors=True)
+
+    async def disconnect(self):
+        self.collections = {}
+
+    def get_collection_path(self, collection_name: str, file_name: str = None):
+        collection_path = os.path.join(self.db_client, collection_name)
+        return os.path.join(collection_path, file_name) if file_name else collection_path
+
+    @contextmanager
+    def lock_collection(self, collection_name: str):
+        # kept outside the collection directory, which compaction replaces
+        with open(os.path.join(self.db_client, f".{collection_name}.lock"), "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            yield
+
+    def get_file_rows(self, collection_name: str, file_name: str, row_size: int) -> int:
+        file_path = self.get_collection_path(collection_name, file_name)
+        return os.path.getsize(file_path) // row_size if os.path.exists(file_path) else 0
+
+    def load_collection(self, collection_name: str):
+        config_path = self.get_collection_path(collection_name, "collection.json")
+        if not os.path.exists(config_path):
+            self.collections.pop(collection_name, None)
+            return None
+
+        collection = self.collections.get(collection_name)
+        if collection is None:
+            with open(config_path, "r", encoding="utf-8") as f:
+                collection = json.load(f)
+
+        embedding_size = collection["embedding_size"]
+        rows_count = self.get_file_rows(collection_name, "vectors.f32", embedding_size * 4)
+        deleted_count = self.get_file_rows(collection_name, "tombstones.i64", 8)
+
+        if collection.get("rows_count") == rows_count and collection.get("deleted_count") == deleted_count:
+            return collection
+
+        if rows_count > 0:
+            vectors = np.memmap(self.get_collection_path(collection_name, "vectors.f32"),
+                                dtype=np.float32, mode="r", shape=(rows_count, embedding_size))
+        else:
+            vectors = np.empty((0, embedding_size), dtype=np.float32)
+
+        alive = np.ones(rows_count, dtype=bool)
+        if deleted_count > 0:
+            tombstones = np.fromfile(self.get_collection_path(collection_name, "tombstones.i64"), dtype=np.int64)
+            alive[tombstones[tombstones < rows_count]] = False
+
+        collection.update({
+            "rows_count": rows_count,
+            "deleted_count": deleted_count,
+            "vectors": vectors,
+            "ids": np.fromfile(self.get_collection_path(collection_name, "ids.i64"), dtype=np.int64, count=rows_count),
+            "payload_offsets": np.fromfile(self.get_collection_path(collection_name, "payload_offsets.i64"),
+                                           dtype=np.int64, count=rows_count),
+            "alive": alive,
+        })
+        self.collections[collection_name] = collection
+
+        return collection
+
+    async def is_collection_existed(self, collection_name: str) -> bool:
+        return os.path.exists(self.get_collection_path(collection_name, "collection.json"))
+
+    async def list_all_collections(self) -> List:
+        if not os.path.exists(self.db_client):
+            return []
+
+        return [
+            collection_name for collection_name in os.listdir(self.db_client)
+            if not collection_name.endswith((".compacting", ".old"))
+            and os.path.exists(self.get_collection_path(collection_name, "collection.json"))
+        ]
+
+    async def get_collection_info(self, collection_name: str) -> dict:
+        collection = self.load_collection(collection_name)
+        if collection is None:
+            return None
+
+        return {
+            "embedding_size": collection["embedding_size"],
+            "distance_method": collection["distance_method"],
+            "records_count": int(collection["alive"].sum()),
+            "deleted_count": collection["rows_count"] - int(collection["alive"].sum()),
+        }
+
+    async def delete_collection(self, collection_name: str):
+        self.collections.pop(collection_name, None)
+
+        if await self.is_collection_existed(collection_name):
+            self.logger.info(f"Deleting collection: {collection_name}")
+            shutil.rmtree(self.get_collection_path(collection_name), ignore_errors=True)
+
+        return True
+
+    async def create_collection(self, collection_name: str,
+                                embedding_size: int,
+                                do_reset: bool = False):
+        if do_reset:
+            _ = await self.delete_collection(collection_name=collection_name)
+
+        if await self.is_collection_existed(collection_name):
+            return False
+
+        self.logger.info(f"Creating new Numpy collection: {collection_name}")
+        self.create_collection_files(collection_name, embedding_size, self.distance_method)
+
+        return True
+
+    def create_collection_files(self, collection_name: str, embedding_size: int, distance_method: str):
+        os.makedirs(self.get_collection_path(collection_name), exist_ok=True)
+        for file_name in [ "vectors.f32", "ids.i64", "payloads.jsonl", "payload_offsets.i64", "tombstones.i64" ]:
+            open(self.get_collection_path(collection_name, file_name), "ab").close()
+
+        # the config is written last, it marks the collection as existing
+        with open(self.get_collection_path(collection_name, "collection.json"), "w", encoding="utf-8") as f:
+            json.dump({
+                "embedding_size": embedding_size,
+                "distance_method": distance_method,
+            }, f)
+
+    def to_matrix(self, vectors, distance_method: str):
+        matrix = np.asarray(vectors, dtype=np.float32)
+        if matrix.ndim == 1:
+            matrix = matrix.reshape(1, -1)
+
+        if distance_method == DistanceMethodEnums.COSINE.value:
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            matrix = matrix / np.maximum(norms, 1e-12)
+
+        return matrix
+
+    def append_records(self, collection_name: str, texts: list, vectors: list,
+                             metadata: list, record_ids: list):
+        collection = self.load_collection(collection_name)
+        matrix = self.to_matrix(vectors, collection["distance_method"])
+
+        if matrix.shape[1] != collection["embedding_size"]:
+            raise ValueError(f"Expected vectors of size {collection['embedding_size']}, got {matrix.shape[1]}")
+
+        # serialize the writers of every process, readers only see complete rows
+        with self.lock_collection(collection_name):
+            self.write_records(collection_name, texts, matrix, metadata, record_ids)
+
+    def truncate_partial_rows(self, collection_name: str, embedding_size: int) -> int:
+        """
+        Cut every file back to the rows of the vectors file, a failed or interrupted
+        write may have appended payloads, offsets or ids of rows that never got a vector.
+        Must run under the collection lock.
+        """
+
+        rows_count = self.get_file_rows(collection_name, "vectors.f32", embedding_size * 4)
+
+        for file_name, row_size in [ ("vectors.f32", embedding_size * 4), ("ids.i64", 8), ("payload_offsets.i64", 8) ]:
+            file_path = self.get_collection_path(collection_name, file_name)
+            if os.path.getsize(file_path) != rows_count * row_size:
+                os.truncate(file_path, rows_count * row_size)
+
+        payloads_path = self.get_collection_path(collection_name, "payloads.jsonl")
+        payloads_size = 0
+        if rows_count > 0:
+            last_offset = np.fromfile(self.get_collection_path(collection_name, "payload_offsets.i64"),
+                                      dtype=np.int64, count=1, offset=(rows_count - 1) * 8)[0]
+            with open(payloads_path, "rb") as f:
+                f.seek(int(last_offset))
+                f.readline()
+                payloads_size = f.tell()
+
+        if os.path.getsize(payloads_path) != payloads_size:
+            os.truncate(payloads_path, payloads_size)
+
+        return rows_count
+
+    def write_records(self, collection_name: str, texts: list, matrix: np.ndarray,
+                            metadata: list, record_ids: list):
+        # callers hold the collection lock
+        self.truncate_partial_rows(collection_name, matrix.shape[1])
+
+        payloads_path = self.get_collection_path(collection_name, "payloads.jsonl")
+        payload_offset = os.path.getsize(payloads_path)
+        payload_offsets = []
+
+        with open(payloads_path, "ab") as f:
+            for text, _metadata in zip(texts, metadata):
+                line = (json.dumps({ "text": text, "metadata": _metadata }, ensure_ascii=False) + "\n").encode("utf-8")
+                payload_offsets.append(payload_offset)
+                payload_offset += len(line)
+                f.write(line)
+
+        with open(self.get_collection_path(collection_name, "payload_offsets.i64"), "ab") as f:
+            f.write(np.asarray(payload_offsets, dtype=np.int64).tobytes())
+
+        with open(self.get_collection_path(collection_name, "ids.i64"), "ab") as f:
+            f.write(np.asarray(record_ids, dtype=np.int64).tobytes())
+
+        with open(self.get_collection_path(collection_name, "vectors.f32"), "ab") as f:
+            f.write(np.ascontiguousarray(matrix).tobytes())
+
+    async def insert_one(self, collection_name: str, text: str, vector: list,
+                         metadata: dict = None,
+                         record_id: str = None):
+
+        return await self.insert_many(collection_name=collection_name, texts=[text], vectors=[vector],
+                                      metadata=[metadata], record_ids=[record_id])
+
+    async def insert_many(self, collection_name: str, texts: list,
+                          vectors: list, metadata: list = None,
+                          record_ids: list = None, batch_size: int = 50):
+
+        if not await self.is_collection_existed(collection_name):
+            self.logger.error(f"Can not insert new records to non-existed collection: {collection_name}")
+            return False
+
+        if metadata is None:
+            metadata = [None] * len(texts)
+
+        if record_ids is None:
+            record_ids = list(range(0, len(texts)))
+
+        if not (len(texts) == len(vectors) == len(metadata) == len(record_ids)):
+            self.logger.error(f"Invalid data items for collection: {collection_name}")
+            return False
+
+        try:
+            await asyncio.to_thread(self.append_records, collection_name, texts, vectors, metadata, record_ids)
+        except Exception as e:
+            self.logger.error(f"Error while inserting batch: {e}")
+            return False
+
+        return True
+
+    async def delete_records(self, collection_name: str, record_ids: list):
+        """
+        Tombstone the rows of `record_ids`, they are skipped by searches
+        and dropped from the files by `compact_collection`.
+        """
+
+        if not await self.is_collection_existed(collection_name):
+            return False
+
+        return await asyncio.to_thread(self.tombstone_records, collection_name, record_ids)
+
+    def tombstone_records(self, collection_name: str, record_ids: list):
+        # rows are looked up under the lock, a compaction renumbers them
+        with self.lock_collection(collection_name):
+            collection = self.load_collection(collection_name)
+            if collection is None:
+                return False
+
+            rows = np.flatnonzero(np.isin(collection["ids"], np.asarray(record_ids, dtype=np.int64)) & collection["alive"])
+            if len(rows) == 0:
+                return True
+
+            with open(self.get_collection_path(collection_name, "tombstones.i64"), "ab") as f:
+                f.write(rows.astype(np.int64).tobytes())
+
+        return True
+
+    async def compact_collection(self, collection_name: str):
+        """
+        Rewrite the collection without its tombstoned rows.
+        """
+
+        if not await self.is_collection_existed(collection_name):
+            return False
+
+        return await asyncio.to_thread(self.rewrite_collection, collection_name)
+
+    def rewrite_collection(self, collection_name: str):
+        # the lock is held from the read to the swap, appends wait for the compacted collection
+        with self.lock_collection(collection_name):
+            collection = self.load_collection(collection_name)
+            if collection is None:
+                return False
+
+            if collection["deleted_count"] == 0:
+                return True
+
+            rows = np.flatnonzero(collection["alive"])
+            records = self.read_payloads(collection_name, collection, rows)
+            vectors = np.array(collection["vectors"][rows])
+            record_ids = collection["ids"][rows].tolist()
+
+            compacted_name = f"{collection_name}.compacting"
+            shutil.rmtree(self.get_collection_path(compacted_name), ignore_errors=True)
+            self.create_collection_files(compacted_name, collection["embedding_size"], collection["distance_method"])
+            self.write_records(compacted_name, [ r["text"] for r in records ], vectors,
+                               [ r["metadata"] for r in records ], record_ids)
+
+            # rename aside then into place, recover_compactions completes a swap cut by a crash
+            collection_path = self.get_collection_path(collection_name)
+            os.rename(collection_path, f"{collection_path}.old")
+            os.rename(self.get_collection_path(compacted_name), collection_path)
+            shutil.rmtree(f"{collection_path}.old", ignore_errors=True)
+
+            self.collections.pop(collection_name, None)
+
+        return True
+
+    @asynccontextmanager
+    async def bulk_load(self, collection_name: str, index_type: str = None, expected_rows: int = None):
+        # exact search, there is no index to defer
+        yield {
+            "collection_name": collection_name,
+            "index_built": False,
+            "index_build_seconds": None,
+        }
+
+    async def rebuild_index(self, collection_name: str, index_type: str = None):
+        return False
+
+    async def get_index_build_progress(self, collection_name: str):
+        collection_info = await self.get_collection_info(collection_name)
+        if collection_info is None:
+            return None
+
+        return { "status": "exact", "records_count": collection_info["records_count"] }
+
+    def read_payloads(self, collection_name: str, collection: dict, rows) -> List[dict]:
+        payloads = []
+        with open(self.get_collection_path(collection_name, "payloads.jsonl"), "rb") as f:
+            for row in rows:
+                f.seek(int(collection["payload_offsets"][row]))
+                payloads.append(json.loads(f.readline()))
+
+        return payloads
+
+    def matches_filters(self, metadata: dict, filters: dict) -> bool:
+        metadata = metadata or {}
+
+        containment = dict(filters.get(SearchFilterEnums.METADATA.value) or {})
+        if filters.get(SearchFilterEnums.ASSET_ID.value) is not None:
+            containment[VectorMetadataEnums.ASSET_ID.value] = filters[SearchFilterEnums.ASSET_ID.value]
+
+        for key, value in containment.items():
+            if isinstance(value, list):
+                if not all(item in (metadata.get(key) or []) for item in value):
+                    return False
+            elif metadata.get(key) != value:
+                return False
+
+        page_from = filters.get(SearchFilterEnums.PAGE_FROM.value)
+        page_end = metadata.get(VectorMetadataEnums.PAGE_END.value)
+        if page_from is not None and (page_end is None or page_end < page_from):
+            return False
+
+        page_to = filters.get(SearchFilterEnums.PAGE_TO.value)
+        page_start = metadata.get(VectorMetadataEnums.PAGE_START.value)
+        if page_to is not None and (page_start is None or page_start > page_to):
+            return False
+
+        return True
+
+    def top_k(self, scores: np.ndarray, k: int) -> np.ndarray:
+        if k >= len(scores):
+            return np.argsort(-scores)
+
+        rows = np.argpartition(-scores, k - 1)[:k]
+        return rows[np.argsort(-scores[rows])]
+
+    def search_collection(self, collection_name: str, vectors: list, limit: int,
+                                filters: dict = None) -> List[List[RetrievedDocument]]:
+        collection = self.load_collection(collection_name)
+        queries = self.to_matrix(vectors, collection["distance_method"])
+
+        if collection["rows_count"] == 0:
+            return [ [] for _ in range(len(queries)) ]
+
+        # one matrix product scores every query against every row
+        scores = queries @ collection["vectors"].T
+        scores[:, ~collection["alive"]] = -np.inf
+        alive_count = int(collection["alive"].sum())
+
+        results = []
+        for query_scores in scores:
+            # filtered searches widen the candidates until enough rows pass the filter
+            candidates_limit = min(limit if not filters else limit * 4, alive_count)
+            while True:
+                rows = self.top_k(query_scores, candidates_limit)
+                rows = rows[np.isfinite(query_scores[rows])]
+                payloads = self.read_payloads(collection_name, collection, rows)
+
+                documents = [
+                    RetrievedDocument(text=payload["text"], score=float(query_scores[row]),
+                                      chunk_id=int(collection["ids"][row]))
+                    for row, payload in zip(rows, payloads)
+                    if not filters or self.matches_filters(payload["metadata"], filters)
+                ]
+
+                if len(documents) >= limit or candidates_limit >= alive_count:
+                    break
+                candidates_limit = min(candidates_limit * 4, alive_count)
+
+            results.append(documents[:limit])
+
+        return results
+
+    async def search_by_vector(self, collection_name: str, vector: list, limit: int = 5,
+                               filters: dict = None, search_preset: str = None):
+
+        if not await self.is_collection_existed(collection_name):
+            self.logger.error(f"Can not search for records in a non-existed collection: {collection_name}")
+            return False
+
+        results = await asyncio.to_thread(self.search_collection, collection_name, [vector], limit, filters)
+        if not results[0]:
+            return None
+
+        return results[0]
+
+    async def search_hybrid(self, collection_name: str, vector: list, text: str,
+                            limit: int = 5, candidates_limit: int = 50, rrf_k: int = 60,
+                            filters: dict = None, search_preset: str = None):
+
+        self.logger.warning(f"No lexical index on Numpy collection: {collection_name}, using dense search")
+        return await self.search_by_vector(collection_name=collection_name, vector=vector,
+                                           limit=limit, filters=filters)
+
+    async def search_by_vectors(self, collection_name: str, vectors: list, limit: int = 5,
+                                search_preset: str = None):
+
+        if not await self.is_collection_existed(collection_name):
+            self.logger.error(f"Can not search for records in a non-existed collection: {collection_name}")
+            return False
+
+        if vectors is None or len(vectors) == 0:
+            return []
+
+        return await asyncio.to_thread(self.search_collection, collection_name, vectors, limit)
@@ -1,21 +1,94 @@
 from ..VectorDBInterface import VectorDBInterface
+from ..CollectionRegistry import CollectionRegistry
+from ..SearchPresets import get_search_preset
+from ..IndexPlanner import IndexPlanner
 from ..VectorDBEnums import (DistanceMethodEnums, PgVectorTableSchemeEnums, 
-                             PgVectorDistanceMethodEnums, PgVectorIndexTypeEnums)
+                             PgVectorDistanceMethodEnums, PgVectorIndexTypeEnums,
+                             PgVectorTextSearchConfigEnums, SearchFilterEnums,
+                             VectorMetadataEnums, PgVectorTableLayoutEnums,
+                             VectorQuantizationEnums)
 import logging
+import asyncio
 from typing import List
 from models.db_schemes import RetrievedDocument
+from utils.pg_notify import PgNotifyChannel
 from sqlalchemy.sql import text as sql_text
+from sqlalchemy import event
+from pgvector.asyncpg import register_vector
+from contextlib import asynccontextmanager
+import numpy as np
+import time
 import json
+import re
 
 class PGVectorProvider(VectorDBInterface):
 
-    def __init__(self, db_client, default_vector_size: int = 786,
-                       distance_method: str = None, index_threshold: int=100):
+    def __init__(self, db_client, db_engine=None, default_vector_size: int = 786,
+                       distance_method: str = None, index_threshold: int=100,
+                       maintenance_work_mem: str = None,
+                       max_parallel_maintenance_workers: int = None,
+                       text_search_language: str = None,
+                       hnsw_m: int = None, hnsw_ef_construction: int = None,
+                       index_slo: str = None, index_hnsw_threshold: int = 100000,
+                       index_rebuild_growth_factor: float = 4,
+                       bulk_load_rebuild_ratio: float = 0.5,
+                       table_layout: str = None,
+                       quantization: str = None, rescore_factor: int = 4,
+                       store_text: bool = False):
         
         self.db_client = db_client
+        self.db_engine = db_engine
         self.default_vector_size = default_vector_size
         
         self.index_threshold = index_threshold
+        self.index_planner = IndexPlanner(
+            index_threshold=index_threshold,
+            hnsw_threshold=index_hnsw_threshold,
+            index_slo=index_slo,
+            rebuild_growth_factor=index_rebuild_growth_factor,
+        )
+
+        # background index rebuilds, at most one per collection, and their progress
+        self.index_rebuild_tasks = {}
+        self.index_build_progress = {}
+
+        # index build settings, applied with SET LOCAL in the build transaction
+        self.maintenance_work_mem = maintenance_work_mem
+        self.max_parallel_maintenance_workers = max_parallel_maintenance_workers
+
+        # index build parameters, None keeps the pgvector defaults
+        self.hnsw_m = hnsw_m
+        self.hnsw_ef_construction = hnsw_ef_construction
+
+        # full text search configuration of the lexical side of hybrid retrieval,
+        # kept by collections that predate per collection configs (detect_text_search_config)
+        self.text_search_config = PgVectorTextSearchConfigEnums.DEFAULT.value
+        if text_search_language and text_search_language.upper() in PgVectorTextSearchConfigEnums.__members__:
+            self.text_search_config = PgVectorTextSearchConfigEnums[text_search_language.upper()].value
+
+        # partitioned: one table per embedding size, each collection is its LIST partition
+        self.table_layout = table_layout or PgVectorTableLayoutEnums.TABLE_PER_COLLECTION.value
+
+        # halfvec / bit: the vector index is built over a quantized expression of the
+        # full precision column, searches rescore rescore_factor x limit candidates
+        self.quantization = quantization or VectorQuantizationEnums.NONE.value
+        self.rescore_factor = max(int(rescore_factor), 1)
+
+        # lean collections keep no copy of the chunk text, the final top-k
+        # read it from chunks.chunk_text through chunk_id
+        self.store_text = store_text
+
+        # collections inside a bulk load session skip per-batch index maintenance,
+        # their index is dropped and rebuilt once when the load is at least
+        # bulk_load_rebuild_ratio x the rows already indexed
+        self.bulk_load_collections = set()
+        self.bulk_load_rebuild_ratio = bulk_load_rebuild_ratio
+
+        # collection metadata, kept in sync across workers with LISTEN/NOTIFY
+        self.collection_registry = CollectionRegistry()
+        self.registry_channel = PgNotifyChannel(db_engine, channel="pgvector_collections",
+                                                on_message=self.on_registry_message,
+                                                on_reconnect=self.load_collection_registry)
 
         if distance_method == DistanceMethodEnums.COSINE.value:
             distance_method = PgVectorDistanceMethodEnums.COSINE.value
@@ -27,6 +100,9 @@ class PGVectorProvider(VectorDBInterface):
 
         self.logger = logging.getLogger("uvicorn")
         self.default_index_name = lambda collection_name: f"{collection_name}_vector_idx"
+        self.default_text_search_index_name = lambda collection_name: f"{collection_name}_text_search_idx"
+        self.default_metadata_index_name = lambda collection_name: f"{collection_name}_metadata_idx"
+        self.default_partitioned_table_name = lambda embedding_size: f"{self.pgvector_table_prefix}_{embedding_size}"
 
 
     async def connect(self):
@@ -37,11 +113,133 @@ class PGVectorProvider(VectorDBInterface):
                 ))
                 await session.commit()
 
+        if self.db_engine is not None:
+            # send vectors as binary float32 instead of text literals,
+            # the pool is recycled so every connection gets the codec
+            event.listen(self.db_engine.sync_engine, "connect", self.register_vector_codec)
+            await self.db_engine.dispose()
+
+        await self.load_collection_registry()
+
+        if self.db_engine is not None:
+            await self.registry_channel.connect()
+
+    def register_vector_codec(self, dbapi_connection, connection_record):
+        dbapi_connection.run_async(register_vector)
+
+    def to_db_vector(self, vector):
+        return np.asarray(vector, dtype=np.float32)
+
     async def disconnect(self):
-        pass
+        await self.registry_channel.disconnect()
+
+        for task in self.index_rebuild_tasks.values():
+            task.cancel()
+        self.index_rebuild_tasks = {}
+
+        self.collection_registry.clear()
+
+    async def load_collection_registry(self):
+        """
+        Read every table holding a pgvector column, with its dimension and vector index.
+        """
+        async with self.db_client() as session:
+            async with session.begin():
+                registry_sql = sql_text(f'''
+                    SELECT c.relname AS collection_name, a.atttypmod AS embedding_size, i.indexdef,
+                           ts.attname IS NOT NULL AS has_text_search,
+                           mi.indexname IS NOT NULL AS has_metadata_index,
+                           tx.attname IS NOT NULL AS has_text,
+                           col_description(c.oid, ts.attnum) AS text_search_config
+                    FROM pg_class c
+                    JOIN pg_attribute a ON a.attrelid = c.oid AND a.attname = :vector_column
+                    JOIN pg_type t ON t.oid = a.atttypid AND t.typname = 'vector'
+                    LEFT JOIN pg_attribute tx ON tx.attrelid = c.oid AND tx.attname = :text_column
+                                             AND NOT tx.attisdropped
+                    LEFT JOIN pg_attribute ts ON ts.attrelid = c.oid AND ts.attname = :text_search_column
+                                             AND NOT ts.attisdropped
+                    LEFT JOIN pg_indexes i ON i.tablename = c.relname
+                                          AND i.indexname = c.relname || '_vector_idx'
+                    LEFT JOIN pg_indexes mi ON mi.tablename = c.relname
+                                           AND mi.indexname = c.relname || '_metadata_idx'
+                    WHERE c.relkind = 'r' AND pg_table_is_visible(c.oid)
+                ''')
+                results = await session.execute(registry_sql, {
+                    "vector_column": PgVectorTableSchemeEnums.VECTOR.value,
+                    "text_search_column": PgVectorTableSchemeEnums.TEXT_SEARCH.value,
+                    "text_column": PgVectorTableSchemeEnums.TEXT.value,
+                })
+                records = results.fetchall()
+
+        self.collection_registry.load({
+            record.collection_name: self.build_collection_info(
+                embedding_size=record.embedding_size,
+                indexdef=record.indexdef,
+                has_text_search=record.has_text_search,
+                has_metadata_index=record.has_metadata_index,
+                has_text=record.has_text,
+                text_search_config=record.text_search_config,
+            )
+            for record in records
+        })
+
+    def build_collection_info(self, embedding_size: int, indexdef: str = None,
+                                    has_text_search: bool = False,
+                                    has_metadata_index: bool = False,
+                                    has_text: bool = True,
+                                    text_search_config: str = None):
+        index_type, distance_method = None, self.distance_method
+        quantization = VectorQuantizationEnums.NONE.value
+        if indexdef:
+            match = re.search(r"USING (\w+) \((.+?) (\w+_ops)\)", indexdef)
+            if match:
+                index_type, distance_method = match.group(1), match.group(3)
+                if "binary_quantize" in match.group(2):
+                    quantization = VectorQuantizationEnums.BIT.value
+                elif "halfvec" in match.group(2):
+                    quantization = VectorQuantizationEnums.HALFVEC.value
+
+        index_lists = None
+        if indexdef:
+            match = re.search(r"lists\s*=\s*'?(\d+)", indexdef)
+            if match:
+                index_lists = int(match.group(1))
+
+        return {
+            "embedding_size": embedding_size,
+            "distance_method": distance_method,
+            "has_index": indexdef is not None,
+            "index_type": index_type,
+            "index_lists": index_lists,
+            "quantization": quantization,
+            "has_text_search": has_text_search,
+            "has_metadata_index": has_metadata_index,
+            "has_text": has_text,
+            "text_search_config": text_search_config
+                if text_search_config in [ e.value for e in PgVectorTextSearchConfigEnums ] else None,
+        }
+
+    async def notify_collection_change(self, session, collection_name: str):
+        # delivered to the other workers when the surrounding transaction commits
+        await self.registry_channel.notify(session, {
+            "collection_name": collection_name,
+            "info": self.collection_registry.get(collection_name),
+        })
+
+    def on_registry_message(self, message: dict):
+        if not message.get("collection_name"):
+            return
+
+        if message.get("info") is None:
+            self.collection_registry.remove(message["collection_name"])
+        else:
+            self.collection_registry.set(message["collection_name"], message["info"])
 
     async def is_collection_existed(self, collection_name: str) -> bool:
 
+        if self.collection_registry.has(collection_name):
+            return True
+
         record = None
         async with self.db_client() as session:
             async with session.begin():
@@ -49,6 +247,10 @@ class PGVectorProvider(VectorDBInterface):
                 results = await session.execute(list_tbl, {"collection_name": collection_name})
                 record = results.scalar_one_or_none()
 
+        if record:
+            # created by a worker we have not heard from yet
+            await self.load_collection_registry()
+
         return record
     
     async def list_all_collections(self) -> List:
@@ -91,13 +293,55 @@ class PGVectorProvider(VectorDBInterface):
                     "record_count": record_count.scalar_one(),
                 }
             
+    async def get_collection_parent(self, session, collection_name: str) -> str:
+        result = await session.execute(sql_text(
+            "SELECT inhparent::regclass::text FROM pg_inherits WHERE inhrelid = to_regclass(:collection_name)"
+        ), {"collection_name": collection_name})
+        return result.scalar_one_or_none()
+
+    def get_collection_partition_key(self, collection_name: str) -> int:
+        # collections are named collection_{embedding_size}_{project_id}
+        match = re.search(r"_(\d+)$", collection_name)
+        return int(match.group(1)) if match else None
+
+    async def detach_collection_partition(self, collection_name: str, parent_table_name: str):
+        """
+        Detach and drop a collection partition. DETACH ... CONCURRENTLY does not block
+        the other partitions of the table, it needs its own autocommit connection.
+        """
+
+        if self.db_engine is None:
+            async with self.db_client() as session:
+                async with session.begin():
+                    await session.execute(sql_text(f'ALTER TABLE {parent_table_name} DETACH PARTITION {collection_name}'))
+                    await session.execute(sql_text(f'DROP TABLE IF EXISTS {collection_name}'))
+            return
+
+        async with self.db_engine.connect() as connection:
+            connection = await connection.execution_options(isolation_level="AUTOCOMMIT")
+            await connection.execute(sql_text(f'ALTER TABLE {parent_table_name} DETACH PARTITION {collection_name} CONCURRENTLY'))
+            await connection.execute(sql_text(f'DROP TABLE IF EXISTS {collection_name}'))
+
     async def delete_collection(self, collection_name: str):
+        async with self.db_client() as session:
+            async with session.begin():
+                parent_table_name = await self.get_collection_parent(session, collection_name)
+
+        if parent_table_name is not None:
+            self.logger.info(f"Detaching collection partition: {collection_name} from {parent_table_name}")
+            await self.detach_collection_partition(collection_name=collection_name,
+                                                   parent_table_name=parent_table_name)
+
         async with self.db_client() as session:
             async with session.begin():
                 self.logger.info(f"Deleting collection: {collection_name}")
 
                 delete_sql = sql_text(f'DROP TABLE IF EXISTS {collection_name}')
                 await session.execute(delete_sql)
+
+                self.collection_registry.remove(collection_name)
+                await self.notify_collection_change(session, collection_name)
+
                 await session.commit()
         
         return True
@@ -110,6 +354,10 @@ class PGVectorProvider(VectorDBInterface):
             _ = await self.delete_collection(collection_name=collection_name)
 
         is_collection_existed = await self.is_collection_existed(collection_name=collection_name)
+        if not is_collection_existed and self.table_layout == PgVectorTableLayoutEnums.PARTITIONED.value:
+            return await self.create_collection_partition(collection_name=collection_name,
+                                                          embedding_size=embedding_size)
+
         if not is_collection_existed:
             self.logger.info(f"Creating collection: {collection_name}")
             async with self.db_client() as session:
@@ -117,21 +365,213 @@ class PGVectorProvider(VectorDBInterface):
                     create_sql = sql_text(
                         f'CREATE TABLE {collection_name} ('
                             f'{PgVectorTableSchemeEnums.ID.value} bigserial PRIMARY KEY,'
-                            f'{PgVectorTableSchemeEnums.TEXT.value} text, '
+                            f'{self.get_text_column_sql()}'
                             f'{PgVectorTableSchemeEnums.VECTOR.value} vector({embedding_size}), '
                             f'{PgVectorTableSchemeEnums.METADATA.value} jsonb DEFAULT \'{{}}\', '
                             f'{PgVectorTableSchemeEnums.CHUNK_ID.value} integer, '
+                            f'{PgVectorTableSchemeEnums.TEXT_SEARCH.value} tsvector, '
                             f'FOREIGN KEY ({PgVectorTableSchemeEnums.CHUNK_ID.value}) REFERENCES chunks(chunk_id)'
                         ')'
                     )
                     await session.execute(create_sql)
+
+                    create_text_search_idx_sql = sql_text(
+                        f'CREATE INDEX {self.default_text_search_index_name(collection_name)} ON {collection_name} '
+                        f'USING gin ({PgVectorTableSchemeEnums.TEXT_SEARCH.value})'
+                    )
+                    await session.execute(create_text_search_idx_sql)
+
+                    await session.execute(self.get_create_metadata_index_sql(collection_name=collection_name))
+
+                    self.collection_registry.set(collection_name, self.build_collection_info(
+                        embedding_size=embedding_size,
+                        has_text_search=True,
+                        has_metadata_index=True,
+                        has_text=self.store_text,
+                    ))
+                    await self.notify_collection_change(session, collection_name)
+
                     await session.commit()
             
             return True
 
+        collection_info = self.collection_registry.get(collection_name)
+        if collection_info is not None and not collection_info.get("has_text_search"):
+            _ = await self.create_text_search_index(collection_name=collection_name)
+
+        if collection_info is not None and not collection_info.get("has_metadata_index"):
+            _ = await self.create_metadata_index(collection_name=collection_name)
+
+        # existing collections keep their text column until drop_text_column is run explicitly
         return False
+
+    def get_text_column_sql(self):
+        if not self.store_text:
+            return ""
+        return f'{PgVectorTableSchemeEnums.TEXT.value} text, '
+
+    async def drop_text_column(self, collection_name: str):
+        """
+        Migrate a collection created with a text column to the lean layout, an explicit
+        and irreversible admin step (POST /index/migrate/lean), never run by a push.
+        The tsvector is filled from the text first (create_text_search_index),
+        rows without a chunk_id would lose their text and keep the collection as it is.
+        """
+
+        if not await self.is_collection_existed(collection_name=collection_name):
+            return False
+
+        collection_info = self.collection_registry.get(collection_name) or {}
+        if not collection_info.get("has_text", True):
+            return True
+
+        if not collection_info.get("has_text_search"):
+            _ = await self.create_text_search_index(collection_name=collection_name)
+
+        async with self.db_client() as session:
+            async with session.begin():
+                parent_table_name = await self.get_collection_parent(session, collection_name)
+                if parent_table_name is not None:
+                    # inherited columns can only be dropped on the partitioned table
+                    self.logger.warning(f"Keeping the text column of collection partition: {collection_name}")
+                    return False
+
+                result = await session.execute(sql_text(
+                    f'SELECT EXISTS (SELECT 1 FROM {collection_name} '
+                    f'WHERE {PgVectorTableSchemeEnums.CHUNK_ID.value} IS NULL)'
+                ))
+                if result.scalar_one():
+                    self.logger.warning(f"Keeping the text column of collection: {collection_name}, "
+                                        f"some records have no chunk_id")
+                    return False
+
+                self.logger.info(f"Dropping the text column of collection: {collection_name}")
+
+                # metadata only, the old values leave the heap as rows get rewritten (VACUUM FULL / pg_repack)
+                await session.execute(sql_text(
+                    f'ALTER TABLE {collection_name} DROP COLUMN IF EXISTS {PgVectorTableSchemeEnums.TEXT.value}'
+                ))
+
+                self.collection_registry.update(collection_name, has_text=False)
+                await self.notify_collection_change(session, collection_name)
+
+        return True
+
+    async def create_collection_partition(self, collection_name: str, embedding_size: int):
+        """
+        Create the collection as a partition of the table of its embedding size.
+        The collection keeps its name, so inserts, searches and its own vector index
+        address the partition directly: the same scan partition pruning leaves on the parent.
+        The text search and metadata indexes are declared once on the parent.
+        """
+
+        partition_key = self.get_collection_partition_key(collection_name)
+        if partition_key is None:
+            self.logger.error(f"Can not derive the partition key of collection: {collection_name}")
+            return False
+
+        table_name = self.default_partitioned_table_name(embedding_size)
+        self.logger.info(f"Creating collection: {collection_name} as a partition of {table_name}")
+
+        async with self.db_client() as session:
+            async with session.begin():
+                create_table_sql = sql_text(
+                    f'CREATE TABLE IF NOT EXISTS {table_name} ('
+                        f'{PgVectorTableSchemeEnums.ID.value} bigserial, '
+                        f'{self.get_text_column_sql()}'
+                        f'{PgVectorTableSchemeEnums.VECTOR.value} vector({embedding_size}), '
+                        f'{PgVectorTableSchemeEnums.METADATA.value} jsonb DEFAULT \'{{}}\', '
+                        f'{PgVectorTableSchemeEnums.CHUNK_ID.value} integer, '
+                        f'{PgVectorTableSchemeEnums.TEXT_SEARCH.value} tsvector, '
+                        f'{PgVectorTableSchemeEnums.PROJECT_ID.value} integer NOT NULL, '
+                        f'PRIMARY KEY ({PgVectorTableSchemeEnums.PROJECT_ID.value}, {PgVectorTableSchemeEnums.ID.value}), '
+                        f'FOREIGN KEY ({PgVectorTableSchemeEnums.CHUNK_ID.value}) REFERENCES chunks(chunk_id)'
+                    f') PARTITION BY LIST ({PgVectorTableSchemeEnums.PROJECT_ID.value})'
+                )
+                await session.execute(create_table_sql)
+
+                # partitioned indexes, every partition gets its own <partition>_<column>_idx
+                await session.execute(sql_text(
+                    f'CREATE INDEX IF NOT EXISTS {self.default_text_search_index_name(table_name)} ON {table_name} '
+                    f'USING gin ({PgVectorTableSchemeEnums.TEXT_SEARCH.value})'
+                ))
+                await session.execute(self.get_create_metadata_index_sql(collection_name=table_name))
+
+                # the partition default fills the key of rows inserted into the partition directly
+                create_partition_sql = sql_text(
+                    f'CREATE TABLE {collection_name} PARTITION OF {table_name} '
+                    f'({PgVectorTableSchemeEnums.PROJECT_ID.value} DEFAULT {int(partition_key)}) '
+                    f'FOR VALUES IN ({int(partition_key)})'
+                )
+                await session.execute(create_partition_sql)
+
+                # the table of this embedding size may predate the lean layout
+                result = await session.execute(sql_text(
+                    "SELECT EXISTS (SELECT 1 FROM pg_attribute WHERE attrelid = to_regclass(:table_name) "
+                    "AND attname = :text_column AND NOT attisdropped)"
+                ), {"table_name": table_name, "text_column": PgVectorTableSchemeEnums.TEXT.value})
+
+                self.collection_registry.set(collection_name, self.build_collection_info(
+                    embedding_size=embedding_size,
+                    has_text_search=True,
+                    has_metadata_index=True,
+                    has_text=result.scalar_one(),
+                ))
+                await self.notify_collection_change(session, collection_name)
+
+        return True
+
+    def get_create_metadata_index_sql(self, collection_name: str):
+        # jsonb_path_ops serves the @> containment predicates of filtered searches
+        return sql_text(
+            f'CREATE INDEX IF NOT EXISTS {self.default_metadata_index_name(collection_name)} '
+            f'ON {collection_name} USING gin ({PgVectorTableSchemeEnums.METADATA.value} jsonb_path_ops)'
+        )
+
+    async def create_metadata_index(self, collection_name: str):
+        self.logger.info(f"Adding metadata index to collection: {collection_name}")
+
+        async with self.db_client() as session:
+            async with session.begin():
+                await session.execute(self.get_create_metadata_index_sql(collection_name=collection_name))
+
+                self.collection_registry.update(collection_name, has_metadata_index=True)
+                await self.notify_collection_change(session, collection_name)
+
+        return True
+
+    async def create_text_search_index(self, collection_name: str):
+        """
+        Add the tsvector column and its GIN index to a collection created before hybrid retrieval.
+        """
+        self.logger.info(f"Adding text search index to collection: {collection_name}")
+
+        text_search_column = PgVectorTableSchemeEnums.TEXT_SEARCH.value
+        async with self.db_client() as session:
+            async with session.begin():
+                await session.execute(sql_text(
+                    f'ALTER TABLE {collection_name} ADD COLUMN IF NOT EXISTS {text_search_column} tsvector'
+                ))
+                await session.execute(sql_text(
+                    f'UPDATE {collection_name} '
+                    f'SET {text_search_column} = to_tsvector(CAST(:ts_config AS regconfig), coalesce({PgVectorTableSchemeEnums.TEXT.value}, \'\')) '
+                    f'WHERE {text_search_column} IS NULL'
+                ), {"ts_config": self.get_text_search_config(collection_name)})
+                await session.execute(sql_text(
+                    f'CREATE INDEX IF NOT EXISTS {self.default_text_search_index_name(collection_name)} '
+                    f'ON {collection_name} USING gin ({text_search_column})'
+                ))
+
+                self.collection_registry.update(collection_name, has_text_search=True)
+                await self.notify_collection_change(session, collection_name)
+
+        return True
     
     async def is_index_existed(self, collection_name: str) -> bool:
+        collection_info = self.collection_registry.get(collection_name)
+        if collection_info is not None:
+            return collection_info["has_index"]
+
         index_name = self.default_index_name(collection_name)
         async with self.db_client() as session:
             async with session.begin():
@@ -145,45 +585,480 @@ class PGVectorProvider(VectorDBInterface):
                 
                 return bool(results.scalar_one_or_none())
             
+    async def get_collection_rows_count(self, session, collection_name: str, analyze: bool = False) -> int:
+        """
+        Estimated rows count from the planner statistics (pg_class.reltuples), no table scan.
+        Tables never analyzed, or just bulk loaded (analyze=True), are analyzed first.
+        """
+
+        count_sql = sql_text("SELECT reltuples FROM pg_class WHERE oid = to_regclass(:collection_name)")
+
+        rows_count = -1
+        if not analyze:
+            result = await session.execute(count_sql, {"collection_name": collection_name})
+            rows_count = result.scalar_one_or_none()
+            rows_count = -1 if rows_count is None else rows_count
+
+        if rows_count < 0:
+            await session.execute(sql_text(f'ANALYZE {collection_name}'))
+            result = await session.execute(count_sql, {"collection_name": collection_name})
+            rows_count = result.scalar_one_or_none() or 0
+
+        return max(int(rows_count), 0)
+
     async def create_vector_index(self, collection_name: str,
-                                        index_type: str = PgVectorIndexTypeEnums.HNSW.value):
+                                        index_type: str = None,
+                                        analyze: bool = False):
+        """
+        Build the vector index planned for the collection size,
+        `index_type` forces the index type (the IVFFlat lists are still sized).
+        """
+
         is_index_existed = await self.is_index_existed(collection_name=collection_name)
         if is_index_existed:
             return False
         
         async with self.db_client() as session:
             async with session.begin():
-                count_sql = sql_text(f'SELECT COUNT(*) FROM {collection_name}')
-                result = await session.execute(count_sql)
-                records_count = result.scalar_one()
-
-                if records_count < self.index_threshold:
+                rows_count = await self.get_collection_rows_count(session, collection_name, analyze=analyze)
+                if rows_count < self.index_threshold:
                     return False
+
+                index_type, index_lists = self.get_index_plan(rows_count, index_type=index_type)
                 
-                self.logger.info(f"START: Creating vector index for collection: {collection_name}")
+                self.logger.info(f"START: Creating {index_type} vector index for collection: {collection_name} "
+                                 f"(~{rows_count} rows)")
+
+                for settings_sql in self.get_maintenance_settings_sql(local=True):
+                    await session.execute(settings_sql)
                 
                 index_name = self.default_index_name(collection_name)
-                create_idx_sql = sql_text(
-                                            f'CREATE INDEX {index_name} ON {collection_name} '
-                                            f'USING {index_type} ({PgVectorTableSchemeEnums.VECTOR.value} {self.distance_method})'
-                                          )
+                create_idx_sql = self.get_create_index_sql(collection_name=collection_name, index_name=index_name,
+                                                           index_type=index_type, lists=index_lists)
 
                 await session.execute(create_idx_sql)
 
+                self.collection_registry.update(collection_name, has_index=True, index_type=index_type,
+                                                index_lists=index_lists, distance_method=self.get_index_opclass(),
+                                                quantization=self.quantization)
+                await self.notify_collection_change(session, collection_name)
+
                 self.logger.info(f"END: Created vector index for collection: {collection_name}")
 
-    async def reset_vector_index(self, collection_name: str, 
-                                       index_type: str = PgVectorIndexTypeEnums.HNSW.value) -> bool:
-        
+        return True
+
+    def get_index_plan(self, rows_count: int, index_type: str = None):
+        planned_index = self.index_planner.plan(rows_count)
+        index_type = index_type or planned_index["index_type"]
+
+        index_lists = None
+        if index_type == PgVectorIndexTypeEnums.IVFFLAT.value:
+            index_lists = self.index_planner.get_ivfflat_lists(rows_count)
+
+        return index_type, index_lists
+
+    def get_maintenance_settings_sql(self, local: bool = True):
+        scope = "LOCAL " if local else ""
+        settings_sql = []
+
+        if self.maintenance_work_mem:
+            settings_sql.append(sql_text(
+                f"SET {scope}maintenance_work_mem = '{self.maintenance_work_mem}'"
+            ))
+
+        if self.max_parallel_maintenance_workers is not None:
+            settings_sql.append(sql_text(
+                f"SET {scope}max_parallel_maintenance_workers = {int(self.max_parallel_maintenance_workers)}"
+            ))
+
+        return settings_sql
+
+    def get_create_index_sql(self, collection_name: str, index_name: str, index_type: str,
+                                   lists: int = None, concurrently: bool = False):
+        index_options_sql = self.get_index_options_sql(index_type=index_type, lists=lists)
+        return sql_text(
+                            f'CREATE INDEX {"CONCURRENTLY " if concurrently else ""}{index_name} ON {collection_name} '
+                            f'USING {index_type} ({self.get_index_expression_sql(collection_name)})'
+                            f'{index_options_sql}'
+                        )
+
+    def get_index_opclass(self, quantization: str = None):
+        quantization = quantization or self.quantization
+        if quantization == VectorQuantizationEnums.BIT.value:
+            return "bit_hamming_ops"
+        if quantization == VectorQuantizationEnums.HALFVEC.value:
+            return self.distance_method.replace("vector_", "halfvec_", 1)
+        return self.distance_method
+
+    def get_distance_operator(self, opclass: str) -> str:
+        # the operator an index of `opclass` serves in ORDER BY
+        if opclass.endswith("_hamming_ops"):
+            return "<~>"
+        if opclass.endswith("_l2_ops"):
+            return "<->"
+        if opclass.endswith("_ip_ops"):
+            return "<#>"
+        return "<=>"
+
+    def get_quantized_vector_sql(self, vector_sql: str, quantization: str, embedding_size: int):
+        if quantization == VectorQuantizationEnums.BIT.value:
+            return f"CAST(binary_quantize({vector_sql}) AS bit({int(embedding_size)}))"
+        if quantization == VectorQuantizationEnums.HALFVEC.value:
+            return f"CAST({vector_sql} AS halfvec({int(embedding_size)}))"
+        return vector_sql
+
+    def get_index_expression_sql(self, collection_name: str):
+        vector_column = PgVectorTableSchemeEnums.VECTOR.value
+        if self.quantization == VectorQuantizationEnums.NONE.value:
+            return f"{vector_column} {self.distance_method}"
+
+        collection_info = self.collection_registry.get(collection_name) or {}
+        embedding_size = collection_info.get("embedding_size") or self.default_vector_size
+        quantized_sql = self.get_quantized_vector_sql(vector_column, self.quantization, embedding_size)
+
+        return f"({quantized_sql}) {self.get_index_opclass()}"
+
+    def get_index_options_sql(self, index_type: str, lists: int = None):
+        options = {}
+        if index_type == PgVectorIndexTypeEnums.HNSW.value:
+            options = { "m": self.hnsw_m, "ef_construction": self.hnsw_ef_construction }
+        elif index_type == PgVectorIndexTypeEnums.IVFFLAT.value:
+            options = { "lists": lists }
+
+        options = { name: int(value) for name, value in options.items() if value }
+        if not options:
+            return ""
+
+        return " WITH (" + ", ".join([ f"{name} = {value}" for name, value in options.items() ]) + ")"
+
+    async def drop_vector_index(self, collection_name: str):
         index_name = self.default_index_name(collection_name)
         async with self.db_client() as session:
             async with session.begin():
                 drop_sql = sql_text(f'DROP INDEX IF EXISTS {index_name}')
                 await session.execute(drop_sql)
+
+                self.collection_registry.update(collection_name, has_index=False, index_type=None,
+                                                index_lists=None, quantization=VectorQuantizationEnums.NONE.value)
+                await self.notify_collection_change(session, collection_name)
+
+        return True
+
+    async def get_vector_index_definition(self, collection_name: str):
+        async with self.db_client() as session:
+            async with session.begin():
+                result = await session.execute(sql_text(
+                    "SELECT indexdef FROM pg_indexes WHERE tablename = :collection_name AND indexname = :index_name"
+                ), {"collection_name": collection_name, "index_name": self.default_index_name(collection_name)})
+                return result.scalar_one_or_none()
+
+    async def restore_vector_index(self, collection_name: str, indexdef: str):
+        """
+        Re-create a dropped vector index from its `pg_indexes` definition.
+        """
+
+        try:
+            async with self.db_client() as session:
+                async with session.begin():
+                    for settings_sql in self.get_maintenance_settings_sql(local=True):
+                        await session.execute(settings_sql)
+
+                    await session.execute(sql_text(indexdef))
+
+                    collection_info = self.collection_registry.get(collection_name) or {}
+                    index_info = self.build_collection_info(embedding_size=collection_info.get("embedding_size"),
+                                                            indexdef=indexdef)
+                    self.collection_registry.update(collection_name, **{
+                        key: index_info[key]
+                        for key in [ "has_index", "index_type", "index_lists", "distance_method", "quantization" ]
+                    })
+                    await self.notify_collection_change(session, collection_name)
+        except Exception as e:
+            self.logger.error(f"Error while restoring the vector index of collection {collection_name}, "
+                              f"it is left without one: {e}")
+            return False
+
+        self.logger.info(f"Restored the vector index of collection: {collection_name}")
+        return True
+
+    async def reset_vector_index(self, collection_name: str, 
+                                       index_type: str = None) -> bool:
+        
+        _ = await self.drop_vector_index(collection_name=collection_name)
         
         return await self.create_vector_index(collection_name=collection_name, index_type=index_type)
 
+    async def maintain_vector_index(self, collection_name: str):
+        """
+        Called after inserts: build the first index once the collection is large enough,
+        and schedule a rebuild once it outgrew its index.
+        """
+
+        collection_info = self.collection_registry.get(collection_name)
+        if collection_info is None or not collection_info.get("has_index"):
+            return await self.create_vector_index(collection_name=collection_name)
+
+        if collection_info.get("index_type") != PgVectorIndexTypeEnums.IVFFLAT.value:
+            return False
+
+        async with self.db_client() as session:
+            async with session.begin():
+                rows_count = await self.get_collection_rows_count(session, collection_name)
+
+        if self.index_planner.needs_rebuild(collection_info, rows_count):
+            self.schedule_index_rebuild(collection_name=collection_name)
+            return True
+
+        return False
+
+    def schedule_index_rebuild(self, collection_name: str, index_type: str = None):
+        if collection_name in self.index_rebuild_tasks:
+            return False
+
+        self.logger.info(f"Scheduling vector index rebuild for collection: {collection_name}")
+
+        task = asyncio.ensure_future(self.rebuild_vector_index_online(collection_name=collection_name,
+                                                                       index_type=index_type))
+        task.add_done_callback(lambda _: self.index_rebuild_tasks.pop(collection_name, None))
+        self.index_rebuild_tasks[collection_name] = task
+        return True
+
+    async def rebuild_index(self, collection_name: str, index_type: str = None):
+        if collection_name in self.bulk_load_collections:
+            self.logger.error(f"Can not rebuild the index of a collection being bulk loaded: {collection_name}")
+            return False
+
+        return self.schedule_index_rebuild(collection_name=collection_name, index_type=index_type)
+
+    async def get_index_build_progress(self, collection_name: str):
+        progress = self.index_build_progress.get(collection_name)
+        return dict(progress) if progress is not None else None
+
+    async def watch_index_build_progress(self, collection_name: str, interval: float = 2):
+        progress_sql = sql_text("""
+            SELECT phase, blocks_total, blocks_done, tuples_total, tuples_done
+            FROM pg_stat_progress_create_index
+            WHERE relid = to_regclass(:collection_name)
+        """)
+
+        while True:
+            await asyncio.sleep(interval)
+
+            async with self.db_client() as session:
+                result = await session.execute(progress_sql, {"collection_name": collection_name})
+                record = result.first()
+
+            if record is None:
+                continue
+
+            self.index_build_progress[collection_name].update({
+                "phase": record.phase,
+                "blocks_total": record.blocks_total,
+                "blocks_done": record.blocks_done,
+                "tuples_total": record.tuples_total,
+                "tuples_done": record.tuples_done,
+            })
+            self.logger.info(f"Vector index build on {collection_name}: {record.phase} "
+                             f"(blocks {record.blocks_done}/{record.blocks_total}, "
+                             f"tuples {record.tuples_done}/{record.tuples_total})")
+
+    async def rebuild_vector_index_online(self, collection_name: str, index_type: str = None) -> bool:
+        """
+        Rebuild the vector index without a window where searches lose it or inserts block:
+        the new index is built CONCURRENTLY under a temporary name, validated,
+        then swapped in by renaming both indexes in one short transaction.
+        """
+
+        if self.db_engine is None:
+            self.logger.warning(f"No database engine for a concurrent build, rebuilding offline: {collection_name}")
+            return await self.reset_vector_index(collection_name=collection_name, index_type=index_type)
+
+        index_name = self.default_index_name(collection_name)
+        new_index_name = f"{index_name}_new"
+        old_index_name = f"{index_name}_old"
+
+        progress = { "status": "building", "started_at": time.time() }
+        self.index_build_progress[collection_name] = progress
+
+        try:
+            async with self.db_engine.connect() as connection:
+                # CREATE / DROP INDEX CONCURRENTLY can not run inside a transaction block
+                connection = await connection.execution_options(isolation_level="AUTOCOMMIT")
+
+                # leftovers of an interrupted rebuild
+                await connection.execute(sql_text(f'DROP INDEX CONCURRENTLY IF EXISTS {new_index_name}'))
+                await connection.execute(sql_text(f'DROP INDEX CONCURRENTLY IF EXISTS {old_index_name}'))
+
+                rows_count = await self.get_collection_rows_count(connection, collection_name)
+                if rows_count < self.index_threshold:
+                    progress["status"] = "skipped"
+                    return False
+
+                index_type, index_lists = self.get_index_plan(rows_count, index_type=index_type)
+                progress.update({ "index_type": index_type, "index_lists": index_lists, "rows_count": rows_count })
+
+                self.logger.info(f"START: Rebuilding {index_type} vector index concurrently for collection: "
+                                 f"{collection_name} (~{rows_count} rows)")
+
+                progress_task = asyncio.ensure_future(self.watch_index_build_progress(collection_name))
+                try:
+                    for settings_sql in self.get_maintenance_settings_sql(local=False):
+                        await connection.execute(settings_sql)
+
+                    await connection.execute(self.get_create_index_sql(
+                        collection_name=collection_name, index_name=new_index_name,
+                        index_type=index_type, lists=index_lists, concurrently=True,
+                    ))
+                finally:
+                    progress_task.cancel()
+                    await connection.execute(sql_text("RESET maintenance_work_mem"))
+                    await connection.execute(sql_text("RESET max_parallel_maintenance_workers"))
+
+                # a failed concurrent build leaves an invalid index behind
+                result = await connection.execute(sql_text(
+                    "SELECT indisvalid FROM pg_index WHERE indexrelid = to_regclass(:index_name)"
+                ), {"index_name": new_index_name})
+                if not result.scalar_one_or_none():
+                    await connection.execute(sql_text(f'DROP INDEX CONCURRENTLY IF EXISTS {new_index_name}'))
+                    raise RuntimeError(f"Invalid index after concurrent build: {new_index_name}")
+
+                progress["status"] = "swapping"
+                async with self.db_client() as session:
+                    async with session.begin():
+                        # fail fast instead of queueing searches behind the rename locks
+                        await session.execute(sql_text("SET LOCAL lock_timeout = '5s'"))
+                        await session.execute(sql_text(f'ALTER INDEX IF EXISTS {index_name} RENAME TO {old_index_name}'))
+                        await session.execute(sql_text(f'ALTER INDEX {new_index_name} RENAME TO {index_name}'))
+
+                        self.collection_registry.update(collection_name, has_index=True, index_type=index_type,
+                                                        index_lists=index_lists, distance_method=self.get_index_opclass(),
+                                                        quantization=self.quantization)
+                        await self.notify_collection_change(session, collection_name)
+
+                await connection.execute(sql_text(f'DROP INDEX CONCURRENTLY IF EXISTS {old_index_name}'))
+
+        except Exception as e:
+            progress.update({ "status": "failed", "error": str(e) })
+            self.logger.error(f"Error while rebuilding vector index for collection {collection_name}: {e}")
+            return False
+
+        progress.update({ "status": "done", "duration_seconds": round(time.time() - progress["started_at"], 3) })
+        self.logger.info(f"END: Rebuilt vector index for collection: {collection_name} "
+                         f"in {progress['duration_seconds']}s")
+
+        return True
+
+    async def should_rebuild_on_bulk_load(self, collection_name: str, expected_rows: int = None) -> bool:
+        """
+        Drop the index for the load only when it is rebuilt anyway or cheap to rebuild:
+        no index yet (new or reset collection), an unknown load size,
+        or a load of at least bulk_load_rebuild_ratio x the indexed rows.
+        """
+
+        collection_info = self.collection_registry.get(collection_name)
+        if collection_info is None or not collection_info.get("has_index"):
+            return True
+
+        if expected_rows is None:
+            return True
+
+        async with self.db_client() as session:
+            async with session.begin():
+                rows_count = await self.get_collection_rows_count(session, collection_name)
+
+        return expected_rows >= rows_count * self.bulk_load_rebuild_ratio
+
+    @asynccontextmanager
+    async def bulk_load(self, collection_name: str,
+                              index_type: str = None,
+                              expected_rows: int = None):
+        """
+        Load many rows without maintaining the vector index row by row.
+        Large loads (should_rebuild_on_bulk_load) drop the index on enter and build
+        the index planned for the loaded size once on exit; small loads into an
+        indexed collection keep it, the usual index maintenance runs on exit.
+        A failed load gets no new index, the dropped one is restored from its definition.
+        The yielded dict reports the build time.
+        """
+
+        bulk_load_session = {
+            "collection_name": collection_name,
+            "index_built": False,
+            "index_build_seconds": None,
+        }
+
+        is_rebuilt = await self.should_rebuild_on_bulk_load(collection_name=collection_name,
+                                                            expected_rows=expected_rows)
+
+        previous_indexdef = None
+        self.bulk_load_collections.add(collection_name)
+        try:
+            if is_rebuilt:
+                previous_indexdef = await self.get_vector_index_definition(collection_name=collection_name)
+                _ = await self.drop_vector_index(collection_name=collection_name)
+            yield bulk_load_session
+        except BaseException:
+            if previous_indexdef is not None:
+                _ = await self.restore_vector_index(collection_name=collection_name, indexdef=previous_indexdef)
+            raise
+        finally:
+            self.bulk_load_collections.discard(collection_name)
+
+        # only reached when the load succeeded
+        if not is_rebuilt:
+            _ = await self.maintain_vector_index(collection_name=collection_name)
+            return
+
+        start_time = time.perf_counter()
+        is_built = await self.create_vector_index(collection_name=collection_name, index_type=index_type,
+                                                  analyze=True)
+
+        bulk_load_session["index_built"] = bool(is_built)
+        if is_built:
+            bulk_load_session["index_build_seconds"] = round(time.perf_counter() - start_time, 3)
+            self.logger.info(f"Built vector index for collection: {collection_name} "
+                             f"in {bulk_load_session['index_build_seconds']}s")
+
     
+    def has_text_column(self, collection_name: str) -> bool:
+        collection_info = self.collection_registry.get(collection_name)
+        if collection_info is None:
+            return self.store_text
+        return collection_info.get("has_text", True)
+
+    def get_result_text_sql(self, collection_name: str, alias: str):
+        """
+        Select expression and join reading the text of the final results,
+        from the collection itself or, for lean collections, from chunks.
+        """
+
+        if self.has_text_column(collection_name):
+            return f"{alias}.{PgVectorTableSchemeEnums.TEXT.value}", ""
+
+        return ("chunks.chunk_text",
+                f" JOIN chunks ON chunks.chunk_id = {alias}.{PgVectorTableSchemeEnums.CHUNK_ID.value}")
+
+    def get_insert_sql(self, collection_name: str):
+        columns = [
+            PgVectorTableSchemeEnums.VECTOR.value,
+            PgVectorTableSchemeEnums.METADATA.value,
+            PgVectorTableSchemeEnums.CHUNK_ID.value,
+        ]
+        values = [ ':vector', ':metadata', ':chunk_id' ]
+
+        if self.has_text_column(collection_name):
+            columns.append(PgVectorTableSchemeEnums.TEXT.value)
+            values.append(':text')
+
+        collection_info = self.collection_registry.get(collection_name)
+        if collection_info is not None and collection_info.get("has_text_search"):
+            columns.append(PgVectorTableSchemeEnums.TEXT_SEARCH.value)
+            values.append("to_tsvector(CAST(:ts_config AS regconfig), coalesce(:text, ''))")
+
+        return sql_text(f'INSERT INTO {collection_name} '
+                        f'({", ".join(columns)}) '
+                        f'VALUES ({", ".join(values)})')
+
     async def insert_one(self, collection_name: str, text: str, vector: list,
                             metadata: dict = None,
                             record_id: str = None):
@@ -197,23 +1072,24 @@ class PGVectorProvider(VectorDBInterface):
             self.logger.error(f"Can not insert new record without chunk_id: {collection_name}")
             return False
         
+        await self.ensure_text_search_config(collection_name=collection_name, texts=[text])
+
         async with self.db_client() as session:
             async with session.begin():
-                insert_sql = sql_text(f'INSERT INTO {collection_name} '
-                                      f'({PgVectorTableSchemeEnums.TEXT.value}, {PgVectorTableSchemeEnums.VECTOR.value}, {PgVectorTableSchemeEnums.METADATA.value}, {PgVectorTableSchemeEnums.CHUNK_ID.value}) '
-                                      'VALUES (:text, :vector, :metadata, :chunk_id)'
-                                      )
+                insert_sql = self.get_insert_sql(collection_name=collection_name)
                 
                 metadata_json = json.dumps(metadata, ensure_ascii=False) if metadata is not None else "{}"
                 await session.execute(insert_sql, {
                     'text': text,
-                    'vector': "[" + ",".join([ str(v) for v in vector ]) + "]",
+                    'vector': self.to_db_vector(vector),
                     'metadata': metadata_json,
-                    'chunk_id': record_id
+                    'chunk_id': record_id,
+                    'ts_config': self.get_text_search_config(collection_name),
                 })
                 await session.commit()
 
-                await self.create_vector_index(collection_name=collection_name)
+        if collection_name not in self.bulk_load_collections:
+            await self.maintain_vector_index(collection_name=collection_name)
         
         return True
     
@@ -233,6 +1109,9 @@ class PGVectorProvider(VectorDBInterface):
         
         if not metadata or len(metadata) == 0:
             metadata = [None] * len(texts)
+
+        await self.ensure_text_search_config(collection_name=collection_name, texts=texts)
+        text_search_config = self.get_text_search_config(collection_name)
         
         async with self.db_client() as session:
             async with session.begin():
@@ -249,48 +1128,392 @@ class PGVectorProvider(VectorDBInterface):
                         metadata_json = json.dumps(_metadata, ensure_ascii=False) if _metadata is not None else "{}"
                         values.append({
                             'text': _text,
-                            'vector': "[" + ",".join([ str(v) for v in _vector ]) + "]",
+                            'vector': self.to_db_vector(_vector),
                             'metadata': metadata_json,
-                            'chunk_id': _record_id
+                            'chunk_id': _record_id,
+                            'ts_config': text_search_config,
                         })
                     
-                    batch_insert_sql = sql_text(f'INSERT INTO {collection_name} '
-                                    f'({PgVectorTableSchemeEnums.TEXT.value}, '
-                                    f'{PgVectorTableSchemeEnums.VECTOR.value}, '
-                                    f'{PgVectorTableSchemeEnums.METADATA.value}, '
-                                    f'{PgVectorTableSchemeEnums.CHUNK_ID.value}) '
-                                    f'VALUES (:text, :vector, :metadata, :chunk_id)')
+                    batch_insert_sql = self.get_insert_sql(collection_name=collection_name)
                     
                     await session.execute(batch_insert_sql, values)
 
-        await self.create_vector_index(collection_name=collection_name)
+        if collection_name not in self.bulk_load_collections:
+            await self.maintain_vector_index(collection_name=collection_name)
 
         return True
     
-    async def search_by_vector(self, collection_name: str, vector: list, limit: int):
+    def detect_text_search_config(self, texts: list) -> str:
+        """
+        Stemming configuration for documents like `texts`, from the script of their letters:
+        arabic for Arabic, the deployment configuration (english for an arabic deployment)
+        for Latin, simple when the scripts are mixed.
+        """
+
+        sample = "".join([ text or "" for text in texts[:200] ])
+        arabic_count = len(re.findall(r"[\u0600-\u06FF\u0750-\u077F]", sample))
+        latin_count = len(re.findall(r"[A-Za-z\u00C0-\u024F]", sample))
+
+        letters_count = arabic_count + latin_count
+        if letters_count == 0:
+            return self.text_search_config
+
+        if arabic_count / letters_count >= 0.9:
+            return PgVectorTextSearchConfigEnums.AR.value
+
+        if latin_count / letters_count >= 0.9:
+            if self.text_search_config == PgVectorTextSearchConfigEnums.AR.value:
+                return PgVectorTextSearchConfigEnums.EN.value
+            return self.text_search_config
+
+        return PgVectorTextSearchConfigEnums.DEFAULT.value
+
+    def get_text_search_config(self, collection_name: str) -> str:
+        collection_info = self.collection_registry.get(collection_name)
+        if collection_info is None or not collection_info.get("text_search_config"):
+            return self.text_search_config
+        return collection_info["text_search_config"]
+
+    async def ensure_text_search_config(self, collection_name: str, texts: list):
+        """
+        Pick the text search configuration of a collection on its first insert, from the
+        loaded documents, and keep it as the comment of its tsvector column.
+        Collections that already have rows were vectorized with the deployment configuration.
+        """
+
+        collection_info = self.collection_registry.get(collection_name)
+        if collection_info is None or not collection_info.get("has_text_search") \
+                or collection_info.get("text_search_config"):
+            return
+
+        async with self.db_client() as session:
+            async with session.begin():
+                result = await session.execute(sql_text(f'SELECT EXISTS (SELECT 1 FROM {collection_name})'))
+                if result.scalar_one():
+                    text_search_config = self.text_search_config
+                else:
+                    text_search_config = self.detect_text_search_config(texts)
+
+                # an enum value, COMMENT does not take bind parameters
+                await session.execute(sql_text(
+                    f"COMMENT ON COLUMN {collection_name}.{PgVectorTableSchemeEnums.TEXT_SEARCH.value} "
+                    f"IS '{text_search_config}'"
+                ))
+
+                self.collection_registry.update(collection_name, text_search_config=text_search_config)
+                await self.notify_collection_change(session, collection_name)
+
+        self.logger.info(f"Text search configuration of collection {collection_name}: {text_search_config}")
+
+    def get_filter_sql(self, filters: dict = None):
+        """
+        Compile search filters into a SQL predicate and its parameters.
+        Equality filters (asset id, metadata keys) become one jsonb containment
+        served by the metadata GIN index, the page range is checked on the candidates.
+        """
+
+        if not filters:
+            return None, {}
+
+        metadata_column = PgVectorTableSchemeEnums.METADATA.value
+        clauses, params = [], {}
+
+        containment = dict(filters.get(SearchFilterEnums.METADATA.value) or {})
+        if filters.get(SearchFilterEnums.ASSET_ID.value) is not None:
+            containment[VectorMetadataEnums.ASSET_ID.value] = filters[SearchFilterEnums.ASSET_ID.value]
+
+        if containment:
+            clauses.append(f"{metadata_column} @> CAST(:filter_metadata AS jsonb)")
+            params["filter_metadata"] = json.dumps(containment, ensure_ascii=False)
+
+        if filters.get(SearchFilterEnums.PAGE_FROM.value) is not None:
+            clauses.append(f"CAST({metadata_column} ->> '{VectorMetadataEnums.PAGE_END.value}' AS integer) >= :filter_page_from")
+            params["filter_page_from"] = int(filters[SearchFilterEnums.PAGE_FROM.value])
+
+        if filters.get(SearchFilterEnums.PAGE_TO.value) is not None:
+            clauses.append(f"CAST({metadata_column} ->> '{VectorMetadataEnums.PAGE_START.value}' AS integer) <= :filter_page_to")
+            params["filter_page_to"] = int(filters[SearchFilterEnums.PAGE_TO.value])
+
+        if not clauses:
+            return None, {}
+
+        return " AND ".join(clauses), params
+
+    async def enable_iterative_scan(self, session):
+        # pgvector >= 0.8: keep scanning the ANN index until enough rows pass the filter,
+        # instead of filtering the first ef_search / probes candidates only
+        await session.execute(sql_text("SET LOCAL hnsw.iterative_scan = relaxed_order"))
+        await session.execute(sql_text("SET LOCAL ivfflat.iterative_scan = relaxed_order"))
+
+    def is_exact_search(self, search_preset: str = None):
+        preset = get_search_preset(search_preset)
+        return preset is not None and bool(preset["exact"])
+
+    def get_search_quantization(self, collection_name: str, search_preset: str = None):
+        """
+        Quantization of the collection's current vector index,
+        exact searches and collections without an index scan the full precision column.
+        """
+
+        if self.is_exact_search(search_preset):
+            return VectorQuantizationEnums.NONE.value
+
+        collection_info = self.collection_registry.get(collection_name) or {}
+        if not collection_info.get("has_index"):
+            return VectorQuantizationEnums.NONE.value
+
+        return collection_info.get("quantization") or VectorQuantizationEnums.NONE.value
+
+    def get_result_columns(self, collection_name: str):
+        if self.has_text_column(collection_name):
+            return [ PgVectorTableSchemeEnums.TEXT.value, PgVectorTableSchemeEnums.CHUNK_ID.value ]
+        return [ PgVectorTableSchemeEnums.CHUNK_ID.value ]
+
+    def get_candidates_limit(self, limit: int, quantization: str):
+        if quantization == VectorQuantizationEnums.NONE.value:
+            return int(limit)
+        return int(limit) * self.rescore_factor
+
+    def get_knn_sql(self, collection_name: str, query_vector_sql: str, limit: int,
+                          columns: List[str], quantization: str, filter_sql: str = None,
+                          exact: bool = False):
+        """
+        kNN subquery returning `columns` and the full precision `distance`, nearest first.
+        Over a quantized index the candidates come from the compact index
+        and are rescored against the full precision vectors.
+        Exact searches order by an expression the ANN index can not serve,
+        the other indexes (filters, chunks join) stay usable.
+        """
+
+        vector_column = PgVectorTableSchemeEnums.VECTOR.value
+        columns_sql = ", ".join(columns)
+        where_sql = f" WHERE {filter_sql}" if filter_sql else ""
+
+        # the full precision metric, of the collection's own vector index when it has one
+        collection_info = self.collection_registry.get(collection_name) or {}
+        opclass = collection_info.get("distance_method") or self.distance_method
+        if not opclass.startswith("vector_"):
+            opclass = self.distance_method
+        distance_sql = f"{vector_column} {self.get_distance_operator(opclass)} {query_vector_sql}"
+
+        if exact:
+            return (f"SELECT {columns_sql}, {distance_sql} AS distance FROM {collection_name}{where_sql} "
+                    f"ORDER BY ({distance_sql}) + 0 LIMIT {int(limit)}")
+
+        if quantization == VectorQuantizationEnums.NONE.value:
+            # order by the distance operator itself so the ANN index can serve the scan
+            return (f"SELECT {columns_sql}, {distance_sql} AS distance FROM {collection_name}{where_sql} "
+                    f"ORDER BY {distance_sql} LIMIT {int(limit)}")
+
+        embedding_size = collection_info["embedding_size"]
+        quantized_column_sql = self.get_quantized_vector_sql(vector_column, quantization, embedding_size)
+        quantized_query_sql = self.get_quantized_vector_sql(query_vector_sql, quantization, embedding_size)
+        quantized_operator = self.get_distance_operator(self.get_index_opclass(quantization))
+
+        return (f"SELECT {columns_sql}, {distance_sql} AS distance FROM ("
+                f"SELECT {columns_sql}, {vector_column} FROM {collection_name}{where_sql} "
+                f"ORDER BY {quantized_column_sql} {quantized_operator} {quantized_query_sql} "
+                f"LIMIT {self.get_candidates_limit(limit, quantization)}"
+                f") quantized_candidates ORDER BY distance LIMIT {int(limit)}")
+
+    async def apply_search_preset(self, session, search_preset: str, limit: int):
+        """
+        Apply the ANN parameters of a search preset to the current transaction only.
+        Unknown or empty presets keep the server defaults.
+        """
+
+        preset = get_search_preset(search_preset)
+        if preset is None:
+            return
+
+        if preset["exact"]:
+            # the kNN query itself bypasses the ANN index, see get_knn_sql
+            return
+
+        if preset["hnsw_ef_search"]:
+            # hnsw can not return more rows than ef_search
+            ef_search = max(int(preset["hnsw_ef_search"]), int(limit))
+            await session.execute(sql_text(f"SET LOCAL hnsw.ef_search = {ef_search}"))
+
+        if preset["ivfflat_probes"]:
+            await session.execute(sql_text(f"SET LOCAL ivfflat.probes = {int(preset['ivfflat_probes'])}"))
+
+    async def search_by_vector(self, collection_name: str, vector: list, limit: int,
+                                     filters: dict = None, search_preset: str = None):
 
         is_collection_existed = await self.is_collection_existed(collection_name=collection_name)
         if not is_collection_existed:
             self.logger.error(f"Can not search for records in a non-existed collection: {collection_name}")
             return False
         
-        vector = "[" + ",".join([ str(v) for v in vector ]) + "]"
+        vector = self.to_db_vector(vector)
+        filter_sql, filter_params = self.get_filter_sql(filters)
+        quantization = self.get_search_quantization(collection_name, search_preset=search_preset)
+
         async with self.db_client() as session:
             async with session.begin():
-                search_sql = sql_text(f'SELECT {PgVectorTableSchemeEnums.TEXT.value} as text, 1 - ({PgVectorTableSchemeEnums.VECTOR.value} <=> :vector) as score'
-                                      f' FROM {collection_name}'
-                                      ' ORDER BY score DESC '
-                                      f'LIMIT {limit}'
+                await self.apply_search_preset(session, search_preset=search_preset,
+                                               limit=self.get_candidates_limit(limit, quantization))
+                if filter_sql:
+                    await self.enable_iterative_scan(session)
+
+                knn_sql = self.get_knn_sql(collection_name=collection_name, query_vector_sql="CAST(:vector AS vector)",
+                                           limit=limit, columns=self.get_result_columns(collection_name),
+                                           quantization=quantization, filter_sql=filter_sql,
+                                           exact=self.is_exact_search(search_preset))
+                text_sql, text_join_sql = self.get_result_text_sql(collection_name, alias="candidates")
+
+                # iterative scans may return the candidates slightly out of order, hence the outer sort
+                search_sql = sql_text(f'SELECT {text_sql} as text, 1 - candidates.distance as score, '
+                                      f'candidates.{PgVectorTableSchemeEnums.CHUNK_ID.value} as chunk_id '
+                                      f'FROM ({knn_sql}) candidates{text_join_sql} ORDER BY candidates.distance'
                                       )
                 
-                result = await session.execute(search_sql, {"vector": vector})
+                result = await session.execute(search_sql, {"vector": vector, **filter_params})
 
                 records = result.fetchall()
 
                 return [
                     RetrievedDocument(
                         text=record.text,
-                        score=record.score
+                        score=record.score,
+                        chunk_id=record.chunk_id
                     )
                     for record in records
-                ]
\ No newline at end of file
+                ]
+
+    async def search_hybrid(self, collection_name: str, vector: list, text: str, limit: int,
+                                  candidates_limit: int = 50, rrf_k: int = 60,
+                                  filters: dict = None, search_preset: str = None):
+        """
+        Dense kNN and full text search over the same collection in one statement,
+        fused with reciprocal rank fusion: score = sum(1 / (rrf_k + rank)).
+        """
+
+        is_collection_existed = await self.is_collection_existed(collection_name=collection_name)
+        if not is_collection_existed:
+            self.logger.error(f"Can not search for records in a non-existed collection: {collection_name}")
+            return False
+
+        collection_info = self.collection_registry.get(collection_name)
+        if collection_info is not None and not collection_info.get("has_text_search"):
+            self.logger.warning(f"No text search index on collection: {collection_name}, using dense search")
+            return await self.search_by_vector(collection_name=collection_name, vector=vector,
+                                               limit=limit, filters=filters, search_preset=search_preset)
+
+        candidates_limit = max(int(candidates_limit), int(limit))
+        text_search_column = PgVectorTableSchemeEnums.TEXT_SEARCH.value
+        filter_sql, filter_params = self.get_filter_sql(filters)
+        quantization = self.get_search_quantization(collection_name, search_preset=search_preset)
+
+        async with self.db_client() as session:
+            async with session.begin():
+                await self.apply_search_preset(session, search_preset=search_preset,
+                                               limit=self.get_candidates_limit(candidates_limit, quantization))
+                if filter_sql:
+                    await self.enable_iterative_scan(session)
+
+                knn_sql = self.get_knn_sql(collection_name=collection_name, query_vector_sql="CAST(:vector AS vector)",
+                                           limit=candidates_limit, columns=[ PgVectorTableSchemeEnums.ID.value ],
+                                           quantization=quantization, filter_sql=filter_sql,
+                                           exact=self.is_exact_search(search_preset))
+                text_sql, text_join_sql = self.get_result_text_sql(collection_name, alias="c")
+
+                search_sql = sql_text(f'''
+                    WITH dense AS (
+                        SELECT id, ROW_NUMBER() OVER (ORDER BY distance) AS rank
+                        FROM ({knn_sql}) dense_candidates
+                    ),
+                    lexical AS (
+                        SELECT id, ROW_NUMBER() OVER (ORDER BY text_rank DESC) AS rank
+                        FROM (
+                            SELECT id, ts_rank_cd({text_search_column}, query) AS text_rank
+                            FROM {collection_name}, websearch_to_tsquery(CAST(:ts_config AS regconfig), :query_text) query
+                            WHERE {text_search_column} @@ query
+                            {"AND " + filter_sql if filter_sql else ""}
+                            ORDER BY text_rank DESC
+                            LIMIT {candidates_limit}
+                        ) lexical_candidates
+                    )
+                    SELECT {text_sql} AS text, c.{PgVectorTableSchemeEnums.CHUNK_ID.value} AS chunk_id,
+                           COALESCE(1.0 / ({int(rrf_k)} + dense.rank), 0)
+                         + COALESCE(1.0 / ({int(rrf_k)} + lexical.rank), 0) AS score
+                    FROM dense
+                    FULL OUTER JOIN lexical ON dense.id = lexical.id
+                    JOIN {collection_name} c ON c.id = COALESCE(dense.id, lexical.id){text_join_sql}
+                    ORDER BY score DESC
+                    LIMIT {int(limit)}
+                ''')
+
+                result = await session.execute(search_sql, {
+                    "vector": self.to_db_vector(vector),
+                    "ts_config": self.get_text_search_config(collection_name),
+                    "query_text": text,
+                    **filter_params,
+                })
+                records = result.fetchall()
+
+        return [
+            RetrievedDocument(
+                text=record.text,
+                score=record.score,
+                chunk_id=record.chunk_id
+            )
+            for record in records
+        ]
+
+    async def search_by_vectors(self, collection_name: str, vectors: list, limit: int,
+                                      search_preset: str = None):
+
+        is_collection_existed = await self.is_collection_existed(collection_name=collection_name)
+        if not is_collection_existed:
+            self.logger.error(f"Can not search for records in a non-existed collection: {collection_name}")
+            return False
+
+        if not vectors:
+            return []
+
+        # one kNN per query, all in one statement through a LATERAL join over the queries
+        values_sql = ", ".join([
+            f"({idx}, CAST(:vector_{idx} AS vector))"
+            for idx in range(len(vectors))
+        ])
+        params = {
+            f"vector_{idx}": self.to_db_vector(vector)
+            for idx, vector in enumerate(vectors)
+        }
+
+        quantization = self.get_search_quantization(collection_name, search_preset=search_preset)
+
+        async with self.db_client() as session:
+            async with session.begin():
+                await self.apply_search_preset(session, search_preset=search_preset,
+                                               limit=self.get_candidates_limit(limit, quantization))
+
+                knn_sql = self.get_knn_sql(collection_name=collection_name, query_vector_sql="q.query_vector",
+                                           limit=limit, columns=self.get_result_columns(collection_name),
+                                           quantization=quantization,
+                                           exact=self.is_exact_search(search_preset))
+                text_sql, text_join_sql = self.get_result_text_sql(collection_name, alias="r")
+
+                search_sql = sql_text(f'SELECT q.query_idx, {text_sql} as text, '
+                                      f'1 - r.distance as score, r.{PgVectorTableSchemeEnums.CHUNK_ID.value} as chunk_id '
+                                      f'FROM (VALUES {values_sql}) AS q(query_idx, query_vector) '
+                                      f'CROSS JOIN LATERAL ({knn_sql}) AS r{text_join_sql} '
+                                      'ORDER BY q.query_idx, r.distance'
+                                      )
+
+                result = await session.execute(search_sql, params)
+                records = result.fetchall()
+
+        results = [ [] for _ in vectors ]
+        for record in records:
+            results[record.query_idx].append(
+                RetrievedDocument(
+                    text=record.text,
+                    score=record.score,
+                    chunk_id=record.chunk_id
+                )
+            )
+
+        return results
\ No newline at end of file
@@ -1,20 +1,44 @@
 from qdrant_client import models, QdrantClient
 from ..VectorDBInterface import VectorDBInterface
-from ..VectorDBEnums import DistanceMethodEnums
+from ..VectorDBEnums import (DistanceMethodEnums, SearchFilterEnums, VectorMetadataEnums,
+                             VectorQuantizationEnums)
+from ..SparseTextEncoder import SparseTextEncoder
+from ..SearchPresets import get_search_preset
 import logging
 from typing import List
+from contextlib import asynccontextmanager
+import numpy as np
 from models.db_schemes import RetrievedDocument
 
 class QdrantDBProvider(VectorDBInterface):
 
     def __init__(self, db_client: str, default_vector_size: int = 786,
-                                     distance_method: str = None, index_threshold: int=100):
+                                     distance_method: str = None, index_threshold: int=100,
+                                     hnsw_m: int = None, hnsw_ef_construction: int = None,
+                                     quantization: str = None, rescore_factor: int = 4):
 
         self.client = None
         self.db_client = db_client
         self.distance_method = None
         self.default_vector_size = default_vector_size
 
+        # qdrant default optimizer threshold (KB of vectors) before building hnsw
+        self.indexing_threshold = 20000
+
+        # hnsw build parameters, None keeps the qdrant defaults
+        self.hnsw_m = hnsw_m
+        self.hnsw_ef_construction = hnsw_ef_construction
+
+        # halfvec maps to int8 scalar quantization, bit to binary quantization,
+        # searches oversample by rescore_factor and rescore with the original vectors
+        self.quantization = quantization or VectorQuantizationEnums.NONE.value
+        self.rescore_factor = max(int(rescore_factor), 1)
+
+        # named sparse vector used for the lexical side of hybrid search
+        self.sparse_vector_name = "text"
+        self.sparse_encoder = SparseTextEncoder()
+        self.sparse_collections = {}
+
         if distance_method == DistanceMethodEnums.COSINE.value:
             self.distance_method = models.Distance.COSINE
         elif distance_method == DistanceMethodEnums.DOT.value:
@@ -28,6 +52,12 @@ class QdrantDBProvider(VectorDBInterface):
     async def disconnect(self):
         self.client = None
 
+    def to_record_vector(self, vector):
+        # qdrant records are validated as plain float lists
+        if isinstance(vector, np.ndarray):
+            return vector.tolist()
+        return vector
+
     async def is_collection_existed(self, collection_name: str) -> bool:
         return self.client.collection_exists(collection_name=collection_name)
     
@@ -36,10 +66,31 @@ class QdrantDBProvider(VectorDBInterface):
     
     def get_collection_info(self, collection_name: str) -> dict:
         return self.client.get_collection(collection_name=collection_name)
+
+    def has_sparse_vector(self, collection_name: str) -> bool:
+        # collections created before hybrid search have no sparse vector
+        if collection_name not in self.sparse_collections:
+            sparse_vectors = self.get_collection_info(collection_name).config.params.sparse_vectors
+            self.sparse_collections[collection_name] = bool(
+                sparse_vectors and self.sparse_vector_name in sparse_vectors
+            )
+        return self.sparse_collections[collection_name]
+
+    def to_point_vector(self, collection_name: str, text: str, vector):
+        vector = self.to_record_vector(vector)
+        if not self.has_sparse_vector(collection_name):
+            return vector
+
+        indices, values = self.sparse_encoder.encode(text)
+        return {
+            "": vector,
+            self.sparse_vector_name: models.SparseVector(indices=indices, values=values),
+        }
     
     async def delete_collection(self, collection_name: str):
         if self.is_collection_existed(collection_name):
             self.logger.info(f"Deleting collection: {collection_name}")
+            self.sparse_collections.pop(collection_name, None)
             return self.client.delete_collection(collection_name=collection_name)
         
     async def create_collection(self, collection_name: str, 
@@ -56,8 +107,27 @@ class QdrantDBProvider(VectorDBInterface):
                 vectors_config=models.VectorParams(
                     size=embedding_size,
                     distance=self.distance_method
-                )
+                ),
+                hnsw_config=models.HnswConfigDiff(
+                    m=self.hnsw_m,
+                    ef_construct=self.hnsw_ef_construction,
+                ),
+                quantization_config=self.get_quantization_config(),
+                sparse_vectors_config={
+                    self.sparse_vector_name: models.SparseVectorParams(modifier=models.Modifier.IDF)
+                }
             )
+            self.sparse_collections[collection_name] = True
+
+            # payload indexes for the filtered searches
+            for field_name in [ VectorMetadataEnums.ASSET_ID.value,
+                                VectorMetadataEnums.PAGE_START.value,
+                                VectorMetadataEnums.PAGE_END.value ]:
+                _ = self.client.create_payload_index(
+                    collection_name=collection_name,
+                    field_name=f"metadata.{field_name}",
+                    field_schema=models.PayloadSchemaType.INTEGER,
+                )
 
             return True
         
@@ -77,7 +147,7 @@ class QdrantDBProvider(VectorDBInterface):
                 records=[
                     models.Record(
                         id=[record_id],
-                        vector=vector,
+                        vector=self.to_point_vector(collection_name, text, vector),
                         payload={
                             "text": text, "metadata": metadata
                         }
@@ -111,7 +181,7 @@ class QdrantDBProvider(VectorDBInterface):
             batch_records = [
                 models.Record(
                     id=batch_record_ids[x],
-                    vector=batch_vectors[x],
+                    vector=self.to_point_vector(collection_name, batch_texts[x], batch_vectors[x]),
                     payload={
                         "text": batch_texts[x], "metadata": batch_metadata[x]
                     }
@@ -131,11 +201,142 @@ class QdrantDBProvider(VectorDBInterface):
 
         return True
         
-    async def search_by_vector(self, collection_name: str, vector: list, limit: int = 5):
+    @asynccontextmanager
+    async def bulk_load(self, collection_name: str, index_type: str = None, expected_rows: int = None):
+        """
+        Disable HNSW indexing while loading, then restore the default
+        indexing threshold so the optimizer builds the index once.
+        Qdrant builds it in the background, so no build time is reported.
+        """
+
+        bulk_load_session = {
+            "collection_name": collection_name,
+            "index_built": False,
+            "index_build_seconds": None,
+        }
+
+        self.client.update_collection(
+            collection_name=collection_name,
+            optimizers_config=models.OptimizersConfigDiff(indexing_threshold=0),
+        )
+        try:
+            yield bulk_load_session
+        finally:
+            self.client.update_collection(
+                collection_name=collection_name,
+                optimizers_config=models.OptimizersConfigDiff(indexing_threshold=self.indexing_threshold),
+            )
+
+    async def rebuild_index(self, collection_name: str, index_type: str = None):
+        """
+        Apply the current hnsw build parameters, Qdrant rebuilds the
+        segments in the background and keeps serving the old ones meanwhile.
+        """
+
+        return self.client.update_collection(
+            collection_name=collection_name,
+            hnsw_config=models.HnswConfigDiff(
+                m=self.hnsw_m,
+                ef_construct=self.hnsw_ef_construction,
+            ),
+            quantization_config=self.get_quantization_config() or models.Disabled.DISABLED,
+        )
+
+    def get_quantization_config(self):
+        if self.quantization == VectorQuantizationEnums.HALFVEC.value:
+            return models.ScalarQuantization(
+                scalar=models.ScalarQuantizationConfig(
+                    type=models.ScalarType.INT8,
+                    quantile=0.99,
+                    always_ram=True,
+                )
+            )
+
+        if self.quantization == VectorQuantizationEnums.BIT.value:
+            return models.BinaryQuantization(
+                binary=models.BinaryQuantizationConfig(always_ram=True)
+            )
+
+        return None
+
+    async def get_index_build_progress(self, collection_name: str):
+        collection_info = self.get_collection_info(collection_name)
+
+        return {
+            "status": str(collection_info.status),
+            "optimizer_status": str(collection_info.optimizer_status),
+            "points_count": collection_info.points_count,
+            "indexed_vectors_count": collection_info.indexed_vectors_count,
+        }
+
+    def get_search_filter(self, filters: dict = None):
+        """
+        Compile search filters into a Qdrant payload filter.
+        Metadata values must all match, a list value must contain every listed item.
+        """
+
+        if not filters:
+            return None
+
+        conditions = []
+
+        metadata = dict(filters.get(SearchFilterEnums.METADATA.value) or {})
+        if filters.get(SearchFilterEnums.ASSET_ID.value) is not None:
+            metadata[VectorMetadataEnums.ASSET_ID.value] = filters[SearchFilterEnums.ASSET_ID.value]
+
+        for key, value in metadata.items():
+            for item in (value if isinstance(value, list) else [value]):
+                conditions.append(models.FieldCondition(
+                    key=f"metadata.{key}",
+                    match=models.MatchValue(value=item),
+                ))
+
+        if filters.get(SearchFilterEnums.PAGE_FROM.value) is not None:
+            conditions.append(models.FieldCondition(
+                key=f"metadata.{VectorMetadataEnums.PAGE_END.value}",
+                range=models.Range(gte=filters[SearchFilterEnums.PAGE_FROM.value]),
+            ))
+
+        if filters.get(SearchFilterEnums.PAGE_TO.value) is not None:
+            conditions.append(models.FieldCondition(
+                key=f"metadata.{VectorMetadataEnums.PAGE_START.value}",
+                range=models.Range(lte=filters[SearchFilterEnums.PAGE_TO.value]),
+            ))
+
+        if not conditions:
+            return None
+
+        return models.Filter(must=conditions)
+
+    def get_search_params(self, search_preset: str = None, limit: int = 5):
+        preset = get_search_preset(search_preset)
+        if preset is not None and preset["exact"]:
+            return models.SearchParams(exact=True)
+
+        quantization = None
+        if self.quantization != VectorQuantizationEnums.NONE.value:
+            quantization = models.QuantizationSearchParams(
+                rescore=True,
+                oversampling=float(self.rescore_factor),
+            )
+
+        if preset is None:
+            return models.SearchParams(quantization=quantization) if quantization else None
+
+        hnsw_ef = None
+        if preset["hnsw_ef_search"]:
+            hnsw_ef = max(int(preset["hnsw_ef_search"]), int(limit))
+
+        return models.SearchParams(hnsw_ef=hnsw_ef, exact=False, quantization=quantization)
+
+    async def search_by_vector(self, collection_name: str, vector: list, limit: int = 5,
+                               filters: dict = None, search_preset: str = None):
 
         results = self.client.search(
             collection_name=collection_name,
             query_vector=vector,
+            query_filter=self.get_search_filter(filters),
+            search_params=self.get_search_params(search_preset=search_preset, limit=limit),
             limit=limit
         )
 
@@ -146,6 +347,83 @@ class QdrantDBProvider(VectorDBInterface):
             RetrievedDocument(**{
                 "score": result.score,
                 "text": result.payload["text"],
+                "chunk_id": result.id,
+            })
+            for result in results
+        ]
+
+    async def search_by_vectors(self, collection_name: str, vectors: list, limit: int = 5,
+                                search_preset: str = None):
+
+        batch_results = self.client.search_batch(
+            collection_name=collection_name,
+            requests=[
+                models.SearchRequest(
+                    vector=self.to_record_vector(vector),
+                    params=self.get_search_params(search_preset=search_preset, limit=limit),
+                    limit=limit,
+                    with_payload=True,
+                )
+                for vector in vectors
+            ]
+        )
+
+        return [
+            [
+                RetrievedDocument(**{
+                    "score": result.score,
+                    "text": result.payload["text"],
+                    "chunk_id": result.id,
+                })
+                for result in results
+            ]
+            for results in batch_results
+        ]
+
+    async def search_hybrid(self, collection_name: str, vector: list, text: str,
+                            limit: int = 5, candidates_limit: int = 50, rrf_k: int = 60,
+                            filters: dict = None, search_preset: str = None):
+        """
+        Fuse the dense and the sparse (lexical) candidates with reciprocal-rank fusion.
+        Qdrant uses its own RRF constant, so rrf_k is not applied here.
+        """
+
+        if not self.has_sparse_vector(collection_name):
+            return await self.search_by_vector(collection_name=collection_name, vector=vector,
+                                               limit=limit, filters=filters, search_preset=search_preset)
+
+        indices, values = self.sparse_encoder.encode(text)
+        search_filter = self.get_search_filter(filters)
+
+        results = self.client.query_points(
+            collection_name=collection_name,
+            prefetch=[
+                models.Prefetch(
+                    query=self.to_record_vector(vector),
+                    filter=search_filter,
+                    params=self.get_search_params(search_preset=search_preset, limit=candidates_limit),
+                    limit=candidates_limit,
+                ),
+                models.Prefetch(
+                    query=models.SparseVector(indices=indices, values=values),
+                    using=self.sparse_vector_name,
+                    filter=search_filter,
+                    limit=candidates_limit,
+                ),
+            ],
+            query=models.FusionQuery(fusion=models.Fusion.RRF),
+            limit=limit,
+            with_payload=True,
+        ).points
+
+        if not results or len(results) == 0:
+            return None
+
+        return [
+            RetrievedDocument(**{
+                "score": result.score,
+                "text": result.payload["text"],
+                "chunk_id": result.id,
             })
             for result in results
         ]
@@ -0,0 +1,152 @@
+import asyncio
+import os
+
+import numpy as np
+import pytest
+
+from stores.vectordb.providers.NumpyDBProvider import NumpyDBProvider
+from stores.vectordb.VectorDBEnums import VectorMetadataEnums
+
+EMBEDDING_SIZE = 8
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+@pytest.fixture
+def provider(tmp_path):
+    provider = NumpyDBProvider(db_client=str(tmp_path / "numpy_db"))
+    run(provider.connect())
+    run(provider.create_collection("collection_8_1", embedding_size=EMBEDDING_SIZE))
+    return provider
+
+
+def make_vectors(count: int, seed: int = 0):
+    return np.random.default_rng(seed).normal(size=(count, EMBEDDING_SIZE)).astype(np.float32)
+
+
+def insert(provider, vectors, start_id: int = 0, metadata: list = None):
+    record_ids = list(range(start_id, start_id + len(vectors)))
+    return run(provider.insert_many(
+        collection_name="collection_8_1",
+        texts=[ f"text {record_id}" for record_id in record_ids ],
+        vectors=vectors,
+        metadata=metadata,
+        record_ids=record_ids,
+    ))
+
+
+def search(provider, vector, limit: int = 1, filters: dict = None):
+    return run(provider.search_by_vector(collection_name="collection_8_1", vector=vector,
+                                         limit=limit, filters=filters))
+
+
+def test_append_and_search(provider):
+    vectors = make_vectors(10)
+    assert insert(provider, vectors[:6])
+    assert insert(provider, vectors[6:], start_id=6)
+
+    for record_id in [0, 5, 6, 9]:
+        documents = search(provider, vectors[record_id])
+        assert documents[0].chunk_id == record_id
+        assert documents[0].text == f"text {record_id}"
+
+    info = run(provider.get_collection_info("collection_8_1"))
+    assert info["records_count"] == 10
+
+
+def test_append_after_failed_write(provider):
+    vectors = make_vectors(14)
+    assert insert(provider, vectors[:13])
+
+    # a write that failed after the payload, offset and id of record 13 but before its vector
+    collection_path = provider.get_collection_path("collection_8_1")
+    payloads_size = os.path.getsize(os.path.join(collection_path, "payloads.jsonl"))
+    with open(os.path.join(collection_path, "payloads.jsonl"), "ab") as f:
+        f.write(b'{"text": "lost", "metadata": null}\n')
+    with open(os.path.join(collection_path, "payload_offsets.i64"), "ab") as f:
+        f.write(np.asarray([payloads_size], dtype=np.int64).tobytes())
+    with open(os.path.join(collection_path, "ids.i64"), "ab") as f:
+        f.write(np.asarray([99], dtype=np.int64).tobytes())
+
+    assert insert(provider, vectors[13:], start_id=13)
+
+    documents = search(provider, vectors[13])
+    assert documents[0].chunk_id == 13
+    assert documents[0].text == "text 13"
+    assert os.path.getsize(os.path.join(collection_path, "ids.i64")) == 14 * 8
+
+
+def test_tombstoned_records_are_not_returned(provider):
+    vectors = make_vectors(5)
+    assert insert(provider, vectors)
+
+    assert run(provider.delete_records("collection_8_1", [2]))
+
+    documents = search(provider, vectors[2], limit=5)
+    assert 2 not in [ doc.chunk_id for doc in documents ]
+    assert len(documents) == 4
+
+    info = run(provider.get_collection_info("collection_8_1"))
+    assert info["records_count"] == 4
+    assert info["deleted_count"] == 1
+
+
+def test_compact_drops_tombstoned_rows(provider):
+    vectors = make_vectors(6)
+    assert insert(provider, vectors)
+    assert run(provider.delete_records("collection_8_1", [1, 4]))
+
+    assert run(provider.compact_collection("collection_8_1"))
+
+    info = run(provider.get_collection_info("collection_8_1"))
+    assert info["records_count"] == 4
+    assert info["deleted_count"] == 0
+
+    for record_id in [0, 2, 3, 5]:
+        documents = search(provider, vectors[record_id])
+        assert documents[0].chunk_id == record_id
+        assert documents[0].text == f"text {record_id}"
+
+    # appends keep working on the compacted files
+    new_vectors = make_vectors(2, seed=1)
+    assert insert(provider, new_vectors, start_id=6)
+    assert search(provider, new_vectors[1])[0].chunk_id == 7
+
+    assert sorted(os.listdir(provider.db_client)) == [".collection_8_1.lock", "collection_8_1"]
+
+
+def test_connect_recovers_interrupted_compaction(provider):
+    vectors = make_vectors(3)
+    assert insert(provider, vectors)
+
+    # crash between moving the collection aside and moving the compacted one into place
+    collection_path = provider.get_collection_path("collection_8_1")
+    os.rename(collection_path, f"{collection_path}.old")
+    os.makedirs(f"{collection_path}.compacting")
+
+    reconnected = NumpyDBProvider(db_client=provider.db_client)
+    run(reconnected.connect())
+
+    assert run(reconnected.list_all_collections()) == ["collection_8_1"]
+    assert run(reconnected.get_collection_info("collection_8_1"))["records_count"] == 3
+
+
+def test_filtered_top_k(provider):
+    vectors = make_vectors(40)
+    metadata = [ { VectorMetadataEnums.ASSET_ID.value: record_id % 4 } for record_id in range(40) ]
+    assert insert(provider, vectors, metadata=metadata)
+
+    filters = { "asset_id": 3 }
+    documents = search(provider, vectors[0], limit=5, filters=filters)
+
+    assert len(documents) == 5
+    assert all([ doc.chunk_id % 4 == 3 for doc in documents ])
+
+    # the exact top-k among the rows that pass the filter
+    matching_ids = np.arange(3, 40, 4)
+    normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    scores = normalized[matching_ids] @ normalized[0]
+    expected_ids = matching_ids[np.argsort(-scores)[:5]]
+    assert [ doc.chunk_id for doc in documents ] == expected_ids.tolist()
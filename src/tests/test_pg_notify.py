@@ -0,0 +1,111 @@
+import asyncio
+
+from utils.pg_notify import PgNotifyChannel
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+class FakeDriverConnection:
+    def __init__(self):
+        self.listeners = {}
+        self.termination_listeners = []
+        self.closed = False
+
+    async def add_listener(self, channel, callback):
+        self.listeners[channel] = callback
+
+    async def remove_listener(self, channel, callback):
+        self.listeners.pop(channel, None)
+
+    def add_termination_listener(self, callback):
+        self.termination_listeners.append(callback)
+
+    def remove_termination_listener(self, callback):
+        self.termination_listeners.remove(callback)
+
+    def is_closed(self):
+        return self.closed
+
+    async def fetchval(self, query):
+        return 1
+
+    def terminate(self):
+        self.closed = True
+        for callback in list(self.termination_listeners):
+            callback(self)
+
+
+class FakeRawConnection:
+    def __init__(self, driver_connection):
+        self.driver_connection = driver_connection
+
+
+class FakeConnection:
+    def __init__(self, driver_connection):
+        self.driver_connection = driver_connection
+
+    async def get_raw_connection(self):
+        return FakeRawConnection(self.driver_connection)
+
+    async def close(self):
+        self.driver_connection.closed = True
+
+
+class FakeEngine:
+    def __init__(self):
+        self.driver_connections = []
+
+    async def connect(self):
+        driver_connection = FakeDriverConnection()
+        self.driver_connections.append(driver_connection)
+        return FakeConnection(driver_connection)
+
+
+class FakeSession:
+    def __init__(self):
+        self.payloads = []
+
+    async def execute(self, query, params):
+        self.payloads.append(params["payload"])
+
+
+def test_skips_only_own_messages():
+    received = []
+    channel = PgNotifyChannel(FakeEngine(), "test_channel", on_message=received.append)
+    other_channel = PgNotifyChannel(FakeEngine(), "test_channel", on_message=lambda message: None)
+
+    async def scenario():
+        session = FakeSession()
+        await channel.notify(session, { "value": 1 })
+        await other_channel.notify(session, { "value": 2 })
+        for payload in session.payloads:
+            channel.on_notify(None, 1, "test_channel", payload)
+
+    run(scenario())
+
+    assert [ message["value"] for message in received ] == [ 2 ]
+
+
+def test_resubscribes_and_catches_up_when_the_listener_drops():
+    engine = FakeEngine()
+    reloads = []
+
+    async def on_reconnect():
+        reloads.append(True)
+
+    channel = PgNotifyChannel(engine, "test_channel", on_message=lambda message: None,
+                              on_reconnect=on_reconnect)
+
+    async def scenario():
+        await channel.connect()
+        engine.driver_connections[0].terminate()
+        await channel.reconnect_task
+        await channel.disconnect()
+
+    run(scenario())
+
+    assert len(engine.driver_connections) == 2
+    assert reloads == [ True ]
+    assert engine.driver_connections[1].closed
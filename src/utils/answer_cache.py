@@ -0,0 +1,96 @@
+from collections import OrderedDict
+import hashlib
+import json
+import time
+
+class AnswerCache:
+    """
+    An in-process cache of generated RAG answers.
+    Entries expire after `ttl_seconds`, the least recently used ones are evicted
+    once there are more than `max_entries` or their sizes exceed `max_bytes`.
+    Entries are tracked per project so a re-indexed project drops all of its answers.
+    """
+
+    def __init__(self, max_entries: int = 1000, max_bytes: int = 64 * 1024 * 1024,
+                       ttl_seconds: float = 3600):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+
+        # key -> (project_id, expires_at, size, value)
+        self.items = OrderedDict()
+        self.project_keys = {}
+        self.total_bytes = 0
+
+    def __len__(self):
+        return len(self.items)
+
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        return " ".join(query.lower().split())
+
+    def get_key(self, project_id: int, query: str, chunk_ids: list,
+                      model_id: str, template_version: str) -> str:
+        key_data = json.dumps([
+            project_id,
+            self.normalize_query(query),
+            list(chunk_ids),
+            model_id,
+            template_version,
+        ], ensure_ascii=False)
+
+        return hashlib.sha256(key_data.encode("utf-8")).hexdigest()
+
+    def get(self, key: str, default=None):
+        item = self.items.get(key)
+        if item is None:
+            return default
+
+        _, expires_at, _, value = item
+        if expires_at <= time.monotonic():
+            self.pop(key)
+            return default
+
+        self.items.move_to_end(key)
+        return value
+
+    def put(self, project_id: int, key: str, value, size: int):
+        if self.max_entries <= 0 or size > self.max_bytes:
+            return
+
+        self.pop(key)
+
+        self.items[key] = (project_id, time.monotonic() + self.ttl_seconds, size, value)
+        self.project_keys.setdefault(project_id, set()).add(key)
+        self.total_bytes += size
+
+        while len(self.items) > self.max_entries or self.total_bytes > self.max_bytes:
+            self.pop(next(iter(self.items)))
+
+    def pop(self, key: str, default=None):
+        item = self.items.pop(key, None)
+        if item is None:
+            return default
+
+        project_id, _, size, value = item
+        self.total_bytes -= size
+
+        project_keys = self.project_keys.get(project_id)
+        if project_keys is not None:
+            project_keys.discard(key)
+            if not project_keys:
+                self.project_keys.pop(project_id, None)
+
+        return value
+
+    def invalidate_project(self, project_id: int) -> int:
+        keys = list(self.project_keys.get(project_id, ()))
+        for key in keys:
+            self.pop(key)
+
+        return len(keys)
+
+    def clear(self):
+        self.items.clear()
+        self.project_keys.clear()
+        self.total_bytes = 0
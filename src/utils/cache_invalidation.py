@@ -0,0 +1,62 @@
+from utils.pg_notify import PgNotifyChannel
+import logging
+
+class AnswerCacheInvalidator:
+    """
+    Drops the cached answers of a project in every worker.
+    The caches live in each worker process, an invalidation is applied locally
+    then sent to the other workers with NOTIFY on `channel`.
+    """
+
+    def __init__(self, db_client, db_engine, answer_cache=None, semantic_cache=None,
+                       channel: str = "rag_answer_cache"):
+        self.db_client = db_client
+        self.db_engine = db_engine
+        self.answer_cache = answer_cache
+        self.semantic_cache = semantic_cache
+        self.channel = PgNotifyChannel(db_engine, channel=channel,
+                                       on_message=self.on_message,
+                                       on_reconnect=self.on_reconnect)
+
+        self.logger = logging.getLogger('uvicorn')
+
+    async def connect(self):
+        await self.channel.connect()
+
+    async def disconnect(self):
+        await self.channel.disconnect()
+
+    def invalidate_local(self, project_id: int) -> int:
+        invalidated_count = 0
+        if self.answer_cache is not None:
+            invalidated_count += self.answer_cache.invalidate_project(project_id)
+
+        if self.semantic_cache is not None:
+            invalidated_count += self.semantic_cache.invalidate_project(project_id)
+
+        return invalidated_count
+
+    async def invalidate(self, project_id: int) -> int:
+        invalidated_count = self.invalidate_local(project_id)
+
+        try:
+            async with self.db_client() as session:
+                async with session.begin():
+                    await self.channel.notify(session, { "project_id": project_id })
+        except Exception as e:
+            # the other workers keep their entries until the ttl
+            self.logger.error(f"Error while sending the answer cache invalidation of project {project_id}: {e}")
+
+        return invalidated_count
+
+    def on_message(self, message: dict):
+        if message.get("project_id") is None:
+            return
+
+        self.invalidate_local(message["project_id"])
+
+    async def on_reconnect(self):
+        # invalidations sent while the listener was down are lost, drop everything
+        for cache in [ self.answer_cache, self.semantic_cache ]:
+            if cache is not None:
+                cache.clear()
@@ -0,0 +1,36 @@
+from collections import OrderedDict
+
+class LRUCache:
+    """
+    A minimal in-process least recently used cache.
+    """
+
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        self.items = OrderedDict()
+
+    def __len__(self):
+        return len(self.items)
+
+    def get(self, key, default=None):
+        if key not in self.items:
+            return default
+
+        self.items.move_to_end(key)
+        return self.items[key]
+
+    def put(self, key, value):
+        if self.max_size <= 0:
+            return
+
+        self.items[key] = value
+        self.items.move_to_end(key)
+
+        while len(self.items) > self.max_size:
+            self.items.popitem(last=False)
+
+    def pop(self, key, default=None):
+        return self.items.pop(key, default)
+
+    def clear(self):
+        self.items.clear()
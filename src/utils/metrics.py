@@ -1,4 +1,4 @@
-from prometheus_client import Counter, Histogram, generate_latest, CONTENT_TYPE_LATEST
+from prometheus_client import Counter, Gauge, Histogram, generate_latest, CONTENT_TYPE_LATEST
 from fastapi import FastAPI, Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware
 import time
@@ -7,6 +7,24 @@ import time
 REQUEST_COUNT = Counter('http_requests_total', 'Total HTTP Requests', ['method', 'endpoint', 'status'])
 REQUEST_LATENCY = Histogram('http_request_duration_seconds', 'HTTP Request Latency', ['method', 'endpoint'])
 
+EMBEDDING_CACHE_HITS = Counter('embedding_cache_hits_total', 'Embedding Cache Hits', ['tier'])
+EMBEDDING_CACHE_MISSES = Counter('embedding_cache_misses_total', 'Embedding Cache Misses')
+
+RAG_TIME_TO_FIRST_TOKEN = Histogram('rag_answer_time_to_first_token_seconds', 'RAG Answer Time To First Token',
+                                    buckets=(0.1, 0.25, 0.5, 1, 2, 3, 5, 8, 13))
+RAG_TOKENS_PER_SECOND = Histogram('rag_answer_tokens_per_second', 'RAG Answer Streamed Tokens Per Second',
+                                  buckets=(5, 10, 20, 30, 50, 75, 100, 150, 200))
+RAG_PROMPT_TOKENS = Histogram('rag_prompt_tokens', 'RAG Prompt Size In Tokens',
+                              buckets=(250, 500, 1000, 1500, 2000, 3000, 4000, 6000, 8000, 16000))
+
+ANSWER_CACHE_REQUESTS = Counter('rag_answer_cache_requests_total', 'RAG Answer Cache Lookups', ['status'])
+ANSWER_CACHE_ENTRIES = Gauge('rag_answer_cache_entries', 'RAG Answer Cache Entries')
+ANSWER_CACHE_BYTES = Gauge('rag_answer_cache_bytes', 'RAG Answer Cache Size In Bytes')
+
+SEMANTIC_CACHE_REQUESTS = Counter('rag_semantic_cache_requests_total', 'RAG Semantic Cache Lookups', ['status'])
+SEMANTIC_CACHE_SIMILARITY = Histogram('rag_semantic_cache_best_similarity', 'RAG Semantic Cache Best Match Similarity',
+                                      buckets=(0.5, 0.7, 0.8, 0.85, 0.9, 0.92, 0.94, 0.96, 0.98, 1.0))
+
 class PrometheusMiddleware(BaseHTTPMiddleware):
     async def dispatch(self, request: Request, call_next):
 
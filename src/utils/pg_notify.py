@@ -0,0 +1,142 @@
+from sqlalchemy.sql import text as sql_text
+from uuid import uuid4
+import logging
+import asyncio
+import json
+
+class PgNotifyChannel:
+    """
+    Broadcasts JSON messages to the other app instances with NOTIFY on `channel`.
+    Messages carry an instance id generated once per channel object, so an instance
+    skips its own messages whatever host or container the others run in.
+    A dropped LISTEN connection is re-opened, then `on_reconnect` is awaited
+    to catch up on the messages missed meanwhile.
+    """
+
+    def __init__(self, db_engine, channel: str, on_message, on_reconnect=None,
+                       health_check_interval: float = 30.0, max_reconnect_delay: float = 30.0):
+        self.db_engine = db_engine
+        self.channel = channel
+        self.on_message = on_message
+        self.on_reconnect = on_reconnect
+        self.health_check_interval = health_check_interval
+        self.max_reconnect_delay = max_reconnect_delay
+
+        self.instance_id = uuid4().hex
+
+        self.listen_connection = None
+        self.driver_connection = None
+        self.reconnect_task = None
+        self.health_check_task = None
+        self.closing = False
+
+        self.logger = logging.getLogger('uvicorn')
+
+    async def connect(self):
+        self.closing = False
+        await self.listen()
+        self.health_check_task = asyncio.create_task(self.health_check_loop())
+
+    async def listen(self):
+        listen_connection = await self.db_engine.connect()
+        try:
+            raw_connection = await listen_connection.get_raw_connection()
+            driver_connection = raw_connection.driver_connection
+            await driver_connection.add_listener(self.channel, self.on_notify)
+            driver_connection.add_termination_listener(self.on_connection_lost)
+        except Exception:
+            await listen_connection.close()
+            raise
+
+        self.listen_connection = listen_connection
+        self.driver_connection = driver_connection
+
+    async def release(self):
+        listen_connection, driver_connection = self.listen_connection, self.driver_connection
+        self.listen_connection, self.driver_connection = None, None
+        if listen_connection is None:
+            return
+
+        try:
+            driver_connection.remove_termination_listener(self.on_connection_lost)
+            if not driver_connection.is_closed():
+                await driver_connection.remove_listener(self.channel, self.on_notify)
+            await listen_connection.close()
+        except Exception as e:
+            # the connection is gone already
+            self.logger.debug(f"Error while releasing the listener of {self.channel}: {e}")
+
+    async def disconnect(self):
+        self.closing = True
+        for task in [ self.health_check_task, self.reconnect_task ]:
+            if task is not None:
+                task.cancel()
+        self.health_check_task, self.reconnect_task = None, None
+
+        await self.release()
+
+    def on_connection_lost(self, connection):
+        if not self.closing:
+            self.logger.warning(f"Lost the listener of {self.channel}, reconnecting")
+            self.schedule_reconnect()
+
+    def schedule_reconnect(self):
+        if self.reconnect_task is None or self.reconnect_task.done():
+            self.reconnect_task = asyncio.create_task(self.reconnect())
+
+    async def reconnect(self):
+        await self.release()
+
+        delay = 1.0
+        while not self.closing:
+            try:
+                await self.listen()
+                break
+            except Exception as e:
+                self.logger.error(f"Error while re-subscribing to {self.channel}: {e}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.max_reconnect_delay)
+
+        if self.closing or self.on_reconnect is None:
+            return
+
+        try:
+            await self.on_reconnect()
+        except Exception as e:
+            self.logger.error(f"Error while catching up on {self.channel}: {e}")
+
+    async def health_check_loop(self):
+        # a half-open connection never reports its termination, ping it
+        while not self.closing:
+            await asyncio.sleep(self.health_check_interval)
+            if self.driver_connection is None:
+                continue
+
+            try:
+                await asyncio.wait_for(self.driver_connection.fetchval("SELECT 1"),
+                                       timeout=self.health_check_interval)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.warning(f"Health check of the {self.channel} listener failed: {e}")
+                self.schedule_reconnect()
+
+    async def notify(self, session, message: dict):
+        # delivered when the surrounding transaction commits
+        payload = json.dumps({ **message, "instance_id": self.instance_id })
+        await session.execute(sql_text("SELECT pg_notify(:channel, :payload)"),
+                              {"channel": self.channel, "payload": payload})
+
+    def on_notify(self, connection, pid, channel, payload):
+        try:
+            message = json.loads(payload)
+        except ValueError:
+            return
+
+        if not isinstance(message, dict) or message.get("instance_id") == self.instance_id:
+            return
+
+        try:
+            self.on_message(message)
+        except Exception as e:
+            self.logger.error(f"Error while handling a {self.channel} message: {e}")
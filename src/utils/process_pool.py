@@ -0,0 +1,134 @@
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import asyncio
+import functools
+import logging
+import queue
+import os
+
+def put_streamed_item(items_queue, cancel_event, item) -> bool:
+    # blocks while the queue is full, gives up once the consumer is gone
+    while not cancel_event.is_set():
+        try:
+            items_queue.put(item, timeout=1)
+            return True
+        except queue.Full:
+            continue
+
+    return False
+
+def run_streamed_job(items_queue, cancel_event, func, *args, **kwargs):
+    """
+    Runs the generator `func` inside a worker process and sends its items
+    back through `items_queue`, then a done (or error) marker.
+    """
+    try:
+        for item in func(*args, **kwargs):
+            if not put_streamed_item(items_queue, cancel_event, ("item", item)):
+                return
+    except Exception as e:
+        put_streamed_item(items_queue, cancel_event, ("error", e))
+        return
+
+    put_streamed_item(items_queue, cancel_event, ("done", None))
+
+class ProcessPoolEngine:
+    """
+    Runs CPU bound work (file parsing, chunking) in a pool of worker processes,
+    so that the event loop stays free to serve other requests.
+    """
+
+    def __init__(self, max_workers: int = None, max_in_flight: int = None,
+                       start_method: str = "spawn"):
+
+        self.max_workers = max_workers if max_workers else (os.cpu_count() or 1)
+        self.max_in_flight = max_in_flight if max_in_flight else self.max_workers
+        self.start_method = start_method
+
+        self.executor = None
+        self.semaphore = None
+        self.manager = None
+
+        self.logger = logging.getLogger('uvicorn')
+
+    def start(self):
+        if self.executor is not None:
+            return
+
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context(self.start_method),
+        )
+        self.semaphore = asyncio.Semaphore(self.max_in_flight)
+
+        # queues of streamed jobs must be shared with the pool workers
+        self.manager = multiprocessing.get_context(self.start_method).Manager()
+
+        self.logger.info(f"Process pool started with {self.max_workers} workers, "
+                         f"{self.max_in_flight} jobs in flight")
+
+    def shutdown(self):
+        if self.executor is None:
+            return
+
+        self.executor.shutdown(wait=True, cancel_futures=True)
+        self.executor = None
+        self.semaphore = None
+
+        self.manager.shutdown()
+        self.manager = None
+
+    async def run(self, func, *args, **kwargs):
+        """
+        Submit `func` to the pool and await its result.
+        At most `max_in_flight` jobs are submitted at any time, the rest wait here.
+        """
+        if self.executor is None:
+            self.start()
+
+        loop = asyncio.get_running_loop()
+        async with self.semaphore:
+            return await loop.run_in_executor(
+                self.executor, functools.partial(func, *args, **kwargs)
+            )
+
+    async def stream(self, func, *args, max_buffered_items: int = 2, **kwargs):
+        """
+        Run the generator function `func` in the pool and yield its items as they come.
+        At most `max_buffered_items` items wait between the worker and the caller,
+        the worker blocks until they are consumed. The job holds its in-flight slot until it ends.
+        """
+        if self.executor is None:
+            self.start()
+
+        loop = asyncio.get_running_loop()
+        async with self.semaphore:
+            items_queue = self.manager.Queue(maxsize=max_buffered_items)
+            cancel_event = self.manager.Event()
+
+            job = loop.run_in_executor(
+                self.executor, functools.partial(run_streamed_job, items_queue, cancel_event, func, *args, **kwargs)
+            )
+
+            try:
+                while True:
+                    try:
+                        kind, item = await asyncio.to_thread(items_queue.get, True, 1)
+                    except queue.Empty:
+                        if job.done():
+                            # the worker died before sending its done marker
+                            job.result()
+                            raise RuntimeError(f"Streamed job {func.__name__} ended without a result")
+                        continue
+
+                    if kind == "done":
+                        break
+                    if kind == "error":
+                        raise item
+
+                    yield item
+
+                await job
+            finally:
+                # stop a worker whose consumer went away
+                cancel_event.set()
@@ -0,0 +1,109 @@
+import numpy as np
+import time
+
+class SemanticAnswerCache:
+    """
+    An in-process cache of RAG answers looked up by query embedding.
+    Every project keeps a small brute force index per scope (the retrieval
+    options the answers were generated with); a lookup returns the answer of
+    the most similar cached query once its cosine similarity reaches `threshold`.
+    Entries expire after `ttl_seconds`, the oldest are dropped past `max_entries` per project.
+    """
+
+    def __init__(self, threshold: float = 0.95, max_entries: int = 1000,
+                       ttl_seconds: float = 3600):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+
+        # project_id -> scope -> { "vectors": (n, d) float32, "expires_at": (n,), "values": [...] }
+        self.projects = {}
+
+    def __len__(self):
+        return sum([
+            len(index["values"])
+            for scopes in self.projects.values()
+            for index in scopes.values()
+        ])
+
+    def normalize(self, vector):
+        vector = np.asarray(vector, dtype=np.float32).ravel()
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    def lookup(self, project_id: int, scope: str, vector):
+        """
+        Returns (value, similarity) of the most similar cached query,
+        value is None below the threshold.
+        """
+
+        index = self.projects.get(project_id, {}).get(scope)
+        if index is None:
+            return None, None
+
+        self.drop_expired(index)
+        if not index["values"]:
+            return None, None
+
+        vector = self.normalize(vector)
+        if index["vectors"].shape[1] != vector.shape[0]:
+            return None, None
+
+        similarities = index["vectors"] @ vector
+        best = int(np.argmax(similarities))
+        similarity = float(similarities[best])
+
+        if similarity < self.threshold:
+            return None, similarity
+
+        return index["values"][best], similarity
+
+    def put(self, project_id: int, scope: str, vector, value):
+        if self.max_entries <= 0:
+            return
+
+        vector = self.normalize(vector)
+        index = self.projects.setdefault(project_id, {}).get(scope)
+        if index is None or index["vectors"].shape[1] != vector.shape[0]:
+            index = {
+                "vectors": np.empty((0, vector.shape[0]), dtype=np.float32),
+                "expires_at": np.empty((0,), dtype=np.float64),
+                "values": [],
+            }
+            self.projects[project_id][scope] = index
+
+        self.drop_expired(index)
+
+        index["vectors"] = np.vstack([ index["vectors"], vector[None, :] ])
+        index["expires_at"] = np.append(index["expires_at"], time.monotonic() + self.ttl_seconds)
+        index["values"].append(value)
+
+        # the project budget is shared by its scopes, the oldest entries go first
+        while self.get_project_size(project_id) > self.max_entries:
+            oldest_scope = min(
+                [ s for s, i in self.projects[project_id].items() if i["values"] ],
+                key=lambda s: self.projects[project_id][s]["expires_at"][0],
+            )
+            self.drop_first(self.projects[project_id][oldest_scope], 1)
+
+    def get_project_size(self, project_id: int) -> int:
+        return sum([ len(index["values"]) for index in self.projects.get(project_id, {}).values() ])
+
+    def drop_expired(self, index: dict):
+        # entries are appended in expiry order
+        expired_count = int(np.searchsorted(index["expires_at"], time.monotonic(), side="right"))
+        if expired_count:
+            self.drop_first(index, expired_count)
+
+    def drop_first(self, index: dict, count: int):
+        index["vectors"] = index["vectors"][count:]
+        index["expires_at"] = index["expires_at"][count:]
+        index["values"] = index["values"][count:]
+
+    def invalidate_project(self, project_id: int) -> int:
+        size = self.get_project_size(project_id)
+        self.projects.pop(project_id, None)
+        return size
+
+    def clear(self):
+        self.projects = {}